@@ -3,44 +3,51 @@ Aplicativo principal do dashboard financeiro.
 """
 import streamlit as st
 from utils.data import StockDataManager
-from utils.indicators.momentum import calculate_stochastic, calculate_rsi, calculate_macd
-from utils.indicators.volatility import calculate_bollinger_bands, calculate_atr
+from utils.replay_data import ReplayDataManager
+from utils.indicators.registry import compute_columns
 from utils.plotting import create_dashboard_plot
+from utils.plotting.indicators import PLOT_COLUMNS
 from utils.backtest import Strategy
 from utils.ml import MLPredictor
-from utils.signals import get_signal_color
+from utils.signals import compute_signal_colors, SIGNAL_COLUMNS
+from utils.ml.signal_generator import SignalGenerator
+from utils.memory import compact_frame
 from datetime import datetime, timedelta
 import pandas as pd
 
+# Apenas as colunas usadas pelos sinais, pelo ML e pelo gráfico são calculadas
+APP_COLUMNS = list(dict.fromkeys(SIGNAL_COLUMNS + SignalGenerator.REQUIRED_COLUMNS + PLOT_COLUMNS))
+
 st.set_page_config(layout="wide", page_title="Dashboard Financeiro")
 
 def initialize_session_state():
     """Inicializa o estado da sessão com valores padrão."""
     if 'data_manager' not in st.session_state:
-        alpha_vantage_key = st.secrets.get("ALPHA_VANTAGE_KEY", None)
-        st.session_state.data_manager = StockDataManager(alpha_vantage_key)
+        # Tipos compactos (float32) reduzem a memória de cada ativo carregado
+        compact = bool(st.secrets.get("COMPACT_DTYPES", False))
+        if st.secrets.get("DATA_SOURCE", "online") == "replay":
+            # Dados offline: arquivos locais ou séries sintéticas determinísticas
+            replay_dir = st.secrets.get("REPLAY_DATA_DIR", None)
+            st.session_state.data_manager = ReplayDataManager(replay_dir, compact=compact)
+        else:
+            alpha_vantage_key = st.secrets.get("ALPHA_VANTAGE_KEY", None)
+            st.session_state.data_manager = StockDataManager(alpha_vantage_key, compact=compact)
     if 'ml_predictor' not in st.session_state:
         st.session_state.ml_predictor = MLPredictor()
 
-def calculate_indicators(df):
-    """Calcula todos os indicadores técnicos."""
+def calculate_indicators(df, compact=False):
+    """Calcula todos os indicadores técnicos, opcionalmente em tipos compactos."""
     if df is None or df.empty:
         raise ValueError("DataFrame está vazio ou None")
     
     try:
-        df = df.copy()
-        
-        # Calcular indicadores
-        df = calculate_stochastic(df)
-        df = calculate_rsi(df)
-        df = calculate_macd(df)
-        df = calculate_bollinger_bands(df)
-        df = calculate_atr(df)
+        # Calcular somente os indicadores necessários
+        df = compute_columns(df, APP_COLUMNS)
         
         # Preencher valores NaN
         df = df.fillna(method='bfill').fillna(method='ffill')
         
-        return df
+        return compact_frame(df) if compact else df
         
     except Exception as e:
         raise Exception(f"Erro ao calcular indicadores: {str(e)}")
@@ -128,7 +135,7 @@ def main():
                 st.metric("P/L", info['pe_ratio'])
         
         # Calcular indicadores
-        df = calculate_indicators(df)
+        df = calculate_indicators(df, compact=getattr(st.session_state.data_manager, 'compact', False))
         
         # Machine Learning
         if use_ml and len(df) > 50:  # Mínimo de dados para ML
@@ -155,10 +162,14 @@ def main():
                     df['signal_color'] = st.session_state.ml_predictor.get_trading_signals(df)
                 except Exception as e:
                     st.warning(f"Erro ao treinar modelo ML: {str(e)}")
-                    df['signal_color'] = df.apply(get_signal_color, axis=1)
+                    df['signal_color'] = compute_signal_colors(df)
         else:
             # Usar apenas sinais técnicos
-            df['signal_color'] = df.apply(get_signal_color, axis=1)
+            df['signal_color'] = compute_signal_colors(df)
+        
+        if getattr(st.session_state.data_manager, 'compact', False):
+            # Sinal como categórica: um byte por barra em vez de uma string
+            df = compact_frame(df)
         
         # Plotar gráfico
         fig = create_dashboard_plot(df)
@@ -0,0 +1,39 @@
+"""
+Benchmarks de desempenho do dashboard.
+
+Execute a partir do diretório do projeto, por exemplo:
+    python -m benchmarks.bench_fetch_many
+"""
+import numpy as np
+from utils.indicators.engine import compute_indicators
+from utils.memory import compact_frame
+from utils.replay_data import generate_bars
+
+def parity_cases(n, freq='B'):
+    """
+    Séries de teste das verificações de paridade.
+    
+    Args:
+        n: Barras por série
+        freq: Frequência das barras (use 'min' acima de ~65 mil barras)
+    
+    Returns:
+        Dicionário com as séries 'normal', 'com NaN' (5 barras OHLC em NaN no
+        meio) e 'sem amplitude' (30 barras com OHLC iguais)
+    """
+    normal = generate_bars(n, seed=1, freq=freq)
+    gaps = generate_bars(n, seed=3, freq=freq)
+    gaps.iloc[n // 2:n // 2 + 5, :4] = np.nan
+    flat = generate_bars(n, seed=2, freq=freq)
+    flat.iloc[n // 3:n // 3 + 30, :4] = flat['Close'].iloc[n // 3]
+    return {'normal': normal, 'com NaN': gaps, 'sem amplitude': flat}
+
+def signal_cases(n=5_000):
+    """
+    Indicadores das séries de parity_cases, e da série normal em float32.
+    
+    Usados nas verificações de sinais (compute_signal_colors, regras).
+    """
+    cases = {case: compute_indicators(df) for case, df in parity_cases(n).items()}
+    cases['float32'] = compact_frame(cases['normal'])
+    return cases
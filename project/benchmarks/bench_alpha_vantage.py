@@ -0,0 +1,112 @@
+"""
+Benchmark do AsyncAlphaVantageClient contra um servidor HTTP local simulado.
+
+O servidor imita o endpoint TIME_SERIES_DAILY com latência configurável e
+responde com "Note" (limite atingido) a cada N requisições, permitindo medir
+requisições por minuto, latência de cauda e o efeito das novas tentativas.
+"""
+import asyncio
+import random
+import time
+import uuid
+import numpy as np
+from aiohttp import web
+from utils.alpha_vantage import AlphaVantageClient, AsyncAlphaVantageClient
+
+LATENCY = 0.02  # Segundos por resposta
+QUOTA = 1200  # Requisições por minuto permitidas ao cliente
+BURST = 10  # Rajada inicial permitida pelo token bucket
+NOTE_EVERY = 50  # Uma resposta "Note" a cada N requisições
+SYMBOLS = 300
+API_KEY = uuid.uuid4().hex  # Cota compartilhada pelos dois clientes
+
+DAILY_PAYLOAD = {
+    'Time Series (Daily)': {
+        f'2024-01-{day:02d}': {
+            '1. open': '10.0', '2. high': '11.0', '3. low': '9.5',
+            '4. close': '10.5', '5. volume': '1000'
+        }
+        for day in range(1, 29)
+    }
+}
+
+def make_app():
+    """Cria o servidor simulado."""
+    counter = {'requests': 0}
+    
+    async def query(request):
+        counter['requests'] += 1
+        await asyncio.sleep(LATENCY * random.uniform(0.5, 1.5))
+        if counter['requests'] % NOTE_EVERY == 0:
+            return web.json_response({'Note': 'Thank you for using Alpha Vantage!'})
+        return web.json_response(DAILY_PAYLOAD)
+    
+    app = web.Application()
+    app.router.add_get('/query', query)
+    app['counter'] = counter
+    return app
+
+def percentiles(latencies):
+    """Retorna p50, p95 e p99 em milissegundos."""
+    return [float(np.percentile(latencies, p)) * 1000 for p in (50, 95, 99)]
+
+async def run_async(base_url, symbols):
+    """Busca todos os símbolos concorrentemente com o cliente assíncrono."""
+    latencies = []
+    client = AsyncAlphaVantageClient(API_KEY, base_url=base_url,
+                                     request_limit=QUOTA, burst=BURST, backoff=0.05)
+    
+    async def timed(symbol):
+        t0 = time.perf_counter()
+        df = await client.get_daily_data(symbol)
+        latencies.append(time.perf_counter() - t0)
+        return df
+    
+    async with client:
+        t0 = time.perf_counter()
+        results = await asyncio.gather(*(timed(s) for s in symbols))
+        elapsed = time.perf_counter() - t0
+    
+    assert all(not df.empty for df in results)
+    return elapsed, latencies, client.throttled
+
+def run_sync(base_url, symbols):
+    """Busca os símbolos em série com o cliente síncrono, na mesma cota."""
+    latencies = []
+    client = AlphaVantageClient(API_KEY, base_url=base_url, request_limit=QUOTA)
+    t0 = time.perf_counter()
+    for symbol in symbols:
+        t1 = time.perf_counter()
+        client.get_daily_data(symbol)
+        latencies.append(time.perf_counter() - t1)
+    return time.perf_counter() - t0, latencies
+
+async def main():
+    app = make_app()
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base_url = f'http://127.0.0.1:{port}/query'
+    symbols = [f'SYM{i}.SA' for i in range(SYMBOLS)]
+    
+    try:
+        elapsed, latencies, throttled = await run_async(base_url, symbols)
+        p50, p95, p99 = percentiles(latencies)
+        rpm = app['counter']['requests'] / elapsed * 60
+        print(f"assíncrono: {elapsed:.2f}s, {rpm:.0f} req/min (cota {QUOTA}), "
+              f"p50 {p50:.0f}ms p95 {p95:.0f}ms p99 {p99:.0f}ms, {throttled} respostas Note")
+        
+        sync_symbols = symbols[:SYMBOLS // 10]
+        start_requests = app['counter']['requests']
+        elapsed, latencies = await asyncio.to_thread(run_sync, base_url, sync_symbols)
+        p50, p95, p99 = percentiles(latencies)
+        rpm = (app['counter']['requests'] - start_requests) / elapsed * 60
+        print(f"síncrono ({len(sync_symbols)} símbolos): {elapsed:.2f}s, {rpm:.0f} req/min, "
+              f"p50 {p50:.0f}ms p95 {p95:.0f}ms p99 {p99:.0f}ms")
+    finally:
+        await runner.cleanup()
+
+if __name__ == '__main__':
+    asyncio.run(main())
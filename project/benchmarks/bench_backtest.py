@@ -0,0 +1,148 @@
+"""
+Equivalência e tempo do kernel de Strategy.run_backtest.
+
+O kernel é comparado com o laço original por barra (reproduzido abaixo) em
+sinais aleatórios e em sinais de compute_signal_colors: registro de trades,
+posições, capital final, capital máximo e get_metrics devem coincidir.
+
+O laço original leva minutos em 1M de barras; por isso é cronometrado em
+REFERENCE_BARS barras e o ganho é dado por barra.
+
+Uso: python -m benchmarks.bench_backtest [n_barras]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from utils.backtest import Strategy
+from utils.indicators.engine import compute_indicators
+from utils.signals import SIGNAL_CATEGORIES, compute_signal_colors
+from utils.replay_data import generate_bars
+
+N_BARS = 1_000_000
+REFERENCE_BARS = 20_000
+
+def reference_backtest(strategy):
+    """Laço original de run_backtest, com leituras .iloc e gravação por barra."""
+    position = 0
+    entry_price = 0
+    trades = []
+    strategy.current_capital = strategy.initial_capital
+    
+    for i in range(1, len(strategy.df)):
+        current_price = float(strategy.df['Close'].iloc[i])
+        current_date = strategy.df.index[i]
+        signal = strategy.df['signal_color'].iloc[i]
+        
+        if position > 0:
+            stop_loss = entry_price * 0.98
+            
+            if current_price <= stop_loss or signal == 'red':
+                revenue = position * current_price * 0.998
+                cost = position * entry_price * 1.002
+                profit = revenue - cost
+                profit_pct = (profit / cost) * 100
+                
+                strategy.current_capital += revenue
+                strategy.max_capital = max(strategy.max_capital, strategy.current_capital)
+                
+                trades.append({
+                    'date': current_date,
+                    'type': 'sell',
+                    'price': current_price,
+                    'shares': position,
+                    'cost': None,
+                    'capital': strategy.current_capital,
+                    'revenue': revenue,
+                    'profit': profit,
+                    'profit_pct': profit_pct,
+                    'exit_reason': 'stop_loss' if current_price <= stop_loss else 'signal'
+                })
+                
+                position = 0
+                entry_price = 0
+        
+        elif position == 0 and signal == 'green':
+            position_size = int((strategy.current_capital * 0.95) / current_price)
+            
+            if position_size > 0:
+                cost = position_size * current_price * 1.002
+                if cost <= strategy.current_capital:
+                    position = position_size
+                    entry_price = current_price
+                    strategy.current_capital -= cost
+                    
+                    trades.append({
+                        'date': current_date,
+                        'type': 'buy',
+                        'price': current_price,
+                        'shares': position_size,
+                        'cost': cost,
+                        'capital': strategy.current_capital,
+                        'revenue': None,
+                        'profit': None,
+                        'profit_pct': None,
+                        'exit_reason': None
+                    })
+        
+        strategy.positions.iloc[i] = {
+            'position': position,
+            'capital': strategy.current_capital + (position * current_price if position > 0 else 0)
+        }
+    
+    trades_df = pd.DataFrame(trades)
+    if not trades_df.empty:
+        trades_df['date'] = pd.to_datetime(trades_df['date'])
+    return trades_df
+
+def random_signals(n, seed, freq='B'):
+    """Barras sintéticas com sinais sorteados (mais trocas que os indicadores)."""
+    df = generate_bars(n, freq=freq, seed=seed)
+    rng = np.random.default_rng(seed)
+    colors = rng.choice(SIGNAL_CATEGORIES, size=n, p=[0.2, 0.2, 0.6])
+    df['signal_color'] = pd.Categorical(colors, categories=SIGNAL_CATEGORIES)
+    return df
+
+def check_equivalence():
+    """Falha se o kernel diferir do laço original."""
+    cases = {f'aleatório {seed}': random_signals(3_000, seed) for seed in range(5)}
+    df = compute_indicators(generate_bars(3_000, seed=7))
+    df['signal_color'] = compute_signal_colors(df)
+    cases['indicadores'] = df
+    cases['sem trades'] = random_signals(500, 8).assign(signal_color='black')
+    
+    for case, df in cases.items():
+        expected_strategy = Strategy(df, 10000.0)
+        expected = reference_backtest(expected_strategy)
+        strategy = Strategy(df, 10000.0)
+        trades = strategy.run_backtest()
+        
+        pd.testing.assert_frame_equal(trades, expected, check_dtype=False, obj=case)
+        pd.testing.assert_frame_equal(strategy.positions, expected_strategy.positions,
+                                      check_dtype=False, obj=case)
+        assert strategy.current_capital == expected_strategy.current_capital, case
+        assert strategy.max_capital == expected_strategy.max_capital, case
+        assert strategy.get_metrics(trades) == expected_strategy.get_metrics(expected), case
+
+def run(n):
+    check_equivalence()
+    print("Equivalência com o laço original: OK\n")
+    
+    strategy = Strategy(random_signals(REFERENCE_BARS, 1, freq='min'))
+    t0 = time.perf_counter()
+    reference_backtest(strategy)
+    t_loop = (time.perf_counter() - t0) / REFERENCE_BARS
+    
+    df = random_signals(n, 2, freq='min')
+    Strategy(df.iloc[:100]).run_backtest()
+    strategy = Strategy(df)
+    t0 = time.perf_counter()
+    strategy.run_backtest()
+    t_kernel = (time.perf_counter() - t0) / n
+    
+    print(f"laço original: {t_loop * 1e6:.2f} µs/barra ({REFERENCE_BARS:,} barras)")
+    print(f"kernel:        {t_kernel * 1e6:.4f} µs/barra ({n:,} barras, {t_kernel * n:.3f} s)")
+    print(f"ganho:         {t_loop / t_kernel:.0f}x")
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else N_BARS)
@@ -0,0 +1,69 @@
+"""
+Equivalência e tempo de run_batch contra uma Strategy por variante de sinal.
+
+Cada linha da tabela de run_batch é comparada com get_metrics de uma
+Strategy executada sobre o mesmo fechamento e a mesma coluna de sinais.
+
+Uso: python -m benchmarks.bench_batch [n_estratégias] [n_barras]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from utils.backtest import Strategy, run_batch, METRIC_COLUMNS
+from utils.signals import GREEN, RED, BLACK, signals_from_codes
+from utils.replay_data import generate_bars
+
+N_STRATEGIES = 200
+N_BARS = 10_000
+
+def random_codes(n_bars, n_strategies, seed):
+    """Bloco barras x estratégias de códigos sorteados (green, red, black)."""
+    rng = np.random.default_rng(seed)
+    return rng.choice(np.array([GREEN, RED, BLACK], dtype=np.int8), size=(n_bars, n_strategies), p=[0.2, 0.2, 0.6])
+
+def per_strategy(df, codes):
+    """Uma Strategy (com sua cópia do DataFrame) por coluna de sinais."""
+    rows = []
+    for j in range(codes.shape[1]):
+        strategy = Strategy(df.assign(signal_color=signals_from_codes(codes[:, j], df.index)))
+        trades = strategy.run_backtest()
+        rows.append(strategy.get_metrics(trades))
+    return pd.DataFrame(rows, columns=METRIC_COLUMNS)
+
+def check_equivalence():
+    """Falha se alguma linha de run_batch diferir de get_metrics."""
+    df = generate_bars(3_000, seed=1)
+    codes = random_codes(len(df), 20, seed=2)
+    # Uma variante sem nenhuma entrada
+    codes[:, 0] = BLACK
+    expected = per_strategy(df, codes)
+    pd.testing.assert_frame_equal(run_batch(df['Close'], codes), expected, check_dtype=False)
+    pd.testing.assert_frame_equal(run_batch(df['Close'], codes, max_workers=1), expected, check_dtype=False)
+
+def run(n_strategies, n_bars):
+    check_equivalence()
+    print("Equivalência com Strategy.get_metrics: OK\n")
+    
+    df = generate_bars(n_bars, seed=3)
+    codes = random_codes(n_bars, n_strategies, seed=4)
+    run_batch(df['Close'].iloc[:100], codes[:100, :2])
+    
+    t0 = time.perf_counter()
+    per_strategy(df, codes)
+    t_loop = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    run_batch(df['Close'], codes, max_workers=1)
+    t_serial = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    run_batch(df['Close'], codes)
+    t_parallel = time.perf_counter() - t0
+    
+    print(f"{n_strategies} estratégias x {n_bars:,} barras")
+    print(f"  Strategy por variante: {t_loop:.3f} s")
+    print(f"  run_batch (1 thread):  {t_serial:.3f} s ({t_loop / t_serial:.1f}x)")
+    print(f"  run_batch (paralelo):  {t_parallel:.3f} s ({t_loop / t_parallel:.1f}x)")
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*(args + [N_STRATEGIES, N_BARS][len(args):]))
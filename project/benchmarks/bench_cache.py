@@ -0,0 +1,82 @@
+"""
+Tempo do motor e do registro de indicadores com e sem o cache de resultados.
+
+Simula reruns do Streamlit: o mesmo DataFrame (e uma cópia dele) é
+recalculado várias vezes; o resultado com cache deve ser idêntico ao
+cálculo direto, e barras alteradas com o mesmo índice (última barra, NaN no
+meio da série) não podem reaproveitar o resultado anterior.
+
+Uso: python -m benchmarks.bench_cache [n_barras]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from utils.indicators.engine import compute_indicators
+from utils.indicators.registry import compute_columns
+from utils.indicator_cache import IndicatorCache, get_indicator_cache, set_indicator_cache
+from utils.signals import SIGNAL_COLUMNS
+from utils.replay_data import generate_bars
+
+N_BARS = 1_000_000
+RERUNS = 5
+
+def timed_reruns(compute, df):
+    """Tempo médio de RERUNS cálculos sobre cópias do mesmo DataFrame."""
+    t0 = time.perf_counter()
+    for _ in range(RERUNS):
+        result = compute(df.copy())
+    return result, (time.perf_counter() - t0) / RERUNS
+
+def changed_bars(df):
+    """Cópias de df com o mesmo índice e valores alterados: última barra e barras do meio."""
+    last = df.copy()
+    last.iloc[-1, last.columns.get_loc('Close')] *= 1.01
+    gaps = df.copy()
+    middle = len(df) // 2
+    gaps.iloc[middle:middle + 5, :4] = np.nan
+    return {'última barra': last, 'NaN no meio': gaps}
+
+def check_changed_bars(compute, df):
+    """Falha se barras alteradas com o mesmo índice reaproveitarem o resultado em cache."""
+    previous = get_indicator_cache()
+    try:
+        for case, changed in changed_bars(df).items():
+            set_indicator_cache(None)
+            expected = compute(changed)
+            set_indicator_cache(IndicatorCache())
+            compute(df)
+            result = compute(changed)
+            pd.testing.assert_frame_equal(result, expected, check_exact=True, obj=case)
+    finally:
+        set_indicator_cache(previous)
+
+def run(n):
+    df = generate_bars(n, freq='min')
+    cases = {
+        'compute_indicators': compute_indicators,
+        'compute_columns': lambda frame: compute_columns(frame, SIGNAL_COLUMNS)
+    }
+    print(f"{n:,} barras, {RERUNS} reruns")
+    for name, compute in cases.items():
+        check_changed_bars(compute, df.iloc[:5_000])
+        previous = get_indicator_cache()
+        try:
+            set_indicator_cache(None)
+            compute(df.iloc[:100])
+            expected, t_direct = timed_reruns(compute, df)
+            
+            cache = IndicatorCache()
+            set_indicator_cache(cache)
+            result, t_cached = timed_reruns(compute, df)
+        finally:
+            set_indicator_cache(previous)
+        
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+        print(f"  {name}")
+        print(f"    sem cache: {t_direct:.3f} s por rerun")
+        print(f"    com cache: {t_cached:.3f} s por rerun ({t_direct / t_cached:.1f}x)")
+        print(f"    {cache.stats()}")
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else N_BARS)
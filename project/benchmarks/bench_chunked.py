@@ -0,0 +1,71 @@
+"""
+Paridade e memória de pico do cálculo em blocos contra o cálculo em memória.
+
+O resultado gravado por compute_chunked é comparado bit a bit com
+compute_indicators em séries normal, com NaN e com barras sem amplitude,
+com blocos menores e maiores que as janelas dos indicadores.
+
+Uso: python -m benchmarks.bench_chunked [n_barras]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+from utils.indicators.engine import compute_indicators
+from utils.indicators.chunked import compute_chunked, parquet_chunks
+from utils.indicator_cache import get_indicator_cache, set_indicator_cache
+from utils.replay_data import generate_bars
+from benchmarks import parity_cases
+
+N_BARS = 2_000_000
+CHUNK_SIZES = [7, 1_000, 100_000]
+
+def check_parity(tmp_dir):
+    """Falha se o resultado em blocos diferir do cálculo em memória."""
+    for case, df in parity_cases(20_000, freq='min').items():
+        source = os.path.join(tmp_dir, 'bars.parquet')
+        df.to_parquet(source)
+        expected = compute_indicators(df, backend='native')
+        for chunk_size in CHUNK_SIZES:
+            output = os.path.join(tmp_dir, 'indicators.parquet')
+            compute_chunked(parquet_chunks(source, chunk_size), output)
+            pd.testing.assert_frame_equal(pd.read_parquet(output), expected, check_exact=True,
+                                          check_freq=False, obj=f"{case}, blocos de {chunk_size}")
+
+def peak_memory(fn):
+    """Tempo e pico de memória alocada por fn."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+def run(n):
+    previous = get_indicator_cache()
+    set_indicator_cache(None)
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            check_parity(tmp_dir)
+            print("Paridade com compute_indicators: OK\n")
+            
+            source = os.path.join(tmp_dir, 'history.parquet')
+            generate_bars(n, freq='min').to_parquet(source)
+            output = os.path.join(tmp_dir, 'indicators.parquet')
+            
+            t_memory, peak_memory_all = peak_memory(
+                lambda: compute_indicators(pd.read_parquet(source)).to_parquet(output))
+            t_chunked, peak_chunked = peak_memory(
+                lambda: compute_chunked(parquet_chunks(source, 100_000), output))
+    finally:
+        set_indicator_cache(previous)
+    
+    print(f"{n:,} barras")
+    print(f"  em memória: {t_memory:.3f} s, pico {peak_memory_all / 2**20:,.0f} MiB")
+    print(f"  em blocos:  {t_chunked:.3f} s, pico {peak_chunked / 2**20:,.0f} MiB")
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else N_BARS)
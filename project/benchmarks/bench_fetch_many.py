@@ -0,0 +1,67 @@
+"""
+Benchmark de StockDataManager.fetch_many contra uma fonte local simulada.
+
+A fonte simulada responde com latência fixa, reproduzindo o custo de ida e
+volta de uma requisição real sem acessar a rede.
+"""
+import contextlib
+import io
+import time
+import numpy as np
+import pandas as pd
+from datetime import date
+from utils.data import StockDataManager
+
+LATENCY = 0.05  # Segundos por requisição
+BATCH_SIZES = [1, 10, 50, 100, 400]
+FAILURE_EVERY = 25  # Um a cada N símbolos falha
+
+class StubDataManager(StockDataManager):
+    """Gerenciador com download simulado e sem armazenamento local."""
+    
+    def __init__(self, latency=LATENCY):
+        super().__init__(store_dir=None)
+        self.latency = latency
+    
+    def _download(self, source, symbol, start, end, interval):
+        time.sleep(self.latency)
+        if symbol.startswith('FAIL'):
+            raise ConnectionError('falha simulada')
+        index = pd.bdate_range(start, end, inclusive='left')
+        close = 10 + np.cumsum(np.random.default_rng(0).normal(0, 0.1, len(index)))
+        return pd.DataFrame({
+            'Open': close, 'High': close, 'Low': close, 'Close': close,
+            'Volume': np.full(len(index), 1000)
+        }, index=index)
+
+def make_symbols(n):
+    """Gera símbolos fictícios, incluindo alguns que falham."""
+    return [f'FAIL{i}' if i % FAILURE_EVERY == FAILURE_EVERY - 1 else f'SYM{i}'
+            for i in range(n)]
+
+def run():
+    manager = StubDataManager()
+    start, end = date(2023, 1, 1), date(2024, 1, 1)
+    
+    print(f"{'símbolos':>9} {'serial (s)':>11} {'fetch_many (s)':>15} {'speedup':>8} {'falhas':>7}")
+    for n in BATCH_SIZES:
+        symbols = make_symbols(n)
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            for symbol in symbols:
+                try:
+                    manager.fetch_stock_data(symbol, start, end)
+                except Exception:
+                    pass
+            serial = time.perf_counter() - t0
+            
+            t0 = time.perf_counter()
+            data, failures = manager.fetch_many(symbols, start, end, max_workers=16)
+            batched = time.perf_counter() - t0
+        
+        assert len(data) + len(failures) == n
+        print(f"{n:>9} {serial:>11.2f} {batched:>15.2f} {serial / batched:>7.1f}x {len(failures):>7}")
+
+if __name__ == '__main__':
+    run()
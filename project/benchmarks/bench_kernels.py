@@ -0,0 +1,90 @@
+"""
+Paridade numérica e tempo dos kernels nativos contra o pandas_ta.
+
+Cada indicador é comparado bit a bit com o pandas_ta em séries sintéticas,
+incluindo barras sem amplitude e lacunas com NaN, tanto com numba quanto
+pelo caminho alternativo sem numba.
+
+Uso: python -m benchmarks.bench_kernels [n_barras]
+"""
+import sys
+import time
+import numpy as np
+import pandas_ta as ta
+from utils.indicators import kernels
+from utils.replay_data import generate_bars
+from benchmarks import parity_cases
+
+N_BARS = 1_000_000
+
+def pairs(df):
+    """Pares (nome, nativo, pandas_ta) para cada saída dos indicadores."""
+    high, low, close = df['High'], df['Low'], df['Close']
+    h, l, c = (s.to_numpy() for s in (high, low, close))
+    
+    stoch_k, stoch_d = kernels.stochastic(h, l, c, 14, 3, 3)
+    stoch = ta.stoch(high=high, low=low, close=close, k=14, d=3, smooth_k=3).reindex(df.index)
+    macd, signal, hist = kernels.macd(c, 12, 26, 9)
+    ta_macd = ta.macd(close=close, fast=12, slow=26, signal=9)
+    upper, middle, lower = kernels.bollinger_bands(c, 20, 2)
+    bbands = ta.bbands(close=close, length=20, std=2)
+    return [
+        ('RSI', kernels.rsi(c, 7), ta.rsi(close=close, length=7)),
+        ('STOCH_K', stoch_k, stoch.iloc[:, 0]),
+        ('STOCH_D', stoch_d, stoch.iloc[:, 1]),
+        ('MACD', macd, ta_macd.iloc[:, 0]),
+        ('MACD_SIGNAL', signal, ta_macd.iloc[:, 2]),
+        ('MACD_HIST', hist, ta_macd.iloc[:, 1]),
+        ('BB_UPPER', upper, bbands.iloc[:, 2]),
+        ('BB_MIDDLE', middle, bbands.iloc[:, 1]),
+        ('BB_LOWER', lower, bbands.iloc[:, 0]),
+        ('ATR', kernels.atr(h, l, c, 14), ta.atr(high=high, low=low, close=close, length=14))
+    ]
+
+def check_parity(cases):
+    """Falha se algum indicador diferir do pandas_ta."""
+    for case, df in cases.items():
+        for name, native, reference in pairs(df):
+            reference = reference.to_numpy()
+            if not np.array_equal(native, reference, equal_nan=True):
+                diff = np.nanmax(np.abs(native - reference))
+                raise AssertionError(f"{name} ({case}) difere do pandas_ta: {diff:.3e}")
+
+def timings(df):
+    """Tempo de cada indicador nos dois backends."""
+    high, low, close = df['High'], df['Low'], df['Close']
+    h, l, c = (s.to_numpy() for s in (high, low, close))
+    cases = {
+        'RSI': (lambda: kernels.rsi(c, 7), lambda: ta.rsi(close=close, length=7)),
+        'Stochastic': (lambda: kernels.stochastic(h, l, c), lambda: ta.stoch(high=high, low=low, close=close)),
+        'MACD': (lambda: kernels.macd(c), lambda: ta.macd(close=close)),
+        'Bollinger': (lambda: kernels.bollinger_bands(c, 20, 2), lambda: ta.bbands(close=close, length=20, std=2)),
+        'ATR': (lambda: kernels.atr(h, l, c, 14), lambda: ta.atr(high=high, low=low, close=close, length=14))
+    }
+    print(f"{'indicador':>11} {'nativo (s)':>11} {'pandas_ta (s)':>14} {'speedup':>8}")
+    for name, (native, reference) in cases.items():
+        native()
+        t0 = time.perf_counter()
+        native()
+        t_native = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        reference()
+        t_reference = time.perf_counter() - t0
+        print(f"{name:>11} {t_native:>11.4f} {t_reference:>14.4f} {t_reference / t_native:>7.1f}x")
+
+def run(n):
+    cases = parity_cases(min(n, 20_000), freq='min')
+    check_parity(cases)
+    if kernels.NUMBA_AVAILABLE:
+        # Caminho sem numba: mesmas saídas pelas primitivas do pandas
+        kernels.NUMBA_AVAILABLE = False
+        try:
+            check_parity(cases)
+        finally:
+            kernels.NUMBA_AVAILABLE = True
+    print("Paridade com pandas_ta: OK (com e sem numba)\n")
+    
+    timings(generate_bars(n, freq='min'))
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else N_BARS)
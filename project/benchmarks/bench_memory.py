@@ -0,0 +1,50 @@
+"""
+Relatório de memória por barra antes e depois da compactação de tipos.
+
+Usa séries sintéticas com as colunas extras do yfinance e do MT5, os
+indicadores do dashboard e a coluna de sinal, reproduzindo o que fica em
+memória para cada ativo carregado.
+"""
+import numpy as np
+import pandas as pd
+from utils.memory import compact_frame, memory_report
+from utils.replay_data import generate_bars
+
+N_SYMBOLS = 20
+N_BARS = 5000
+INDICATOR_COLUMNS = [
+    'STOCH_K', 'STOCH_D', 'STOCH_K_PREV', 'STOCH_D_PREV', 'RSI', 'RSI_PREV',
+    'MACD', 'MACD_SIGNAL', 'MACD_HIST', 'MACD_PREV', 'BB_UPPER', 'BB_MIDDLE',
+    'BB_LOWER', 'BB_WIDTH', 'BB_PCT', 'ATR', 'ATR_PCT', 'ATR_MA'
+]
+
+def make_frame(seed):
+    """Gera um DataFrame com barras, colunas extras, indicadores e sinais."""
+    df = generate_bars(N_BARS, seed=seed)
+    rng = np.random.default_rng(seed)
+    df['Volume'] = df['Volume'].astype(np.float64)
+    df['Dividends'] = 0.0
+    df['Stock Splits'] = 0.0
+    for col in INDICATOR_COLUMNS:
+        df[col] = rng.standard_normal(N_BARS)
+    df['signal_color'] = rng.choice(['green', 'red', 'black'], N_BARS)
+    return df
+
+def run():
+    frames = {f'SYM{i}': make_frame(i) for i in range(N_SYMBOLS)}
+    
+    report = memory_report(frames)
+    with pd.option_context('display.float_format', '{:,.2f}'.format,
+                           'display.width', 200, 'display.max_columns', None):
+        print(report.tail(4))
+    
+    # Erro introduzido pelo float32 nos preços
+    df = frames['SYM0']
+    compact = compact_frame(df)
+    error = (compact['Close'].astype(np.float64) / df['Close'] - 1).abs().max()
+    print(f"\nErro relativo máximo em Close: {error:.2e}")
+    assert (compact['signal_color'].astype(str) == df['signal_color']).all()
+    assert (compact['Volume'] == df['Volume']).all()
+
+if __name__ == '__main__':
+    run()
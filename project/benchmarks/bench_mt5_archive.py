@@ -0,0 +1,148 @@
+"""
+Ingestão do MT5DataManager no arquivo local contra um terminal MetaTrader5 simulado.
+
+O módulo MetaTrader5 é substituído por um terminal falso com histórico
+sintético fixo. Cada cenário compara o arquivo construído de forma
+incremental com o de um gerenciador novo que baixa o período inteiro de uma
+vez: ampliar a janela para trás (ex: '1mo' e depois '1y') deve trazer o
+histórico anterior à primeira barra arquivada, também no intervalo base dos
+intervalos reamostrados, e histórico inexistente no terminal não deve ser
+pedido de novo a cada chamada. '1d' continua sendo baixado em D1 mesmo com
+intervalo base '1m'.
+
+Uso: python -m benchmarks.bench_mt5_archive
+"""
+import sys
+import tempfile
+import time
+import types
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from utils.bar_archive import RATES_DTYPE
+
+# Histórico disponível no terminal simulado
+HISTORY_START = datetime(2020, 1, 1)
+HISTORY_END = datetime(2024, 6, 28, 18)
+TIMEFRAMES = {'TIMEFRAME_D1': 86400, 'TIMEFRAME_H1': 3600, 'TIMEFRAME_M15': 900,
+              'TIMEFRAME_M5': 300, 'TIMEFRAME_M1': 60}
+
+def fake_mt5():
+    """Módulo MetaTrader5 falso: timeframes em segundos e copy_rates_range sintético."""
+    module = types.ModuleType('MetaTrader5')
+    module.requests = []
+    module.__dict__.update(TIMEFRAMES)
+    module.initialize = lambda: True
+    module.shutdown = lambda: None
+    module.symbol_info = lambda symbol: None
+    
+    def copy_rates_range(symbol, timeframe, date_from, date_to):
+        module.requests.append((symbol, timeframe, date_from, date_to))
+        lo = max(pd.Timestamp(date_from), pd.Timestamp(HISTORY_START)).timestamp()
+        hi = min(pd.Timestamp(date_to), pd.Timestamp(HISTORY_END)).timestamp()
+        first = -(-int(lo) // timeframe) * timeframe
+        times = np.arange(first, int(hi) + 1, timeframe, dtype=np.int64)
+        rates = np.zeros(len(times), dtype=RATES_DTYPE)
+        rates['time'] = times
+        rates['close'] = 100 + 10 * np.sin(times / 86400.0) + (times % 7919) / 7919.0
+        rates['open'] = rates['close'] - 0.1
+        rates['high'] = rates['close'] + 0.5
+        rates['low'] = rates['close'] - 0.5
+        rates['tick_volume'] = times % 1000
+        return rates
+    
+    module.copy_rates_range = copy_rates_range
+    return module
+
+mt5 = sys.modules['MetaTrader5'] = fake_mt5()
+from utils.mt5_data import MT5DataManager  # noqa: E402
+
+def manager(base_interval=None):
+    """Gerenciador com arquivo em diretório temporário."""
+    return MT5DataManager(tempfile.mkdtemp(prefix='mt5_archive_'), base_interval=base_interval)
+
+def check_archive(data, symbol, interval):
+    """Falha se o arquivo tiver horários repetidos ou fora de ordem."""
+    times = data.archive.open(symbol, interval)['time']
+    assert np.all(np.diff(times) > 0), f"{symbol} {interval}: horários fora de ordem"
+
+def check_widen_backwards():
+    """Ampliar a janela para trás traz o histórico anterior à primeira barra arquivada."""
+    date_to = HISTORY_END
+    data = manager()
+    data.ingest_range('BBDC4', '1d', date_to - timedelta(days=30), date_to)
+    month = len(data.read_range('BBDC4', '1d'))
+    data.ingest_range('BBDC4', '1d', date_to - timedelta(days=365), date_to)
+    check_archive(data, 'BBDC4', '1d')
+    
+    fresh = manager()
+    fresh.ingest_range('BBDC4', '1d', date_to - timedelta(days=365), date_to)
+    widened = data.read_range('BBDC4', '1d')
+    expected = fresh.read_range('BBDC4', '1d')
+    assert np.array_equal(widened, expected), "janela ampliada difere do download completo"
+    assert len(widened) > 10 * month, f"{len(widened)} barras após ampliar (antes {month})"
+    return month, len(widened)
+
+def check_widen_resampled():
+    """Intervalos reamostrados também recebem o histórico inserido no intervalo base."""
+    date_to = HISTORY_END
+    since = date_to - timedelta(days=90)
+    data = manager('1m')
+    data.ingest_range('BBDC4', '1m', date_to - timedelta(days=30), date_to)
+    data.read_resampled('BBDC4', '1h', since)
+    data.ingest_range('BBDC4', '1m', since, date_to)
+    check_archive(data, 'BBDC4', '1m')
+    
+    fresh = manager('1m')
+    fresh.ingest_range('BBDC4', '1m', since, date_to)
+    widened = data.read_resampled('BBDC4', '1h', since)
+    expected = fresh.read_resampled('BBDC4', '1h', since)
+    assert np.array_equal(widened, expected), "barras de 1h diferem após ampliar o intervalo base"
+
+def check_missing_history():
+    """Histórico que o terminal não tem é pedido uma única vez."""
+    data = manager()
+    data.ingest_range('BBDC4', '1d', HISTORY_START + timedelta(days=400), HISTORY_END)
+    data.ingest_range('BBDC4', '1d', HISTORY_START - timedelta(days=365), HISTORY_END)
+    first = data.archive.first_time('BBDC4', '1d')
+    assert first == int(pd.Timestamp(HISTORY_START).timestamp()), "início do histórico não arquivado"
+    
+    del mt5.requests[:]
+    data.ingest_range('BBDC4', '1d', HISTORY_START - timedelta(days=365), HISTORY_END)
+    head = [req for req in mt5.requests if pd.Timestamp(req[2]).timestamp() < first]
+    assert not head, f"{len(head)} pedidos repetidos do histórico inexistente"
+    check_archive(data, 'BBDC4', '1d')
+
+def check_native_daily():
+    """'1d' e janelas maiores que o histórico M1 do terminal não são derivados de 1m."""
+    data = manager('1m')
+    del mt5.requests[:]
+    data.fetch_stock_data('BBDC4', '5y', '1d')
+    timeframes = {req[1] for req in mt5.requests}
+    assert timeframes == {mt5.TIMEFRAME_D1}, f"'5y' em '1d' pediu os timeframes {timeframes}"
+    
+    date_to = HISTORY_END
+    assert data._is_derived('1h', date_to - timedelta(days=30), date_to)
+    assert not data._is_derived('1h', date_to - timedelta(days=180), date_to)
+    return len(mt5.requests)
+
+def run():
+    month, year = check_widen_backwards()
+    print(f"'1mo' e depois '1y': {month} -> {year} barras, igual ao download completo: OK")
+    check_widen_resampled()
+    print("Reamostragem após ampliar o intervalo base: OK")
+    check_missing_history()
+    print("Histórico inexistente pedido uma única vez: OK")
+    requests = check_native_daily()
+    print(f"'5y' em '1d' com base '1m': {requests} pedidos D1, nenhum M1: OK")
+    
+    date_to = HISTORY_END
+    data = manager()
+    data.ingest_range('BBDC4', '1m', date_to - timedelta(days=30), date_to)
+    t0 = time.perf_counter()
+    written = data.ingest_range('BBDC4', '1m', date_to - timedelta(days=365), date_to)
+    elapsed = time.perf_counter() - t0
+    print(f"\nInserção de {written:,} barras de 1m no início do arquivo: {elapsed:.3f} s")
+
+if __name__ == '__main__':
+    run()
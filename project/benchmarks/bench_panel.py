@@ -0,0 +1,70 @@
+"""
+Paridade e tempo do cálculo de indicadores em painel contra o laço por símbolo.
+
+Cada coluna do painel é comparada bit a bit com compute_indicators aplicado
+ao símbolo isolado (sem as barras ausentes).
+
+Uso: python -m benchmarks.bench_panel [n_símbolos] [n_barras]
+"""
+import sys
+import time
+import numpy as np
+from utils.indicators.engine import compute_indicators, INDICATOR_COLUMNS
+from utils.indicators.panel import align_panel, compute_panel
+from utils.indicator_cache import get_indicator_cache, set_indicator_cache
+from utils.replay_data import generate_bars
+
+N_SYMBOLS = 400
+N_BARS = 2_500
+
+def make_universe(n_symbols, n_bars):
+    """Símbolos sintéticos; alguns começam depois e têm lacunas."""
+    frames = {}
+    for j in range(n_symbols):
+        df = generate_bars(n_bars, seed=j)
+        if j % 7 == 1:
+            df = df.iloc[n_bars // 4:]
+        if j % 5 == 2:
+            df = df.drop(df.index[n_bars // 2:n_bars // 2 + 3])
+        frames[f"SYM{j:03d}"] = df
+    return frames
+
+def per_symbol(frames):
+    return {symbol: compute_indicators(df) for symbol, df in frames.items()}
+
+def run(n_symbols, n_bars):
+    frames = make_universe(n_symbols, n_bars)
+    panel = align_panel(frames)
+    compute_panel(panel['High'].iloc[:100, :2], panel['Low'].iloc[:100, :2], panel['Close'].iloc[:100, :2])
+    
+    # Sem cache, para medir o cálculo do laço por símbolo
+    previous = get_indicator_cache()
+    set_indicator_cache(None)
+    try:
+        t0 = time.perf_counter()
+        expected = per_symbol(frames)
+        t_loop = time.perf_counter() - t0
+    finally:
+        set_indicator_cache(previous)
+    
+    t0 = time.perf_counter()
+    result = compute_panel(panel['High'], panel['Low'], panel['Close'])
+    t_panel = time.perf_counter() - t0
+    
+    columns = [col for cols in INDICATOR_COLUMNS.values() for col in cols]
+    for symbol, df in expected.items():
+        for col in columns:
+            values = result[col][symbol].reindex(df.index).to_numpy()
+            if not np.array_equal(values, df[col].to_numpy(), equal_nan=True):
+                raise AssertionError(f"{col} ({symbol}) difere do cálculo por símbolo")
+        missing = result['RSI'][symbol].index.difference(df.index)
+        assert result['RSI'][symbol].loc[missing].isna().all()
+    print("Paridade com o cálculo por símbolo: OK")
+    
+    print(f"{n_symbols} símbolos x {n_bars:,} barras")
+    print(f"  laço por símbolo: {t_loop:.3f} s")
+    print(f"  painel:           {t_panel:.3f} s ({t_loop / t_panel:.1f}x)")
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(args[0] if args else N_SYMBOLS, args[1] if len(args) > 1 else N_BARS)
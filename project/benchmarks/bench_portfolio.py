@@ -0,0 +1,77 @@
+"""
+Equivalência e tempo do backtest de carteira (utils.portfolio).
+
+Com um único ativo e dimensionamento 'equal', Portfolio deve reproduzir
+Strategy: trades, posições, patrimônio e get_metrics. Em carteiras de vários
+ativos, a soma das contribuições por ativo deve igualar o retorno total.
+
+Uso: python -m benchmarks.bench_portfolio [n_símbolos] [n_barras]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from utils.backtest import Strategy
+from utils.indicators.panel import align_panel, compute_panel
+from utils.portfolio import Portfolio
+from utils.rules import DEFAULT_RULES
+from utils.signals import SIGNAL_CATEGORIES
+from utils.replay_data import generate_bars
+
+N_SYMBOLS = 50
+N_BARS = 5_000
+
+def random_signals(n, seed):
+    """Barras sintéticas com sinais sorteados."""
+    df = generate_bars(n, seed=seed)
+    rng = np.random.default_rng(seed)
+    colors = rng.choice(SIGNAL_CATEGORIES, size=n, p=[0.2, 0.2, 0.6])
+    df['signal_color'] = pd.Categorical(colors, categories=SIGNAL_CATEGORIES)
+    return df
+
+def basket(n_symbols, n_bars):
+    """Fechamentos e sinais de DEFAULT_RULES para uma cesta sintética."""
+    frames = {f'S{j}': generate_bars(n_bars, seed=j) for j in range(n_symbols)}
+    aligned = align_panel(frames)
+    panel = compute_panel(aligned['High'], aligned['Low'], aligned['Close'])
+    return aligned['Close'], DEFAULT_RULES.codes(panel)
+
+def check_equivalence():
+    """Falha se a carteira de um ativo diferir de Strategy ou a atribuição não fechar."""
+    for seed in range(5):
+        df = random_signals(3_000, seed)
+        strategy = Strategy(df, 10000.0)
+        expected = strategy.run_backtest()
+        portfolio = Portfolio(df[['Close']], df[['signal_color']], 10000.0)
+        trades = portfolio.run_backtest()
+        
+        pd.testing.assert_frame_equal(trades.drop(columns='symbol'), expected, obj=f'seed {seed}')
+        assert np.array_equal(portfolio.holdings['Close'].to_numpy(), strategy.positions['position'].to_numpy())
+        assert np.array_equal(portfolio.equity.to_numpy(), strategy.positions['capital'].to_numpy())
+        assert portfolio.get_metrics(trades) == strategy.get_metrics(expected)
+    
+    close, signals = basket(10, 2_000)
+    for sizing in ('equal', 'risk'):
+        portfolio = Portfolio(close, signals, 10000.0, sizing=sizing)
+        trades = portfolio.run_backtest()
+        total_return = portfolio.get_metrics(trades)['total_return']
+        assert np.isclose(portfolio.get_attribution()['contribution'].sum(), total_return), sizing
+        assert (portfolio.equity > 0).all(), sizing
+
+def run(n_symbols, n_bars):
+    check_equivalence()
+    print("Equivalência com Strategy e fechamento da atribuição: OK\n")
+    
+    close, signals = basket(n_symbols, n_bars)
+    for sizing in ('equal', 'risk'):
+        portfolio = Portfolio(close, signals, 100_000.0, sizing=sizing)
+        t0 = time.perf_counter()
+        trades = portfolio.run_backtest()
+        elapsed = time.perf_counter() - t0
+        metrics = portfolio.get_metrics(trades)
+        print(f"{sizing:>6}: {n_symbols} símbolos x {n_bars:,} barras em {elapsed:.3f} s, "
+              f"{metrics['total_trades']} trades, retorno {metrics['total_return']:.1f}%")
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*(args + [N_SYMBOLS, N_BARS][len(args):]))
@@ -0,0 +1,62 @@
+"""
+Paridade e tempo do registro de indicadores contra o motor conjunto.
+
+As colunas do registro são comparadas bit a bit com compute_indicators
+(backend nativo); em seguida mede o cálculo apenas das colunas usadas pelo
+aplicativo contra o cálculo de todos os indicadores.
+
+Uso: python -m benchmarks.bench_registry [n_barras]
+"""
+import sys
+import time
+import numpy as np
+from utils.indicators.engine import compute_indicators, INDICATOR_COLUMNS
+from utils.indicators.registry import compute_columns
+from utils.indicator_cache import get_indicator_cache, set_indicator_cache
+from utils.replay_data import generate_bars
+
+N_BARS = 1_000_000
+APP_COLUMNS = ['STOCH_K', 'STOCH_D', 'STOCH_K_PREV', 'RSI', 'RSI_PREV',
+               'MACD', 'MACD_SIGNAL', 'MACD_PREV']
+
+def check_parity(df):
+    """Falha se alguma coluna do registro diferir do motor conjunto."""
+    columns = [col for cols in INDICATOR_COLUMNS.values() for col in cols]
+    params = {'rsi': {'length': 14}, 'macd': {'fast': 26, 'slow': 12, 'signal': 9}}
+    expected = compute_indicators(df, params=params, backend='native')
+    result = compute_columns(df, columns + ['SMA_20', 'EMA_20', 'OBV', 'MFI'], params)
+    for col in columns:
+        if not np.array_equal(result[col].to_numpy(), expected[col].to_numpy(), equal_nan=True):
+            raise AssertionError(f"{col} difere de compute_indicators")
+
+def timed(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def run(n):
+    previous = get_indicator_cache()
+    set_indicator_cache(None)
+    try:
+        for seed, gaps in ((1, False), (3, True)):
+            df = generate_bars(5_000, seed=seed)
+            if gaps:
+                df.iloc[2_500:2_505, :4] = np.nan
+            check_parity(df)
+        print("Paridade com compute_indicators: OK")
+        
+        df = generate_bars(n, freq='min')
+        t_all = timed(lambda: compute_indicators(df))
+        t_subset = timed(lambda: compute_columns(df, APP_COLUMNS))
+    finally:
+        set_indicator_cache(previous)
+    
+    print(f"{n:,} barras")
+    print(f"  todos os indicadores:   {t_all:.3f} s")
+    print(f"  colunas do aplicativo:  {t_subset:.3f} s ({t_all / t_subset:.1f}x)")
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else N_BARS)
@@ -0,0 +1,92 @@
+"""
+Equivalência e tempo das regras compiladas de utils.rules.
+
+DEFAULT_RULES (e compute_signal_colors e count_conditions, que o usam) é
+comparado com get_signal_color por linha e com a versão NumPy escrita à mão
+que compute_signal_colors usava antes; uma regra "2 de 3 condições" com a
+contagem escrita à mão; e a avaliação sobre um painel de símbolos com a
+avaliação símbolo a símbolo.
+
+Uso: python -m benchmarks.bench_rules [n_barras ...]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from utils.indicators.engine import compute_indicators
+from utils.indicators.panel import align_panel, compute_panel
+from utils.rules import Rule, SignalRules, DEFAULT_RULES, SIGNAL_CONDITIONS
+from utils.signals import (GREEN, RED, BLACK, SIGNAL_COLUMNS, compute_signal_colors, count_conditions,
+                           get_signal_color, signal_codes, signals_from_codes)
+from utils.replay_data import generate_bars
+from benchmarks import signal_cases
+
+SIZES = [10_000, 100_000]
+N_SYMBOLS = 50
+
+TWO_OF_THREE = Rule(f"count({', '.join(SIGNAL_CONDITIONS)}) >= 2")
+CODES_BY_CONDITIONS = np.array([RED, BLACK, BLACK, GREEN], dtype=np.int8)
+
+def hand_written_counts(df):
+    """Contagem de condições escrita à mão em NumPy (versão anterior de count_conditions)."""
+    stoch_k, stoch_k_prev, rsi, rsi_prev, macd, macd_signal, macd_prev = (
+        df[col].to_numpy() for col in SIGNAL_COLUMNS
+    )
+    stoch_condition = (stoch_k > 50) & (stoch_k > stoch_k_prev)
+    rsi_condition = (rsi > 50) & (rsi > rsi_prev)
+    macd_condition = (macd > macd_signal) & (macd > macd_prev)
+    return stoch_condition.astype(np.int8) + rsi_condition + macd_condition
+
+def hand_written_colors(df):
+    """Versão anterior de compute_signal_colors."""
+    return signals_from_codes(CODES_BY_CONDITIONS[hand_written_counts(df)], df.index)
+
+def check_equivalence():
+    """Falha se as regras compiladas diferirem das versões escritas à mão."""
+    cases = signal_cases()
+    for case, df in cases.items():
+        expected = hand_written_colors(df)
+        pd.testing.assert_series_equal(DEFAULT_RULES.classify(df), expected, obj=case)
+        pd.testing.assert_series_equal(compute_signal_colors(df), expected, obj=case)
+        pd.testing.assert_series_equal(expected.astype(object), df.apply(get_signal_color, axis=1), obj=case)
+        counts = hand_written_counts(df)
+        assert np.array_equal(count_conditions(*(df[col].to_numpy() for col in SIGNAL_COLUMNS)), counts), case
+        assert np.array_equal(TWO_OF_THREE.evaluate(df), counts >= 2), case
+    
+    frames = {f'S{j}': generate_bars(2_000, seed=10 + j) for j in range(5)}
+    aligned = align_panel(frames)
+    panel = compute_panel(aligned['High'], aligned['Low'], aligned['Close'])
+    codes = DEFAULT_RULES.codes(panel)
+    for j, (symbol, frame) in enumerate(frames.items()):
+        expected = signal_codes(hand_written_colors(compute_indicators(frame)))
+        assert np.array_equal(codes[:, j], expected), symbol
+
+def run(sizes):
+    check_equivalence()
+    print("Equivalência com get_signal_color e a versão escrita à mão: OK\n")
+    
+    rules = SignalRules(green=TWO_OF_THREE, red=f"count({', '.join(SIGNAL_CONDITIONS)}) == 0")
+    print(f"{'barras':>9} {'padrão (s)':>11} {'2 de 3 (s)':>11} {'à mão (s)':>15}")
+    for n in sizes:
+        df = compute_indicators(generate_bars(n, freq='min'))
+        t0 = time.perf_counter()
+        DEFAULT_RULES.classify(df)
+        t_default = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        rules.classify(df)
+        t_custom = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        hand_written_colors(df)
+        t_vector = time.perf_counter() - t0
+        print(f"{n:>9,} {t_default:>11.4f} {t_custom:>11.4f} {t_vector:>15.4f}")
+    
+    frames = {f'S{j}': generate_bars(sizes[-1] // 10, freq='min', seed=j) for j in range(N_SYMBOLS)}
+    aligned = align_panel(frames)
+    panel = compute_panel(aligned['High'], aligned['Low'], aligned['Close'])
+    t0 = time.perf_counter()
+    rules.codes(panel)
+    t_panel = time.perf_counter() - t0
+    print(f"\nPainel {N_SYMBOLS} símbolos x {sizes[-1] // 10:,} barras: {t_panel:.4f} s")
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or SIZES)
@@ -0,0 +1,92 @@
+"""
+Equivalência e tempo de SignalGenerator.generate_signals contra o laço por barra.
+
+O laço anterior de MLPredictor.get_trading_signals (oito leituras .iloc e
+uma chamada de generate_signal por barra, com as condições escritas à mão)
+é comparado com o caminho em arrays, que avalia SignalGenerator.SCORE_RULES,
+com probabilidades aleatórias e indicadores com NaN, assim como
+generate_signal, cujos check_* também avaliam SCORE_RULES.
+
+Uso: python -m benchmarks.bench_signal_generator [n_barras]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from utils.indicators.engine import compute_indicators
+from utils.ml.signal_generator import SignalGenerator
+from utils.signals import BLACK, signals_from_codes
+from utils.replay_data import generate_bars
+
+N_BARS = 100_000
+
+def reference_signal(generator, indicators, ml_probability):
+    """generate_signal com as condições escritas à mão (antes de SCORE_RULES)."""
+    score = int(indicators['rsi'] > 40 and indicators['rsi'] > indicators['rsi_prev'])
+    score += int(indicators['macd'] > indicators['macd_signal'] or indicators['macd'] > indicators['macd_prev'])
+    score += int(indicators['stoch_k'] > indicators['stoch_d'] or indicators['stoch_k'] > indicators['stoch_k_prev'])
+    
+    if ml_probability > generator.ml_threshold and score >= generator.score_threshold:
+        return 'green'
+    elif ml_probability < (1 - generator.ml_threshold) and score <= 1:
+        return 'red'
+    return 'black'
+
+def per_bar(generator, df, probabilities, signal=reference_signal):
+    """Laço anterior de get_trading_signals."""
+    signals = pd.Series(index=df.index, data='black')
+    for i in range(len(df)):
+        if i >= len(probabilities):
+            continue
+        indicators = {
+            'rsi': df['RSI'].iloc[i],
+            'rsi_prev': df['RSI_PREV'].iloc[i],
+            'macd': df['MACD'].iloc[i],
+            'macd_signal': df['MACD_SIGNAL'].iloc[i],
+            'macd_prev': df['MACD_PREV'].iloc[i],
+            'stoch_k': df['STOCH_K'].iloc[i],
+            'stoch_d': df['STOCH_D'].iloc[i],
+            'stoch_k_prev': df['STOCH_K_PREV'].iloc[i]
+        }
+        signals.iloc[i] = signal(generator, indicators, probabilities[i])
+    return signals
+
+def batched(generator, df, probabilities):
+    """Caminho em arrays usado por get_trading_signals."""
+    codes = np.full(len(df), BLACK, dtype=np.int8)
+    n = min(len(df), len(probabilities))
+    indicators = {
+        key: df[col].to_numpy()[:n]
+        for key, col in zip(SignalGenerator.INDICATOR_KEYS, SignalGenerator.REQUIRED_COLUMNS)
+    }
+    codes[:n] = generator.generate_signals(indicators, probabilities[:n])
+    return signals_from_codes(codes, df.index)
+
+def run(n):
+    generator = SignalGenerator()
+    rng = np.random.default_rng(0)
+    
+    df = generate_bars(5_000, seed=3)
+    df.iloc[2_500:2_505, :4] = np.nan
+    df = compute_indicators(df)
+    for probabilities in (rng.random(len(df)), rng.random(len(df) - 100)):
+        expected = per_bar(generator, df, probabilities)
+        pd.testing.assert_series_equal(batched(generator, df, probabilities).astype(object), expected)
+        pd.testing.assert_series_equal(per_bar(generator, df, probabilities, SignalGenerator.generate_signal),
+                                       expected)
+    print("Equivalência com generate_signal e as condições escritas à mão: OK\n")
+    
+    df = compute_indicators(generate_bars(n, freq='min'))
+    probabilities = rng.random(n)
+    t0 = time.perf_counter()
+    per_bar(generator, df, probabilities)
+    t_loop = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    batched(generator, df, probabilities)
+    t_batch = time.perf_counter() - t0
+    print(f"{n:,} barras")
+    print(f"  por barra: {t_loop:.3f} s")
+    print(f"  em arrays: {t_batch * 1000:.1f} ms ({t_loop / t_batch:.0f}x)")
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else N_BARS)
@@ -0,0 +1,43 @@
+"""
+Equivalência e tempo de compute_signal_colors contra df.apply(get_signal_color).
+
+A versão vetorizada é comparada com a versão por linha em indicadores
+calculados sobre as séries de benchmarks.signal_cases (normal, com NaN, sem
+amplitude e float32).
+
+Uso: python -m benchmarks.bench_signals [n_barras ...]
+"""
+import sys
+import time
+import pandas as pd
+from utils.indicators.engine import compute_indicators
+from utils.signals import get_signal_color, compute_signal_colors
+from utils.replay_data import generate_bars
+from benchmarks import signal_cases
+
+SIZES = [10_000, 100_000]
+
+def check_equivalence():
+    """Falha se a versão vetorizada diferir da versão por linha."""
+    cases = signal_cases()
+    for case, df in cases.items():
+        expected = df.apply(get_signal_color, axis=1)
+        pd.testing.assert_series_equal(compute_signal_colors(df).astype(object), expected, obj=case)
+
+def run(sizes):
+    check_equivalence()
+    print("Equivalência com get_signal_color: OK\n")
+    
+    print(f"{'barras':>9} {'por linha (s)':>14} {'vetorizado (s)':>15} {'speedup':>9}")
+    for n in sizes:
+        df = compute_indicators(generate_bars(n, freq='min'))
+        t0 = time.perf_counter()
+        df.apply(get_signal_color, axis=1)
+        t_apply = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        compute_signal_colors(df)
+        t_vector = time.perf_counter() - t0
+        print(f"{n:>9,} {t_apply:>14.3f} {t_vector:>15.4f} {t_apply / t_vector:>8.0f}x")
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or SIZES)
@@ -0,0 +1,72 @@
+"""
+Paridade e custo por barra dos indicadores incrementais.
+
+Os valores após cada barra são comparados com o cálculo em lote
+(compute_block, backend nativo): bit a bit nas séries normal e com NaN, e
+com tolerância na série com barras sem amplitude (regra do épsilon). Em
+seguida mede o custo de incorporar uma barra contra o recálculo completo.
+
+Uso: python -m benchmarks.bench_streaming [n_barras]
+"""
+import sys
+import time
+import numpy as np
+from utils.indicators.engine import compute_block
+from utils.indicators.streaming import StreamingIndicators
+from utils.replay_data import generate_bars
+from benchmarks import parity_cases
+
+N_BARS = 5_000
+
+def stream_block(df):
+    """Valores do fluxo após cada barra, no mesmo formato de compute_block."""
+    stream = StreamingIndicators()
+    rows = [list(stream.update(bar).values()) for bar in df.to_records()]
+    return np.array(rows)
+
+def check_parity(cases):
+    """Falha se o fluxo divergir do cálculo em lote."""
+    for case, df in cases.items():
+        # Barras sem amplitude seguem a regra do épsilon: comparadas com tolerância
+        exact = case != 'sem amplitude'
+        block, columns = compute_block(df['High'], df['Low'], df['Close'], backend='native')
+        streamed = stream_block(df)
+        for j, name in enumerate(columns):
+            if exact:
+                equal = np.array_equal(streamed[:, j], block[:, j], equal_nan=True)
+            else:
+                equal = np.allclose(streamed[:, j], block[:, j], rtol=1e-12, atol=1e-12,
+                                    equal_nan=True)
+            if not equal:
+                diff = np.nanmax(np.abs(streamed[:, j] - block[:, j]))
+                raise AssertionError(f"{name} ({case}) difere do cálculo em lote: {diff:.3e}")
+
+def timings(n):
+    """Custo de uma nova barra: atualização incremental contra recálculo."""
+    df = generate_bars(n + 1, freq='min')
+    history, new_bar = df.iloc[:n], df.to_records()[-1]
+    
+    stream = StreamingIndicators()
+    stream.warm_up(history.to_records())
+    repeats = 1000
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        stream.update(new_bar)
+    t_stream = (time.perf_counter() - t0) / repeats
+    
+    compute_block(df['High'], df['Low'], df['Close'], backend='native')
+    t0 = time.perf_counter()
+    compute_block(df['High'], df['Low'], df['Close'], backend='native')
+    t_batch = time.perf_counter() - t0
+    
+    print(f"Histórico de {n} barras")
+    print(f"  incremental: {t_stream * 1e6:10.1f} µs/barra")
+    print(f"  recálculo:   {t_batch * 1e6:10.1f} µs/barra ({t_batch / t_stream:.1f}x)")
+
+def run(n):
+    check_parity(parity_cases(min(n, 5_000)))
+    print("Paridade com o cálculo em lote: OK\n")
+    timings(n)
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else N_BARS)
@@ -0,0 +1,86 @@
+"""
+Paridade e tempo do cálculo de indicadores por grid de parâmetros.
+
+Cada coluna dos blocos de utils.indicators.sweep é comparada bit a bit com
+o kernel chamado parâmetro a parâmetro, e optimize_parameters é comparado
+com o laço anterior (calculate_* e df.apply por combinação).
+
+Uso: python -m benchmarks.bench_sweep [n_barras]
+"""
+import sys
+import time
+import itertools
+import numpy as np
+import pandas as pd
+from utils.indicators import kernels, calculate_stochastic, calculate_rsi, calculate_macd
+from utils.indicators.sweep import rsi_sweep, macd_sweep, stochastic_sweep
+from utils.analysis.optimization import optimize_parameters, evaluate_parameters, get_signal_color
+from utils.replay_data import generate_bars
+
+N_BARS = 2_000
+
+PARAM_RANGES = {
+    'stoch_k': [9, 14],
+    'stoch_d': [3, 5],
+    'rsi_length': [7, 14],
+    'macd_fast': [8, 12],
+    'macd_slow': [21, 26],
+    'macd_signal': [9]
+}
+
+def per_combination(df, param_ranges):
+    """Laço anterior: indicadores recalculados sobre uma cópia a cada combinação."""
+    results = []
+    for params in itertools.product(*(param_ranges[key] for key in PARAM_RANGES)):
+        stoch_k, stoch_d, rsi_length, macd_fast, macd_slow, macd_signal = params
+        df_test = calculate_stochastic(df.copy(), k=stoch_k, d=stoch_d)
+        df_test = calculate_rsi(df_test, length=rsi_length)
+        df_test = calculate_macd(df_test, fast=macd_fast, slow=macd_slow, signal=macd_signal)
+        df_test['signal_color'] = df_test.apply(get_signal_color, axis=1)
+        results.append(dict(zip(PARAM_RANGES, params), **evaluate_parameters(df_test)))
+    return pd.DataFrame(results)
+
+def check_parity(df):
+    """Falha se alguma coluna dos blocos diferir do kernel individual."""
+    h, l, c = (df[col].to_numpy() for col in ('High', 'Low', 'Close'))
+    
+    lengths = list(range(5, 31))
+    block = rsi_sweep(c, lengths)
+    for j, length in enumerate(lengths):
+        assert np.array_equal(block[:, j], kernels.rsi(c, length), equal_nan=True), f"RSI {length}"
+    
+    triples = [t for t in itertools.product([8, 12, 26], [12, 26], [5, 9]) if t[0] != t[1]]
+    blocks = macd_sweep(c, triples)
+    for j, triple in enumerate(triples):
+        for block, expected in zip(blocks, kernels.macd(c, *triple)):
+            assert np.array_equal(block[:, j], expected, equal_nan=True), f"MACD {triple}"
+    
+    triples = list(itertools.product([5, 9, 14], [3, 5], [1, 3]))
+    blocks = stochastic_sweep(h, l, c, triples)
+    for j, triple in enumerate(triples):
+        for block, expected in zip(blocks, kernels.stochastic(h, l, c, *triple)):
+            assert np.array_equal(block[:, j], expected, equal_nan=True), f"Stochastic {triple}"
+
+def run(n):
+    df = generate_bars(n, seed=1)
+    df.iloc[n // 2:n // 2 + 5, :4] = np.nan
+    check_parity(df)
+    print("Paridade com os kernels individuais: OK")
+    
+    df = generate_bars(n, seed=2)
+    optimize_parameters(df.iloc[:100], PARAM_RANGES)
+    t0 = time.perf_counter()
+    expected = per_combination(df, PARAM_RANGES)
+    t_loop = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    result = optimize_parameters(df, PARAM_RANGES)
+    t_sweep = time.perf_counter() - t0
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    
+    combinations = len(result)
+    print(f"optimize_parameters ({combinations} combinações, {n:,} barras)")
+    print(f"  por combinação: {t_loop:.3f} s")
+    print(f"  grid em bloco:  {t_sweep:.3f} s ({t_loop / t_sweep:.1f}x)")
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else N_BARS)
@@ -1,28 +1,43 @@
 """
 Módulo para integração com a API Alpha Vantage.
 """
+import asyncio
+import time
+import aiohttp
 import requests
 import pandas as pd
-import time
-from typing import Optional, Dict
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from .rate_limit import shared_bucket
+
+BASE_URL = "https://www.alphavantage.co/query"
 
 class AlphaVantageClient:
-    def __init__(self, api_key: str):
-        """Inicializa o cliente Alpha Vantage."""
+    def __init__(self, api_key: str, base_url: str = BASE_URL, request_limit: int = 5,
+                 max_retries: int = 3, backoff: float = 15.0):
+        """
+        Inicializa o cliente Alpha Vantage.
+        
+        Args:
+            api_key: Chave da API
+            base_url: URL do endpoint (permite apontar para um servidor local)
+            request_limit: Limite de requisições por minuto
+            max_retries: Novas tentativas quando a API responde com "Note"
+            backoff: Espera inicial em segundos, dobrada a cada nova tentativa
+        """
         self.api_key = api_key
-        self.base_url = "https://www.alphavantage.co/query"
-        self.request_limit = 5  # Limite de requisições por minuto
-        self.last_request = datetime.now()
+        self.base_url = base_url
+        self.request_limit = request_limit
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.throttled = 0  # Respostas "Note" recebidas
+        # Limite compartilhado por todos os clientes da mesma chave
+        self.bucket = shared_bucket(api_key, request_limit / 60, request_limit)
+        # Sessão reaproveita conexões keep-alive entre requisições
+        self.session = requests.Session()
     
     def _rate_limit(self):
         """Implementa rate limiting para respeitar limites da API."""
-        now = datetime.now()
-        if (now - self.last_request).seconds < (60 / self.request_limit):
-            wait_time = (60 / self.request_limit) - (now - self.last_request).seconds
-            if wait_time > 0:
-                time.sleep(wait_time)
-        self.last_request = now
+        self.bucket.acquire()
     
     def get_daily_data(self, symbol: str) -> pd.DataFrame:
         """
@@ -30,62 +45,43 @@ class AlphaVantageClient:
         
         Args:
             symbol: Símbolo do ativo (ex: BBDC4.SA -> BBDC4.SAO)
-            
+        
         Returns:
             DataFrame com os dados históricos diários
         """
-        self._rate_limit()
-        
         # Converter símbolo para formato Alpha Vantage
         symbol = self._convert_symbol(symbol)
         
-        params = {
-            'function': 'TIME_SERIES_DAILY',  # Usando dados diários
-            'symbol': symbol,
-            'apikey': self.api_key,
-            'outputsize': 'full',
-            'datatype': 'json'
-        }
-        
-        data = self._make_request(params)
-        if data and 'Time Series (Daily)' in data:
-            time_series = data['Time Series (Daily)']
-            df = pd.DataFrame.from_dict(time_series, orient='index')
-            
-            # Renomear colunas para manter compatibilidade
-            df.columns = [col.split('. ')[1].capitalize() for col in df.columns]
-            df.index = pd.to_datetime(df.index)
-            df = df.astype(float)
-            
-            # Reordenar colunas para manter consistência com yfinance
-            df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
-            return df.sort_index()
-        return pd.DataFrame()
+        data = self._make_request(_daily_params(symbol, self.api_key))
+        return _parse_daily(data)
     
     def _convert_symbol(self, symbol: str) -> str:
         """Converte símbolo do formato B3 para Alpha Vantage."""
-        if '.SA' in symbol:
-            return symbol.replace('.SA', '.SAO')
-        return symbol
+        return convert_symbol(symbol)
     
     def _make_request(self, params: Dict[str, str]) -> Optional[Dict]:
         """
-        Realiza requisição à API com tratamento de erros.
+        Realiza requisição à API com nova tentativa em caso de limite atingido.
         
         Args:
             params: Parâmetros da requisição
         """
         try:
-            response = requests.get(self.base_url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'Error Message' in data:
-                raise ValueError(data['Error Message'])
-            if 'Note' in data:  # Limite de API atingido
-                raise ValueError("Limite de requisições da API atingido")
+            for delay in _retry_delays(self.max_retries, self.backoff):
+                self._rate_limit()
+                response = self.session.get(self.base_url, params=params, timeout=10)
+                response.raise_for_status()
+                data = response.json()
+                
+                if not _is_throttled(data):
+                    return data
                 
-            return data
+                # Limite de API atingido: aguardar com backoff exponencial
+                self.throttled += 1
+                if delay is not None:
+                    time.sleep(delay)
+            
+            raise ValueError("Limite de requisições da API atingido")
         except requests.exceptions.RequestException as e:
             print(f"Erro na requisição à API: {str(e)}")
             return None
@@ -94,4 +90,171 @@ class AlphaVantageClient:
             return None
         except Exception as e:
             print(f"Erro inesperado: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+class AsyncAlphaVantageClient:
+    """Cliente assíncrono com pool de conexões e limite de taxa compartilhado."""
+    
+    def __init__(self, api_key: str, base_url: str = BASE_URL, request_limit: int = 5,
+                 burst: Optional[int] = None, max_connections: int = 10,
+                 max_retries: int = 3, backoff: float = 15.0, timeout: float = 10.0):
+        """
+        Inicializa o cliente assíncrono.
+        
+        Args:
+            api_key: Chave da API
+            base_url: URL do endpoint (permite apontar para um servidor local)
+            request_limit: Limite de requisições por minuto
+            burst: Rajada máxima de requisições (padrão: request_limit)
+            max_connections: Tamanho do pool de conexões keep-alive
+            max_retries: Novas tentativas quando a API responde com "Note"
+            backoff: Espera inicial em segundos, dobrada a cada nova tentativa
+            timeout: Tempo máximo de cada requisição em segundos
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.request_limit = request_limit
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.bucket = shared_bucket(api_key, request_limit / 60, burst or request_limit)
+        self.throttled = 0  # Respostas "Note" recebidas
+        self._session = None
+    
+    async def __aenter__(self):
+        self._get_session()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Cria a sessão sob demanda, dentro do loop de eventos atual."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+    
+    async def close(self):
+        """Fecha a sessão e as conexões do pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+    
+    async def get_daily_data(self, symbol: str) -> pd.DataFrame:
+        """
+        Obtém dados diários do ativo.
+        
+        Args:
+            symbol: Símbolo do ativo (ex: BBDC4.SA -> BBDC4.SAO)
+        
+        Returns:
+            DataFrame com os dados históricos diários
+        """
+        data = await self._make_request(_daily_params(convert_symbol(symbol), self.api_key))
+        return _parse_daily(data)
+    
+    async def get_many_daily(self, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Obtém dados diários de vários ativos concorrentemente.
+        
+        A concorrência é limitada apenas pela cota e pelo pool de conexões.
+        
+        Args:
+            symbols: Lista de símbolos
+        
+        Returns:
+            Dicionário símbolo -> DataFrame (vazio em caso de falha)
+        """
+        results = await asyncio.gather(*(self.get_daily_data(s) for s in symbols))
+        return dict(zip(symbols, results))
+    
+    async def _make_request(self, params: Dict[str, str]) -> Optional[Dict]:
+        """
+        Realiza requisição à API com nova tentativa em caso de limite atingido.
+        
+        Args:
+            params: Parâmetros da requisição
+        """
+        session = self._get_session()
+        try:
+            for delay in _retry_delays(self.max_retries, self.backoff):
+                await self.bucket.acquire_async()
+                async with session.get(self.base_url, params=params) as response:
+                    response.raise_for_status()
+                    data = await response.json(content_type=None)
+                
+                if not _is_throttled(data):
+                    return data
+                
+                # Limite de API atingido: aguardar com backoff exponencial
+                self.throttled += 1
+                if delay is not None:
+                    await asyncio.sleep(delay)
+            
+            raise ValueError("Limite de requisições da API atingido")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Erro na requisição à API: {str(e)}")
+            return None
+        except ValueError as e:
+            print(f"Erro nos dados da API: {str(e)}")
+            return None
+        except Exception as e:
+            print(f"Erro inesperado: {str(e)}")
+            return None
+
+def convert_symbol(symbol: str) -> str:
+    """Converte símbolo do formato B3 para Alpha Vantage."""
+    if '.SA' in symbol:
+        return symbol.replace('.SA', '.SAO')
+    return symbol
+
+def _retry_delays(max_retries: int, backoff: float) -> List[Optional[float]]:
+    """
+    Esperas após cada tentativa, comuns aos clientes síncrono e assíncrono.
+    
+    Returns:
+        Lista com uma entrada por tentativa: backoff dobrado a cada nova
+        tentativa, e None após a última
+    """
+    return [backoff * 2 ** attempt for attempt in range(max_retries)] + [None]
+
+def _is_throttled(data: Dict) -> bool:
+    """
+    Valida a resposta da API.
+    
+    Returns:
+        True se a API respondeu com "Note" (limite de requisições atingido)
+    """
+    if 'Error Message' in data:
+        raise ValueError(data['Error Message'])
+    return 'Note' in data
+
+def _daily_params(symbol: str, api_key: str) -> Dict[str, str]:
+    """Parâmetros da série diária completa."""
+    return {
+        'function': 'TIME_SERIES_DAILY',  # Usando dados diários
+        'symbol': symbol,
+        'apikey': api_key,
+        'outputsize': 'full',
+        'datatype': 'json'
+    }
+
+def _parse_daily(data: Optional[Dict]) -> pd.DataFrame:
+    """Converte a resposta da série diária em DataFrame."""
+    if data and 'Time Series (Daily)' in data:
+        time_series = data['Time Series (Daily)']
+        df = pd.DataFrame.from_dict(time_series, orient='index')
+        
+        # Renomear colunas para manter compatibilidade
+        df.columns = [col.split('. ')[1].capitalize() for col in df.columns]
+        df.index = pd.to_datetime(df.index)
+        df = df.astype(float)
+        
+        # Reordenar colunas para manter consistência com yfinance
+        df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
+        return df.sort_index()
+    return pd.DataFrame()
@@ -1,14 +1,21 @@
 """
 Módulo para otimização de parâmetros da estratégia.
 """
+import numpy as np
 import pandas as pd
 import itertools
-from ..indicators import calculate_stochastic, calculate_rsi, calculate_macd
+from ..signals import GREEN, RED, signal_codes
+from ..rules import DEFAULT_RULES, CONDITION_RULES
+from ..indicators.sweep import stochastic_sweep, rsi_sweep, macd_sweep
 
 def optimize_parameters(df, param_ranges):
     """
     Otimiza parâmetros dos indicadores.
     
+    Cada indicador é calculado uma única vez para todos os valores de
+    parâmetro do grid (utils.indicators.sweep); as combinações apenas
+    cruzam as colunas já calculadas.
+    
     Args:
         df: DataFrame com dados históricos
         param_ranges: Dicionário com ranges de parâmetros para teste
@@ -25,20 +32,43 @@ def optimize_parameters(df, param_ranges):
         param_ranges['macd_signal']
     ))
     
+    # Condições de CONDITION_RULES sobre os blocos barras x parâmetros, uma
+    # coluna por conjunto de parâmetros
+    stoch_rule, rsi_rule, macd_rule = CONDITION_RULES
+    stoch_params = list(itertools.product(param_ranges['stoch_k'], param_ranges['stoch_d']))
+    stoch_k_block, _ = stochastic_sweep(df['High'], df['Low'], df['Close'],
+                                        [(k, d, 3) for k, d in stoch_params])
+    stoch_block = {'STOCH_K': stoch_k_block, 'STOCH_K_PREV': _previous(stoch_k_block)}
+    stoch_conditions = dict(zip(stoch_params, stoch_rule.evaluate(stoch_block).T))
+    
+    rsi_lengths = list(param_ranges['rsi_length'])
+    rsi_block = rsi_sweep(df['Close'], rsi_lengths)
+    rsi_conditions = dict(zip(rsi_lengths, rsi_rule.evaluate(
+        {'RSI': rsi_block, 'RSI_PREV': _previous(rsi_block)}).T))
+    
+    macd_params = list(itertools.product(
+        param_ranges['macd_fast'],
+        param_ranges['macd_slow'],
+        param_ranges['macd_signal']
+    ))
+    macd_block, signal_block, _ = macd_sweep(df['Close'], macd_params)
+    macd_conditions = dict(zip(macd_params, macd_rule.evaluate(
+        {'MACD': macd_block, 'MACD_SIGNAL': signal_block, 'MACD_PREV': _previous(macd_block)}).T))
+    
+    price_changes = df['Close'].pct_change().to_numpy()
+    
     for params in param_combinations:
         stoch_k, stoch_d, rsi_length, macd_fast, macd_slow, macd_signal = params
         
-        # Calcular indicadores com parâmetros atuais
-        df_test = df.copy()
-        df_test = calculate_stochastic(df_test, k=stoch_k, d=stoch_d)
-        df_test = calculate_rsi(df_test, length=rsi_length)
-        df_test = calculate_macd(df_test, fast=macd_fast, slow=macd_slow, signal=macd_signal)
-        
-        # Calcular sinais
-        df_test['signal_color'] = df_test.apply(get_signal_color, axis=1)
+        # Sinais de DEFAULT_RULES a partir das condições já calculadas
+        codes = DEFAULT_RULES.codes({}, known={
+            stoch_rule: stoch_conditions[(stoch_k, stoch_d)],
+            rsi_rule: rsi_conditions[rsi_length],
+            macd_rule: macd_conditions[(macd_fast, macd_slow, macd_signal)]
+        })
         
         # Avaliar resultado
-        metrics = evaluate_parameters(df_test)
+        metrics = _evaluate_codes(codes, price_changes)
         
         results.append({
             'stoch_k': stoch_k,
@@ -52,6 +82,38 @@ def optimize_parameters(df, param_ranges):
     
     return pd.DataFrame(results)
 
+def _previous(block):
+    """Valor da barra anterior (NaN na primeira barra), como as colunas *_PREV."""
+    previous = np.empty(block.shape)
+    previous[:1] = np.nan
+    previous[1:] = block[:-1]
+    return previous
+
+def _evaluate_codes(codes, price_changes):
+    """
+    Métricas de evaluate_parameters a partir dos códigos de sinal de cada barra.
+    """
+    green = codes == GREEN
+    red = codes == RED
+    
+    total_signals = len(codes)
+    green_signals = green.sum()
+    red_signals = red.sum()
+    
+    signal_consistency = (green_signals + red_signals) / total_signals
+    
+    correct_green = (green & (price_changes > 0)).sum()
+    correct_red = (red & (price_changes < 0)).sum()
+    
+    accuracy = (correct_green + correct_red) / (green_signals + red_signals) if (green_signals + red_signals) > 0 else 0
+    
+    return {
+        'signal_consistency': signal_consistency,
+        'accuracy': accuracy,
+        'green_signals': green_signals,
+        'red_signals': red_signals
+    }
+
 def evaluate_parameters(df):
     """
     Avalia o desempenho de um conjunto de parâmetros.
@@ -61,16 +123,19 @@ def evaluate_parameters(df):
     """
     # Contar sinais
     total_signals = len(df)
-    green_signals = (df['signal_color'] == 'green').sum()
-    red_signals = (df['signal_color'] == 'red').sum()
+    codes = signal_codes(df['signal_color'])
+    green = codes == GREEN
+    red = codes == RED
+    green_signals = green.sum()
+    red_signals = red.sum()
     
     # Calcular consistência dos sinais
     signal_consistency = (green_signals + red_signals) / total_signals
     
     # Calcular tendência dos sinais
-    price_changes = df['Close'].pct_change()
-    correct_green = ((df['signal_color'] == 'green') & (price_changes > 0)).sum()
-    correct_red = ((df['signal_color'] == 'red') & (price_changes < 0)).sum()
+    price_changes = df['Close'].pct_change().to_numpy()
+    correct_green = (green & (price_changes > 0)).sum()
+    correct_red = (red & (price_changes < 0)).sum()
     
     accuracy = (correct_green + correct_red) / (green_signals + red_signals) if (green_signals + red_signals) > 0 else 0
     
@@ -1,9 +1,235 @@
 """
 Módulo de backtesting com análise técnica.
 """
+import os
 import pandas as pd
 import pandas_ta as ta
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from .signals import GREEN, RED, signal_codes
+from .indicators.kernels import _jit
+
+# Regras da estratégia: stop de 2%, custo de 0,2% em cada ponta e posição
+# de 95% do capital (compartilhadas com utils.portfolio)
+STOP_LOSS = 0.98
+SELL_COST = 0.998
+BUY_COST = 1.002
+POSITION_FRACTION = 0.95
+
+# Tipos de operação do registro de trades
+BUY, SELL_SIGNAL, SELL_STOP = 0, 1, 2
+EXIT_REASONS = np.array([None, 'signal', 'stop_loss'], dtype=object)
+
+# Métricas de Strategy.get_metrics, na mesma ordem
+METRIC_COLUMNS = ['total_trades', 'profitable_trades', 'win_rate', 'total_return', 'annual_return', 'max_drawdown']
+
+# Colunas de ponto flutuante do registro de trades, na ordem do bloco do kernel
+TRADE_VALUES = ['price', 'cost', 'capital', 'revenue', 'profit', 'profit_pct']
+
+@_jit
+def _backtest_kernel(close, signals, capital, max_capital, position_out, equity_out,
+                     trade_bar, trade_kind, trade_shares, trade_values):
+    """
+    Máquina de estados do backtest sobre arrays.
+    
+    Mesmas regras do laço original: stop de 2%, custo de 0,2% em cada ponta
+    e posição de 95% do capital em ações inteiras. Grava a posição e o
+    patrimônio de cada barra a partir da segunda e o registro de trades.
+    
+    Returns:
+        Tupla (número de trades, capital final, capital máximo, barra com
+        preço inválido para entrada ou -1)
+    """
+    position = 0
+    entry_price = 0.0
+    n_trades = 0
+    
+    for i in range(1, len(close)):
+        current_price = close[i]
+        signal = signals[i]
+        
+        # Verificar saída
+        if position > 0:
+            # Stop loss (2%)
+            stop_loss = entry_price * STOP_LOSS
+            is_stop = current_price <= stop_loss
+            
+            if is_stop or signal == RED:
+                revenue = position * current_price * SELL_COST
+                cost = position * entry_price * BUY_COST
+                profit = revenue - cost
+                
+                capital += revenue
+                if capital > max_capital:
+                    max_capital = capital
+                
+                trade_bar[n_trades] = i
+                trade_kind[n_trades] = SELL_STOP if is_stop else SELL_SIGNAL
+                trade_shares[n_trades] = position
+                trade_values[n_trades, 0] = current_price
+                trade_values[n_trades, 1] = np.nan
+                trade_values[n_trades, 2] = capital
+                trade_values[n_trades, 3] = revenue
+                trade_values[n_trades, 4] = profit
+                trade_values[n_trades, 5] = (profit / cost) * 100
+                n_trades += 1
+                
+                position = 0
+                entry_price = 0.0
+        
+        # Verificar entrada
+        elif position == 0 and signal == GREEN:
+            # int() do laço original falha com preço nulo, NaN ou infinito
+            if current_price == 0.0:
+                return n_trades, capital, max_capital, i
+            shares = (capital * POSITION_FRACTION) / current_price
+            if not np.isfinite(shares):
+                return n_trades, capital, max_capital, i
+            position_size = int(shares)
+            
+            if position_size > 0:
+                cost = position_size * current_price * BUY_COST
+                if cost <= capital:
+                    position = position_size
+                    entry_price = current_price
+                    capital -= cost
+                    
+                    trade_bar[n_trades] = i
+                    trade_kind[n_trades] = BUY
+                    trade_shares[n_trades] = position_size
+                    trade_values[n_trades, 0] = current_price
+                    trade_values[n_trades, 1] = cost
+                    trade_values[n_trades, 2] = capital
+                    trade_values[n_trades, 3] = np.nan
+                    trade_values[n_trades, 4] = np.nan
+                    trade_values[n_trades, 5] = np.nan
+                    n_trades += 1
+        
+        # Atualizar posições
+        position_out[i] = position
+        equity_out[i] = capital + (position * current_price if position > 0 else 0.0)
+    
+    return n_trades, capital, max_capital, -1
+
+def backtest_arrays(close, signals, initial_capital=10000.0, max_capital=None):
+    """
+    Executa o backtest sobre arrays de fechamento e códigos de sinal.
+    
+    Args:
+        close: Fechamentos
+        signals: Códigos int8 de sinal (ex: signal_codes(df['signal_color']))
+        initial_capital: Capital inicial
+        max_capital: Capital máximo já registrado (padrão: initial_capital)
+    
+    Returns:
+        Tupla (posição por barra, patrimônio por barra, registro de trades
+        em colunas, capital final, capital máximo). O registro tem as colunas
+        bar, kind (BUY, SELL_SIGNAL ou SELL_STOP), shares e TRADE_VALUES.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    signals = np.ascontiguousarray(signals, dtype=np.int8)
+    initial_capital = float(initial_capital)
+    n = len(close)
+    
+    position = np.zeros(n, dtype=np.int64)
+    equity = np.full(n, initial_capital)
+    # Cada compra exige um sinal green e cada venda fecha uma compra
+    max_trades = 2 * int(np.count_nonzero(signals == GREEN))
+    trade_bar = np.empty(max_trades, dtype=np.int64)
+    trade_kind = np.empty(max_trades, dtype=np.int8)
+    trade_shares = np.empty(max_trades, dtype=np.int64)
+    trade_values = np.empty((max_trades, len(TRADE_VALUES)))
+    
+    n_trades, capital, max_capital, invalid_bar = _backtest_kernel(
+        close, signals, initial_capital,
+        initial_capital if max_capital is None else float(max_capital),
+        position, equity, trade_bar, trade_kind, trade_shares, trade_values
+    )
+    if invalid_bar >= 0:
+        raise ValueError(f"Preço inválido para entrada na barra {invalid_bar}: {close[invalid_bar]}")
+    
+    trades = {
+        'bar': trade_bar[:n_trades],
+        'kind': trade_kind[:n_trades],
+        'shares': trade_shares[:n_trades]
+    }
+    for k, col in enumerate(TRADE_VALUES):
+        trades[col] = trade_values[:n_trades, k]
+    return position, equity, trades, capital, max_capital
+
+def _metrics_from_arrays(equity, trades, initial_capital, years):
+    """Métricas de Strategy.get_metrics a partir da saída de backtest_arrays."""
+    if len(trades['bar']) == 0:
+        return [0, 0, 0.0, 0.0, 0.0, 0.0]
+    
+    sells = trades['kind'] != BUY
+    total_trades = int(np.count_nonzero(sells))
+    profitable_trades = int(np.count_nonzero(sells & (trades['profit'] > 0)))
+    
+    total_return = ((float(equity[-1]) - initial_capital) / initial_capital) * 100
+    annual_return = ((1 + total_return/100) ** (1/years) - 1) * 100 if years > 0 else total_return
+    
+    # Drawdown sobre o máximo acumulado, ignorando NaN como expanding().max()
+    rolling_max = np.fmax.accumulate(equity)
+    max_drawdown = abs(np.nanmin((equity - rolling_max) / rolling_max * 100))
+    
+    win_rate = (profitable_trades / total_trades * 100) if total_trades > 0 else 0
+    return [total_trades, profitable_trades, win_rate, total_return, annual_return, max_drawdown]
+
+def run_batch(close, signals_matrix, initial_capital=10000.0, max_workers=None):
+    """
+    Executa o backtest de várias séries de sinais sobre os mesmos preços.
+    
+    Cada coluna de signals_matrix é simulada pelo kernel de run_backtest,
+    sem criar uma Strategy nem copiar o DataFrame por variante. O kernel
+    libera o GIL, então as colunas são distribuídas entre threads.
+    
+    Args:
+        close: Série de fechamentos (o índice de datas define o retorno anualizado)
+        signals_matrix: Bloco barras x estratégias de códigos int8 de sinal, ou
+            DataFrame com uma coluna de sinais (códigos ou cores) por estratégia
+        initial_capital: Capital inicial de cada estratégia
+        max_workers: Threads de cálculo (padrão: número de CPUs)
+    
+    Returns:
+        DataFrame com uma linha por estratégia e as colunas de get_metrics
+    """
+    if isinstance(signals_matrix, pd.DataFrame):
+        names = signals_matrix.columns
+        codes = np.empty(signals_matrix.shape, dtype=np.int8, order='F')
+        for j in range(len(names)):
+            signals = signals_matrix.iloc[:, j]
+            is_codes = pd.api.types.is_integer_dtype(signals)
+            codes[:, j] = signals.to_numpy() if is_codes else signal_codes(signals)
+    else:
+        codes = np.asarray(signals_matrix)
+        names = None
+    if codes.ndim != 2 or codes.shape[0] != len(close):
+        raise ValueError("signals_matrix deve ter uma linha por barra de close")
+    
+    # Ordem Fortran: a série de sinais de cada estratégia é contígua
+    codes = np.asfortranarray(codes, dtype=np.int8)
+    prices = np.ascontiguousarray(close, dtype=np.float64)
+    initial_capital = float(initial_capital)
+    
+    years = 0.0
+    index = getattr(close, 'index', None)
+    if isinstance(index, pd.DatetimeIndex) and len(index):
+        years = (index[-1] - index[0]).days / 365.25
+    
+    def run(j):
+        _, equity, trades, _, _ = backtest_arrays(prices, codes[:, j], initial_capital)
+        return _metrics_from_arrays(equity, trades, initial_capital, years)
+    
+    n_strategies = codes.shape[1]
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or n_strategies <= 1:
+        rows = [run(j) for j in range(n_strategies)]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, n_strategies)) as pool:
+            rows = list(pool.map(run, range(n_strategies)))
+    
+    return pd.DataFrame(rows, index=names, columns=METRIC_COLUMNS)
 
 class Strategy:
     def __init__(self, df, initial_capital=10000.0):
@@ -14,84 +240,36 @@ class Strategy:
         self.positions['capital'] = initial_capital
         self.current_capital = initial_capital
         self.max_capital = initial_capital
-        
+    
     def run_backtest(self):
         """Executa backtest da estratégia."""
-        position = 0
-        entry_price = 0
-        trades = []
-        self.current_capital = self.initial_capital
+        position, equity, trades, capital, max_capital = backtest_arrays(
+            self.df['Close'].to_numpy(),
+            signal_codes(self.df['signal_color']),
+            self.initial_capital,
+            self.max_capital
+        )
+        self.current_capital = capital
+        self.max_capital = max_capital
+        self.positions = pd.DataFrame({'position': position, 'capital': equity}, index=self.df.index)
         
-        for i in range(1, len(self.df)):
-            current_price = float(self.df['Close'].iloc[i])
-            current_date = self.df.index[i]
-            signal = self.df['signal_color'].iloc[i]
-            
-            # Verificar saída
-            if position > 0:
-                # Stop loss (2%)
-                stop_loss = entry_price * 0.98
-                
-                if current_price <= stop_loss or signal == 'red':
-                    revenue = position * current_price * 0.998
-                    cost = position * entry_price * 1.002
-                    profit = revenue - cost
-                    profit_pct = (profit / cost) * 100
-                    
-                    self.current_capital += revenue
-                    self.max_capital = max(self.max_capital, self.current_capital)
-                    
-                    trades.append({
-                        'date': current_date,
-                        'type': 'sell',
-                        'price': current_price,
-                        'shares': position,
-                        'cost': None,
-                        'capital': self.current_capital,
-                        'revenue': revenue,
-                        'profit': profit,
-                        'profit_pct': profit_pct,
-                        'exit_reason': 'stop_loss' if current_price <= stop_loss else 'signal'
-                    })
-                    
-                    position = 0
-                    entry_price = 0
-            
-            # Verificar entrada
-            elif position == 0 and signal == 'green':
-                # Calcular posição baseada em 1% de risco por trade
-                risk_amount = self.current_capital * 0.01
-                position_size = int((self.current_capital * 0.95) / current_price)
-                
-                if position_size > 0:
-                    cost = position_size * current_price * 1.002
-                    if cost <= self.current_capital:
-                        position = position_size
-                        entry_price = current_price
-                        self.current_capital -= cost
-                        
-                        trades.append({
-                            'date': current_date,
-                            'type': 'buy',
-                            'price': current_price,
-                            'shares': position_size,
-                            'cost': cost,
-                            'capital': self.current_capital,
-                            'revenue': None,
-                            'profit': None,
-                            'profit_pct': None,
-                            'exit_reason': None
-                        })
-            
-            # Atualizar posições
-            self.positions.iloc[i] = {
-                'position': position,
-                'capital': self.current_capital + (position * current_price if position > 0 else 0)
-            }
+        if len(trades['bar']) == 0:
+            return pd.DataFrame()
         
-        trades_df = pd.DataFrame(trades)
-        if not trades_df.empty:
-            trades_df['date'] = pd.to_datetime(trades_df['date'])
+        kind = trades['kind']
+        trades_df = pd.DataFrame({
+            'date': self.df.index[trades['bar']],
+            'type': np.where(kind == BUY, 'buy', 'sell').astype(object),
+            'price': trades['price'],
+            'shares': trades['shares'],
+            'cost': trades['cost'],
+            'capital': trades['capital'],
+            'revenue': trades['revenue'],
+            'profit': trades['profit'],
+            'profit_pct': trades['profit_pct'],
+            'exit_reason': EXIT_REASONS[kind]
+        })
+        trades_df['date'] = pd.to_datetime(trades_df['date'])
         return trades_df
     
     def get_metrics(self, trades_df):
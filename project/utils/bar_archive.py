@@ -0,0 +1,175 @@
+"""
+Módulo de arquivo binário de barras com leitura por memória mapeada.
+"""
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+# Layout dos registros retornados por MetaTrader5.copy_rates_*
+RATES_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('tick_volume', '<u8'),
+    ('spread', '<i4'),
+    ('real_volume', '<u8')
+])
+
+DEFAULT_ARCHIVE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'archive'
+)
+
+class BarArchive:
+    """
+    Arquivo de registros MT5 em ordem de tempo, um arquivo por símbolo/intervalo.
+    
+    Barras novas são acrescentadas ao fim; histórico anterior à primeira
+    barra gravada é inserido no início com prepend. Os arrays estruturados
+    são gravados como estão, sem passar por pandas, e lidos via np.memmap:
+    janelas de tempo são visões sem cópia.
+    """
+    
+    def __init__(self, root_dir: str = DEFAULT_ARCHIVE_DIR):
+        """
+        Inicializa o arquivo.
+        
+        Args:
+            root_dir: Diretório dos arquivos binários
+        """
+        self.root_dir = root_dir
+    
+    def _path(self, symbol: str, interval: str) -> str:
+        """Retorna o caminho do arquivo do símbolo/intervalo."""
+        return os.path.join(self.root_dir, f'{symbol}_{interval}.bin')
+    
+    def open(self, symbol: str, interval: str) -> np.ndarray:
+        """Mapeia o arquivo completo em memória (somente leitura)."""
+        path = self._path(symbol, interval)
+        if not os.path.exists(path) or os.path.getsize(path) < RATES_DTYPE.itemsize:
+            return np.empty(0, dtype=RATES_DTYPE)
+        count = os.path.getsize(path) // RATES_DTYPE.itemsize
+        return np.memmap(path, dtype=RATES_DTYPE, mode='r', shape=(count,))
+    
+    def first_time(self, symbol: str, interval: str) -> Optional[int]:
+        """Retorna o timestamp (segundos) da primeira barra gravada."""
+        rates = self.open(symbol, interval)
+        if len(rates) == 0:
+            return None
+        return int(rates['time'][0])
+    
+    def last_time(self, symbol: str, interval: str) -> Optional[int]:
+        """Retorna o timestamp (segundos) da última barra gravada."""
+        rates = self.open(symbol, interval)
+        if len(rates) == 0:
+            return None
+        return int(rates['time'][-1])
+    
+    def append(self, symbol: str, interval: str, rates: np.ndarray) -> int:
+        """
+        Acrescenta registros ao fim do arquivo.
+        
+        Registros anteriores à última barra gravada são descartados, o que
+        torna seguro reenviar trechos sobrepostos; um registro com o mesmo
+        horário da última barra a substitui (barra ainda em formação).
+        
+        Args:
+            rates: Array estruturado no layout RATES_DTYPE
+        
+        Returns:
+            Quantidade de registros gravados
+        """
+        if rates is None or len(rates) == 0:
+            return 0
+        if rates.dtype != RATES_DTYPE:
+            rates = rates.astype(RATES_DTYPE)
+        
+        path = self._path(symbol, interval)
+        last = self.last_time(symbol, interval)
+        if last is not None:
+            same = np.flatnonzero(rates['time'] == last)
+            if len(same) > 0:
+                stored = np.memmap(path, dtype=RATES_DTYPE, mode='r+',
+                                   offset=os.path.getsize(path) - RATES_DTYPE.itemsize, shape=(1,))
+                stored[0] = rates[same[-1]]
+                stored.flush()
+                del stored
+            rates = rates[rates['time'] > last]
+        if len(rates) == 0:
+            return 0
+        
+        os.makedirs(self.root_dir, exist_ok=True)
+        with open(path, 'ab') as f:
+            rates.tofile(f)
+        return len(rates)
+    
+    def prepend(self, symbol: str, interval: str, rates: np.ndarray) -> int:
+        """
+        Acrescenta registros anteriores à primeira barra gravada.
+        
+        Registros a partir da primeira barra gravada são descartados. O
+        arquivo é reescrito (novo início seguido do conteúdo atual) em um
+        arquivo temporário que substitui o original, de modo que uma falha no
+        meio da gravação não o corrompe; mapeamentos abertos antes continuam
+        vendo o conteúdo anterior.
+        
+        Args:
+            rates: Array estruturado no layout RATES_DTYPE
+        
+        Returns:
+            Quantidade de registros gravados
+        """
+        if rates is None or len(rates) == 0:
+            return 0
+        if rates.dtype != RATES_DTYPE:
+            rates = rates.astype(RATES_DTYPE)
+        
+        first = self.first_time(symbol, interval)
+        if first is None:
+            return self.append(symbol, interval, rates)
+        rates = rates[rates['time'] < first]
+        if len(rates) == 0:
+            return 0
+        
+        path = self._path(symbol, interval)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            rates.tofile(f)
+            with open(path, 'rb') as current:
+                shutil.copyfileobj(current, f)
+        os.replace(tmp_path, path)
+        return len(rates)
+    
+    def window(self, symbol: str, interval: str, start: Optional[int] = None,
+               end: Optional[int] = None) -> np.ndarray:
+        """
+        Retorna a visão sem cópia das barras com start <= time < end.
+        
+        Args:
+            start: Timestamp inicial em segundos (opcional)
+            end: Timestamp final em segundos, exclusivo (opcional)
+        """
+        rates = self.open(symbol, interval)
+        times = rates['time']
+        lo = 0 if start is None else int(np.searchsorted(times, start, side='left'))
+        hi = len(rates) if end is None else int(np.searchsorted(times, end, side='left'))
+        return rates[lo:hi]
+
+def rates_to_frame(rates: np.ndarray) -> pd.DataFrame:
+    """Converte registros MT5 para o DataFrame usado no restante do projeto."""
+    df = pd.DataFrame(rates)
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    df.set_index('time', inplace=True)
+    
+    # Renomear colunas para manter compatibilidade
+    df.rename(columns={
+        'open': 'Open',
+        'high': 'High',
+        'low': 'Low',
+        'close': 'Close',
+        'tick_volume': 'Volume'
+    }, inplace=True)
+    return df
@@ -0,0 +1,131 @@
+"""
+Módulo de armazenamento local de barras OHLCV em formato colunar (Parquet).
+"""
+import json
+import os
+import threading
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import List, Optional, Tuple
+
+DEFAULT_STORE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'bars'
+)
+
+_METADATA_KEY = b'power_x.coverage'
+
+class BarStore:
+    """
+    Armazena barras em Parquet, uma partição por fonte/intervalo/símbolo.
+    
+    Cada partição guarda, nos metadados do arquivo, o intervalo de datas
+    [início, fim) já consultado na fonte, permitindo distinguir dias sem
+    pregão de períodos ainda não baixados.
+    """
+    
+    def __init__(self, root_dir: str = DEFAULT_STORE_DIR):
+        """
+        Inicializa o armazenamento.
+        
+        Args:
+            root_dir: Diretório raiz das partições
+        """
+        self.root_dir = root_dir
+    
+    def _path(self, source: str, symbol: str, interval: str) -> str:
+        """Retorna o caminho do arquivo da partição."""
+        return os.path.join(
+            self.root_dir,
+            f'source={source}',
+            f'interval={interval}',
+            f'symbol={symbol}',
+            'bars.parquet'
+        )
+    
+    def read(self, source: str, symbol: str,
+             interval: str) -> Tuple[pd.DataFrame, Optional[Tuple[pd.Timestamp, pd.Timestamp]]]:
+        """
+        Lê todas as barras de uma partição.
+        
+        Returns:
+            Tupla (DataFrame, cobertura) onde cobertura é (início, fim) ou None
+        """
+        path = self._path(source, symbol, interval)
+        if not os.path.exists(path):
+            return pd.DataFrame(), None
+        
+        table = pq.read_table(path)
+        metadata = table.schema.metadata or {}
+        coverage = None
+        if _METADATA_KEY in metadata:
+            raw = json.loads(metadata[_METADATA_KEY].decode())
+            coverage = (pd.Timestamp(raw['start']), pd.Timestamp(raw['end']))
+        
+        return table.to_pandas(), coverage
+    
+    def write(self, source: str, symbol: str, interval: str, df: pd.DataFrame,
+              coverage: Tuple[pd.Timestamp, pd.Timestamp]):
+        """
+        Grava a partição completa de forma atômica.
+        
+        Args:
+            df: Barras ordenadas pelo índice
+            coverage: Intervalo [início, fim) coberto pelas barras
+        """
+        path = self._path(source, symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_METADATA_KEY] = json.dumps({
+            'start': coverage[0].isoformat(),
+            'end': coverage[1].isoformat()
+        }).encode()
+        table = table.replace_schema_metadata(metadata)
+        
+        # Nome exclusivo por thread evita conflito entre gravações concorrentes
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+    
+    def append(self, source: str, symbol: str, interval: str, cached: pd.DataFrame,
+               new_bars: pd.DataFrame, coverage: Tuple[pd.Timestamp, pd.Timestamp]) -> pd.DataFrame:
+        """
+        Incorpora novas barras às existentes e grava a partição.
+        
+        Returns:
+            DataFrame combinado, sem duplicatas e ordenado
+        """
+        frames = [f for f in (cached, new_bars) if not f.empty]
+        if frames:
+            df = pd.concat(frames) if len(frames) > 1 else frames[0]
+            df = df[~df.index.duplicated(keep='last')].sort_index()
+        else:
+            df = cached
+        
+        self.write(source, symbol, interval, df, coverage)
+        return df
+    
+    @staticmethod
+    def missing_ranges(coverage: Optional[Tuple[pd.Timestamp, pd.Timestamp]],
+                       start: pd.Timestamp, end: pd.Timestamp) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Calcula os trechos [início, fim) que ainda precisam ser baixados.
+        
+        Apenas a cabeça e a cauda fora da cobertura são retornadas; quando a
+        janela não toca a cobertura, o trecho se estende até ela para que a
+        cobertura continue contígua.
+        """
+        if start >= end:
+            return []
+        if coverage is None:
+            return [(start, end)]
+        
+        covered_start, covered_end = coverage
+        ranges = []
+        if start < covered_start:
+            ranges.append((start, covered_start))
+        if end > covered_end:
+            ranges.append((covered_end, end))
+        return ranges
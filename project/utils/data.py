@@ -1,26 +1,52 @@
 """
 Módulo de gerenciamento de dados com suporte a múltiplas fontes.
 """
+import asyncio
 import yfinance as yf
 import pandas as pd
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, date
-from .alpha_vantage import AlphaVantageClient
+from .alpha_vantage import AlphaVantageClient, AsyncAlphaVantageClient
+from .bar_store import BarStore, DEFAULT_STORE_DIR
+from .memory import compact_frame
+from .singleflight import SingleFlight
+from .symbol_cache import SymbolInfoCache
+from .trading_calendar import TradingCalendar, b3_calendar
+
+# Compartilhados por todas as sessões do processo
+_flight = SingleFlight()
+_symbol_info = SymbolInfoCache()
+
+_INFO_FIELDS = {
+    'alpha_vantage': ['name', 'description', 'currency', 'market_price', 'volume', 'sector'],
+    'yahoo': ['name', 'description', 'currency', 'market_price', 'volume', 'sector', 'pe_ratio']
+}
 
 class StockDataManager:
     """Gerenciador de dados com suporte a múltiplas fontes."""
     
-    def __init__(self, alpha_vantage_key: Optional[str] = None):
+    def __init__(self, alpha_vantage_key: Optional[str] = None,
+                 store_dir: Optional[str] = DEFAULT_STORE_DIR, compact: bool = False,
+                 calendar: Optional[TradingCalendar] = None):
         """
         Inicializa o gerenciador com configurações padrão.
         
         Args:
             alpha_vantage_key: Chave da API Alpha Vantage (opcional)
+            store_dir: Diretório do armazenamento local de barras (None desativa)
+            compact: Se True, retorna as barras em tipos compactos (float32)
+            calendar: Calendário de pregões (padrão: B3, do arquivo local de feriados)
         """
         self._default_symbol = 'PETR4.SA'
+        self.store = BarStore(store_dir) if store_dir else None
+        self.compact = compact
+        self.calendar = calendar if calendar is not None else b3_calendar()
         
         # Inicializar cliente Alpha Vantage se a chave estiver disponível
         self.alpha_vantage = None
+        # Séries Alpha Vantage baixadas em lote por fetch_many, consumidas por _download
+        self._prefetched: Dict[str, pd.DataFrame] = {}
         if alpha_vantage_key:
             try:
                 self.alpha_vantage = AlphaVantageClient(alpha_vantage_key)
@@ -33,91 +59,327 @@ class StockDataManager:
         return self._default_symbol
     
     def fetch_stock_data(self, symbol: str, start_date: date, end_date: date,
-                        use_alpha_vantage: bool = False) -> pd.DataFrame:
+                        use_alpha_vantage: bool = False, interval: str = '1d') -> pd.DataFrame:
         """
         Busca dados históricos usando a fonte especificada.
         
+        As barras são lidas primeiro do armazenamento local; apenas os trechos
+        ausentes no início ou no fim do período são baixados da fonte.
+        
         Args:
             symbol: Símbolo do ativo
             start_date: Data inicial
             end_date: Data final
             use_alpha_vantage: Se True, usa Alpha Vantage como fonte primária
+            interval: Intervalo das barras (Alpha Vantage suporta apenas '1d')
         """
         try:
-            df = None
+            start = pd.Timestamp(start_date)
+            end = pd.Timestamp(end_date)
             
             # Usar Alpha Vantage se selecionado e disponível
-            if use_alpha_vantage and self.alpha_vantage:
+            if use_alpha_vantage and self.alpha_vantage and interval == '1d':
                 print("Buscando dados via Alpha Vantage...")
-                df = self.alpha_vantage.get_daily_data(symbol)
+                # Alpha Vantage inclui a data final no período
+                df = self._fetch_shared('alpha_vantage', symbol, start,
+                                        end + pd.Timedelta(days=1), interval)
                 
                 if not df.empty:
-                    # Filtrar período solicitado
-                    df = df[(df.index >= pd.Timestamp(start_date)) & 
-                           (df.index <= pd.Timestamp(end_date))]
                     print(f"Dados Alpha Vantage obtidos: {len(df)} registros")
-                    return df
+                    return compact_frame(df) if self.compact else df
                 else:
                     print("Nenhum dado encontrado via Alpha Vantage")
             
             # Fallback para yfinance
             print("Buscando dados via Yahoo Finance...")
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(start=start_date, end=end_date, interval='1d')
+            df = self._fetch_shared('yahoo', symbol, start, end, interval)
             
             if df.empty:
                 raise ValueError(f"Não há dados disponíveis para {symbol}")
             
             print(f"Dados Yahoo Finance obtidos: {len(df)} registros")
-            return df
-            
+            return compact_frame(df) if self.compact else df
+        
         except Exception as e:
             raise Exception(f"Erro ao buscar dados para {symbol}: {str(e)}")
     
+    def fetch_many(self, symbols: List[str], start_date: date, end_date: date,
+                   use_alpha_vantage: bool = False, interval: str = '1d',
+                   max_workers: int = 8) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+        """
+        Busca dados históricos de vários símbolos em paralelo.
+        
+        Cada símbolo passa por fetch_stock_data em um pool limitado de threads,
+        de modo que a falha de um ativo não interrompe o lote. Com Alpha
+        Vantage, as séries que faltam no armazenamento local são baixadas
+        antes, concorrentemente, pelo cliente assíncrono.
+        
+        Args:
+            symbols: Lista de símbolos
+            start_date: Data inicial
+            end_date: Data final
+            use_alpha_vantage: Se True, usa Alpha Vantage como fonte primária
+            interval: Intervalo das barras
+            max_workers: Número máximo de downloads simultâneos
+        
+        Returns:
+            Tupla (dados, falhas): DataFrame por símbolo e mensagem de erro por símbolo
+        """
+        symbols = list(dict.fromkeys(symbols))
+        data, failures = {}, {}
+        if not symbols:
+            return data, failures
+        
+        if use_alpha_vantage and self.alpha_vantage and interval == '1d':
+            # Alpha Vantage inclui a data final no período
+            self._prefetch_alpha_vantage(symbols, pd.Timestamp(start_date),
+                                         pd.Timestamp(end_date) + pd.Timedelta(days=1))
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as pool:
+            futures = {
+                symbol: pool.submit(self.fetch_stock_data, symbol, start_date,
+                                    end_date, use_alpha_vantage, interval)
+                for symbol in symbols
+            }
+            for symbol, future in futures.items():
+                try:
+                    data[symbol] = future.result()
+                except Exception as e:
+                    failures[symbol] = str(e)
+        
+        # Séries pré-buscadas e não consumidas não podem servir a buscas futuras
+        for symbol in symbols:
+            self._prefetched.pop(symbol, None)
+        
+        return data, failures
+    
+    def _prefetch_alpha_vantage(self, symbols: List[str], start: pd.Timestamp, end: pd.Timestamp):
+        """
+        Baixa pelo cliente assíncrono as séries diárias ainda não cobertas.
+        
+        Símbolos cujo período já está no armazenamento local não consomem cota.
+        Falhas deixam o símbolo sem pré-busca, e ele segue pelo cliente síncrono.
+        """
+        needed = []
+        for symbol in symbols:
+            if self.store is not None:
+                _, coverage = self.store.read('alpha_vantage', symbol, '1d')
+                if not self._session_ranges(self.store.missing_ranges(coverage, start, end)):
+                    continue
+            needed.append(symbol)
+        if not needed:
+            return
+        
+        client = self.alpha_vantage
+        
+        async def download():
+            async with AsyncAlphaVantageClient(client.api_key, base_url=client.base_url,
+                                               request_limit=client.request_limit) as async_client:
+                return await async_client.get_many_daily(needed)
+        
+        try:
+            self._prefetched.update(asyncio.run(download()))
+        except Exception as e:
+            print(f"Erro na busca em lote via Alpha Vantage: {str(e)}")
+    
+    @staticmethod
+    def flight_stats() -> Dict[str, int]:
+        """Retorna os contadores do agrupamento de requisições concorrentes."""
+        return _flight.stats()
+    
+    def _fetch_shared(self, source: str, symbol: str, start: pd.Timestamp,
+                      end: pd.Timestamp, interval: str) -> pd.DataFrame:
+        """
+        Agrupa buscas concorrentes idênticas de todas as sessões em uma só.
+        
+        Todos os chamadores, inclusive o que executou a busca, recebem uma
+        cópia: o quadro publicado nunca é alterado enquanto outro o copia.
+        """
+        key = ('bars', source, symbol, interval, start, end)
+        df, _ = _flight.do(key, self._fetch_cached, source, symbol, start, end, interval)
+        return df.copy()
+    
+    def _download(self, source: str, symbol: str, start: pd.Timestamp,
+                  end: pd.Timestamp, interval: str) -> pd.DataFrame:
+        """Baixa barras da fonte para o período [start, end)."""
+        if source == 'alpha_vantage':
+            # A API retorna sempre a série completa
+            prefetched = self._prefetched.pop(symbol, None)
+            if prefetched is not None:
+                return prefetched
+            return self.alpha_vantage.get_daily_data(symbol)
+        
+        ticker = yf.Ticker(symbol)
+        return ticker.history(start=start, end=end, interval=interval)
+    
+    def _fetch_cached(self, source: str, symbol: str, start: pd.Timestamp,
+                      end: pd.Timestamp, interval: str) -> pd.DataFrame:
+        """
+        Retorna as barras de [start, end), completando o armazenamento local.
+        
+        Args:
+            source: Fonte dos dados ('yahoo' ou 'alpha_vantage')
+            symbol: Símbolo do ativo
+            start: Início do período (inclusivo)
+            end: Fim do período (exclusivo)
+            interval: Intervalo das barras
+        """
+        if self.store is None:
+            df = self._download(source, symbol, start, end, interval)
+            self._record_quote(source, symbol, interval, df)
+            return _slice_window(df, start, end)
+        
+        cached, coverage = self.store.read(source, symbol, interval)
+        missing = self._session_ranges(self.store.missing_ranges(coverage, start, end))
+        if not missing:
+            self._record_quote(source, symbol, interval, cached)
+            return _slice_window(cached, start, end)
+        
+        try:
+            if source == 'alpha_vantage':
+                # A API retorna sempre a série completa: uma requisição para todos os trechos
+                full = self._download(source, symbol, start, end, interval)
+                downloaded = [(a, b, _slice_window(full, a, b)) for a, b, _ in missing]
+            else:
+                downloaded = [(a, b, self._download(source, symbol, *bounds, interval))
+                              for a, b, bounds in missing]
+        except Exception as e:
+            if cached.empty:
+                raise
+            print(f"Falha ao atualizar {symbol}, usando dados locais: {str(e)}")
+            self._record_quote(source, symbol, interval, cached)
+            return _slice_window(cached, start, end)
+        
+        # A sessão corrente ainda pode mudar: a cobertura nunca passa de hoje.
+        # Trechos vazios (ex: antes da listagem do ativo) também entram na
+        # cobertura, desde que a fonte tenha barras do símbolo; sem nenhuma
+        # barra, o vazio pode ser falha da fonte ou símbolo inválido.
+        today = pd.Timestamp(date.today())
+        new_bars = [df for _, _, df in downloaded if not df.empty]
+        if new_bars or not cached.empty:
+            covered_start, covered_end = coverage if coverage else (start, start)
+            for a, b, _ in downloaded:
+                covered_start = min(covered_start, a)
+                covered_end = max(covered_end, min(b, today))
+            
+            new_bars = pd.concat(new_bars) if new_bars else pd.DataFrame()
+            cached = self.store.append(source, symbol, interval, cached,
+                                       new_bars, (covered_start, covered_end))
+        
+        self._record_quote(source, symbol, interval, cached)
+        return _slice_window(cached, start, end)
+    
+    def _session_ranges(self, ranges: List[Tuple[pd.Timestamp, pd.Timestamp]]) -> List[tuple]:
+        """
+        Reduz cada período ausente aos pregões que ele contém.
+        
+        Períodos só com fins de semana e feriados não geram requisição; a
+        cobertura continua sendo estendida pelo período original.
+        
+        Returns:
+            Lista de (início, fim, (início do download, fim do download))
+        """
+        if self.calendar is None:
+            return [(a, b, (a, b)) for a, b in ranges]
+        
+        trimmed = []
+        for a, b in ranges:
+            bounds = self.calendar.session_bounds(a, b)
+            if bounds is not None:
+                trimmed.append((a, b, bounds))
+        return trimmed
+    
+    def _record_quote(self, source: str, symbol: str, interval: str, df: pd.DataFrame):
+        """Registra a última cotação e volume a partir das barras diárias carregadas."""
+        if interval == '1d':
+            _symbol_info.set_quote_from_bars((source, symbol), df)
+    
     def get_symbol_info(self, symbol: str, use_alpha_vantage: bool = False) -> Dict:
         """
         Retorna informações detalhadas sobre um símbolo específico.
         
+        Campos ainda válidos no cache não são consultados novamente; cotação e
+        volume vêm das barras já carregadas por fetch_stock_data.
+        
         Args:
             symbol: Símbolo do ativo
             use_alpha_vantage: Se True, usa Alpha Vantage como fonte primária
         """
+        source = 'alpha_vantage' if use_alpha_vantage and self.alpha_vantage else 'yahoo'
+        key = (source, symbol)
+        info = _symbol_info.get(key)
+        missing = [field for field in _INFO_FIELDS[source] if field not in info]
+        if not missing:
+            return info
+        
         try:
-            if use_alpha_vantage and self.alpha_vantage:
-                print("Buscando informações via Alpha Vantage...")
-                df = self.alpha_vantage.get_daily_data(symbol)
-                if not df.empty:
-                    last_price = df['Close'].iloc[-1]
-                    last_volume = df['Volume'].iloc[-1]
-                    return {
-                        'name': symbol,
-                        'description': symbol,
-                        'currency': 'BRL',
-                        'market_price': last_price,
-                        'volume': last_volume,
-                        'sector': 'N/A'
-                    }
-            
-            # Fallback para yfinance
-            print("Buscando informações via Yahoo Finance...")
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            
-            return {
-                'name': symbol,
-                'description': info.get('longName', 'N/A'),
-                'currency': info.get('currency', 'BRL'),
-                'market_price': info.get('regularMarketPrice', 0.0),
-                'volume': info.get('regularMarketVolume', 0),
-                'sector': info.get('sector', 'N/A'),
-                'pe_ratio': info.get('forwardPE', None)
-            }
+            loaded, _ = _flight.do(('info', source, symbol), self._load_symbol_info,
+                                   symbol, source, tuple(missing))
+            _symbol_info.set(key, {field: loaded[field] for field in missing if field in loaded})
+            return dict(loaded, **info)
         except Exception:
-            return {
+            return dict({
                 'name': symbol,
                 'description': 'N/A',
                 'currency': 'BRL',
                 'market_price': 0.0,
                 'volume': 0,
                 'sector': 'N/A'
-            }
\ No newline at end of file
+            }, **info)
+    
+    def _load_symbol_info(self, symbol: str, source: str, fields: Tuple[str, ...]) -> Dict:
+        """
+        Consulta na fonte os campos ausentes do cache.
+        
+        Args:
+            symbol: Símbolo do ativo
+            source: Fonte dos dados ('yahoo' ou 'alpha_vantage')
+            fields: Campos a obter
+        """
+        if source == 'alpha_vantage':
+            # Cotação vem das barras locais; a série só é baixada se não houver nenhuma
+            needs_quote = 'market_price' in fields or 'volume' in fields
+            if needs_quote:
+                df = pd.DataFrame()
+                if self.store is not None:
+                    df, _ = self.store.read(source, symbol, '1d')
+                if df.empty:
+                    print("Buscando informações via Alpha Vantage...")
+                    df = self.alpha_vantage.get_daily_data(symbol)
+                self._record_quote(source, symbol, '1d', df)
+            
+            info = _symbol_info.get((source, symbol))
+            if not needs_quote or 'market_price' in info:
+                return {
+                    'name': symbol,
+                    'description': symbol,
+                    'currency': 'BRL',
+                    'market_price': info.get('market_price', 0.0),
+                    'volume': info.get('volume', 0),
+                    'sector': 'N/A'
+                }
+        
+        # Fallback para yfinance
+        print("Buscando informações via Yahoo Finance...")
+        ticker = yf.Ticker(symbol)
+        info = ticker.info
+        
+        return {
+            'name': symbol,
+            'description': info.get('longName', 'N/A'),
+            'currency': info.get('currency', 'BRL'),
+            'market_price': info.get('regularMarketPrice', 0.0),
+            'volume': info.get('regularMarketVolume', 0),
+            'sector': info.get('sector', 'N/A'),
+            'pe_ratio': info.get('forwardPE', None)
+        }
+
+def _slice_window(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """Filtra o período [start, end), respeitando o fuso horário do índice."""
+    if df.empty:
+        return df
+    tz = getattr(df.index, 'tz', None)
+    if tz is not None:
+        start = start.tz_localize(tz)
+        end = end.tz_localize(tz)
+    return df[(df.index >= start) & (df.index < end)]
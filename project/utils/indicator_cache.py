@@ -0,0 +1,199 @@
+"""
+Módulo de cache de resultados de indicadores endereçado pelo conteúdo das barras.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import numpy as np
+import pandas as pd
+
+# Orçamento padrão de memória do cache (bytes)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Linhas de cada série lidas por sampled_digest (a primeira e a última sempre entram)
+DIGEST_SAMPLES = 256
+
+def block_digest(*arrays) -> str:
+    """
+    Resumo do conteúdo de um bloco de séries (ex: colunas OHLCV).
+    
+    Séries com os mesmos valores, tipos e tamanhos produzem o mesmo resumo,
+    independentemente do objeto DataFrame de origem.
+    
+    Args:
+        arrays: Arrays ou séries numéricas, na ordem em que serão lidos
+    
+    Returns:
+        Resumo hexadecimal
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for values in arrays:
+        values = np.ascontiguousarray(np.asarray(values))
+        digest.update(f"{values.dtype.str}{values.shape}".encode())
+        digest.update(values.reshape(-1).view(np.uint8))
+    return digest.hexdigest()
+
+def _index_values(index) -> np.ndarray:
+    """Valores do índice como array numérico (timestamps em int64)."""
+    keys = index.asi8 if hasattr(index, 'asi8') else np.asarray(index)
+    if keys.dtype == object:
+        keys = pd.util.hash_array(keys)
+    return keys
+
+def bars_digest(index, *arrays) -> str:
+    """
+    Resumo do conteúdo das barras: índice e todas as linhas das séries.
+    
+    É o block_digest do índice seguido das séries; barras com o mesmo índice
+    e valores diferentes em qualquer linha produzem resumos diferentes.
+    
+    Args:
+        index: Índice das barras (ou None)
+        arrays: Arrays ou séries alinhadas ao índice
+    
+    Returns:
+        Resumo hexadecimal
+    """
+    if index is None:
+        return block_digest(*arrays)
+    return block_digest(_index_values(index), *arrays)
+
+def sampled_digest(index, *arrays, samples: int = DIGEST_SAMPLES) -> str:
+    """
+    Resumo aproximado de barras: índice inteiro, tamanho e linhas amostradas.
+    
+    Lê o índice e apenas `samples` linhas espaçadas de cada série (sempre a
+    primeira e a última). NÃO é seguro em geral: barras com o mesmo índice
+    que diferem só em linhas fora da amostra (uma barra corrigida, barras com
+    NaN) recebem o mesmo resumo, e o cache devolve os indicadores das outras
+    barras. Usado apenas por IndicatorCache(sampled=True), quando as barras de
+    um mesmo índice nunca mudam, a não ser na última.
+    
+    Args:
+        index: Índice das barras (ou None)
+        arrays: Arrays ou séries alinhadas ao índice
+        samples: Número de linhas amostradas de cada série
+    
+    Returns:
+        Resumo hexadecimal
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if index is not None:
+        digest.update(np.ascontiguousarray(_index_values(index)).view(np.uint8))
+    
+    n = len(arrays[0]) if arrays else 0
+    rows = np.unique(np.linspace(0, n - 1, min(samples, n)).astype(np.int64))
+    for values in arrays:
+        values = np.asarray(values)
+        digest.update(f"{values.dtype.str}{values.shape}".encode())
+        digest.update(np.ascontiguousarray(values[rows]).view(np.uint8))
+    return digest.hexdigest()
+
+def params_key(params: Optional[Dict[str, Any]]) -> tuple:
+    """Chave ordenada e imutável de um dicionário de parâmetros."""
+    return tuple(sorted((params or {}).items()))
+
+class IndicatorCache:
+    """
+    Cache LRU de resultados de indicadores com orçamento de memória.
+    
+    As chaves combinam o resumo das barras de entrada, o nome do indicador e
+    os parâmetros; quando o total armazenado excede o orçamento, os
+    resultados usados há mais tempo são descartados.
+    """
+    
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, sampled: bool = False):
+        """
+        Inicializa o cache vazio.
+        
+        Args:
+            max_bytes: Orçamento de memória dos resultados armazenados
+            sampled: Se True, as chaves usam sampled_digest em vez do conteúdo
+                completo das barras; mais rápido, mas inseguro (ver
+                sampled_digest)
+        """
+        self.max_bytes = max_bytes
+        self.sampled = sampled
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def digest(self, index, *arrays) -> str:
+        """Resumo das barras usado nas chaves (bars_digest, ou sampled_digest se sampled)."""
+        if self.sampled:
+            return sampled_digest(index, *arrays)
+        return bars_digest(index, *arrays)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retorna o resultado da chave, ou None, marcando-o como usado."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: Hashable, value: Any, nbytes: int):
+        """
+        Armazena um resultado, descartando os menos usados se necessário.
+        
+        Resultados maiores que o orçamento inteiro não são armazenados.
+        
+        Args:
+            key: Chave do resultado
+            value: Resultado (não deve ser alterado depois de armazenado)
+            nbytes: Tamanho do resultado em memória
+        """
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+                self.evictions += 1
+    
+    def clear(self):
+        """Descarta todos os resultados, mantendo os contadores."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Retorna os contadores de acertos, faltas, descartes e a ocupação."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes
+            }
+
+# Cache compartilhado pelo motor e pelo registro de indicadores
+_default_cache: Optional[IndicatorCache] = IndicatorCache()
+
+def get_indicator_cache() -> Optional[IndicatorCache]:
+    """Retorna o cache padrão de indicadores (None se desativado)."""
+    return _default_cache
+
+def set_indicator_cache(cache: Optional[IndicatorCache]):
+    """
+    Substitui o cache padrão de indicadores.
+    
+    Args:
+        cache: Novo cache, ou None para desativar o cache
+    """
+    global _default_cache
+    _default_cache = cache
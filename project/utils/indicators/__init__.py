@@ -4,6 +4,13 @@ Módulo de indicadores técnicos.
 from .momentum import calculate_rsi, calculate_stochastic, calculate_macd
 from .volatility import calculate_bollinger_bands, calculate_atr
 from .base import validate_dataframe, fill_missing_values
+from .engine import compute_indicators, set_default_backend, INDICATOR_COLUMNS
+from .streaming import StreamingIndicators
+from .sweep import rsi_sweep, macd_sweep, stochastic_sweep
+from .registry import compute_columns, register, Indicator, REGISTRY
+from .chunked import compute_chunked, parquet_chunks, archive_chunks
+from .panel import compute_panel, align_panel
+from ..indicator_cache import IndicatorCache, get_indicator_cache, set_indicator_cache
 
 __all__ = [
     'calculate_rsi',
@@ -12,5 +19,24 @@ __all__ = [
     'calculate_bollinger_bands',
     'calculate_atr',
     'validate_dataframe',
-    'fill_missing_values'
+    'fill_missing_values',
+    'compute_indicators',
+    'set_default_backend',
+    'INDICATOR_COLUMNS',
+    'StreamingIndicators',
+    'rsi_sweep',
+    'macd_sweep',
+    'stochastic_sweep',
+    'compute_columns',
+    'register',
+    'Indicator',
+    'REGISTRY',
+    'compute_chunked',
+    'parquet_chunks',
+    'archive_chunks',
+    'compute_panel',
+    'align_panel',
+    'IndicatorCache',
+    'get_indicator_cache',
+    'set_indicator_cache'
 ]
\ No newline at end of file
@@ -2,16 +2,19 @@
 Módulo base para cálculo de indicadores técnicos.
 """
 import pandas as pd
-import pandas_ta as ta
 
-def validate_dataframe(df):
-    """Valida o DataFrame de entrada."""
+def validate_columns(df):
+    """Valida o DataFrame de entrada sem copiá-lo."""
     if df is None or df.empty:
         raise ValueError("DataFrame está vazio ou None")
     required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
     missing = [col for col in required_columns if col not in df.columns]
     if missing:
         raise ValueError(f"Colunas ausentes: {missing}")
+
+def validate_dataframe(df):
+    """Valida o DataFrame de entrada."""
+    validate_columns(df)
     return df.copy()
 
 def fill_missing_values(df):
@@ -0,0 +1,410 @@
+"""
+Cálculo de indicadores fora da memória, em blocos lidos do disco.
+
+As barras chegam em blocos de uma fonte (arquivo Parquet ou BarArchive) e
+cada indicador mantém entre os blocos o estado dos kernels em lote
+(kernels.py): o estado das médias exponenciais e móveis, as últimas barras
+da janela e o fechamento anterior. Assim cada linha gravada é idêntica bit a
+bit à de compute_indicators (backend nativo) sobre o histórico inteiro, e a
+memória de pico depende do tamanho do bloco, não do histórico.
+
+Duas regras do cálculo em lote dependem da série inteira: a quantidade
+mínima de barras de cada indicador e a soma de épsilon às amplitudes quando
+alguma é zero (Stochastic e ATR). Por isso a fonte é lida duas vezes: uma
+varredura leve apura essas condições e a segunda passada calcula e grava.
+"""
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Callable, Dict, Iterable, Iterator, Optional
+from . import kernels
+from .base import validate_columns
+from .engine import INDICATOR_COLUMNS, DEFAULT_PARAMS, _bands_derived
+from ..bar_archive import BarArchive, rates_to_frame
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+ChunkSource = Callable[[], Iterator[pd.DataFrame]]
+
+def parquet_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> ChunkSource:
+    """
+    Fonte de blocos de um arquivo Parquet (ex: partição do BarStore).
+    
+    Args:
+        path: Arquivo Parquet com índice de datas e colunas OHLCV
+        chunk_size: Barras por bloco
+    
+    Returns:
+        Função que abre a leitura e produz os blocos em ordem
+    """
+    def open_chunks():
+        parquet = pq.ParquetFile(path)
+        metadata = parquet.schema_arrow.metadata
+        for batch in parquet.iter_batches(batch_size=chunk_size):
+            # Metadados do pandas restauram o índice de cada bloco
+            yield pa.Table.from_batches([batch]).replace_schema_metadata(metadata).to_pandas()
+    return open_chunks
+
+def archive_chunks(archive: BarArchive, symbol: str, interval: str,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> ChunkSource:
+    """
+    Fonte de blocos do arquivo memory-mapped de barras MT5.
+    
+    Args:
+        archive: Arquivo de barras
+        symbol: Símbolo
+        interval: Intervalo das barras
+        chunk_size: Barras por bloco
+    
+    Returns:
+        Função que abre a leitura e produz os blocos em ordem
+    """
+    def open_chunks():
+        rates = archive.open(symbol, interval)
+        for start in range(0, len(rates), chunk_size):
+            yield rates_to_frame(rates[start:start + chunk_size])
+    return open_chunks
+
+class _Shift:
+    """shift(1) em blocos: a primeira barra recebe a última do bloco anterior."""
+    
+    def __init__(self):
+        self.last = np.nan
+    
+    def __call__(self, x):
+        out = np.empty(len(x))
+        out[:1] = self.last
+        out[1:] = x[:-1]
+        if len(x):
+            self.last = x[-1]
+        return out
+
+class _Ewm:
+    """kernels.ewm_mean em blocos."""
+    
+    def __init__(self, com, adjust, minp=0):
+        self.com, self.adjust, self.minp = com, adjust, minp
+        self.state = np.empty(kernels.EWM_STATE_SIZE)
+        kernels.ewm_reset(self.state)
+    
+    def __call__(self, x):
+        return kernels.ewm_mean_resume(x, self.state, self.com, self.adjust, self.minp)
+
+def _rma(length):
+    """kernels.rma em blocos."""
+    alpha = 1.0 / length
+    return _Ewm(1.0 / alpha - 1.0, True, length)
+
+class _RollingMean:
+    """kernels.rolling_mean em blocos."""
+    
+    def __init__(self, window, minp=None):
+        self.window = window
+        self.minp = window if minp is None else minp
+        self.state = np.empty(kernels.MEAN_STATE_SIZE)
+        self.tail = np.empty(0)
+        self.count = 0
+    
+    def __call__(self, x):
+        values = np.concatenate([self.tail, x])
+        out = kernels.rolling_mean_resume(values, len(self.tail), self.count, self.window,
+                                          self.minp, self.state)
+        self.count += len(x)
+        self.tail = values[max(len(values) - self.window, 0):]
+        return out
+
+class _RollingVar:
+    """kernels.rolling_var em blocos."""
+    
+    def __init__(self, window, ddof, minp=None):
+        self.window = window
+        self.ddof = ddof
+        self.minp = window if minp is None else minp
+        self.state = np.empty(kernels.VAR_STATE_SIZE)
+        self.tail = np.empty(0)
+        self.count = 0
+    
+    def __call__(self, x):
+        values = np.concatenate([self.tail, x])
+        out = kernels.rolling_var_resume(values, len(self.tail), self.count, self.window,
+                                         self.minp, self.ddof, self.state)
+        self.count += len(x)
+        self.tail = values[max(len(values) - self.window, 0):]
+        return out
+
+class _RollingExtreme:
+    """kernels.rolling_min/rolling_max em blocos (sobreposição de window - 1 barras)."""
+    
+    def __init__(self, window, is_max):
+        self.window = window
+        self.is_max = is_max
+        self.tail = np.empty(0)
+    
+    def __call__(self, x):
+        values = np.concatenate([self.tail, x])
+        out = kernels.rolling_extreme_resume(values, len(self.tail), self.window, self.is_max)
+        self.tail = values[max(len(values) - (self.window - 1), 0):]
+        return out
+
+class _Ema:
+    """kernels.ema em blocos: a semente é a média das primeiras `length` barras."""
+    
+    def __init__(self, length):
+        self.length = length
+        self.seed = []
+        self.count = 0
+        self.ewm = _Ewm((length - 1) / 2.0, adjust=False)
+    
+    def __call__(self, x):
+        seeded = x.astype(np.float64, copy=True)
+        start = self.count
+        self.count += len(x)
+        if start < self.length:
+            head = min(self.length - start, len(x))
+            self.seed.append(seeded[:head].copy())
+            if self.count >= self.length:
+                sma_nth = kernels.nanmean(np.concatenate(self.seed))
+                seeded[:head - 1] = np.nan
+                seeded[head - 1] = sma_nth
+                self.seed = []
+            else:
+                seeded[:head] = np.nan
+        return self.ewm(seeded)
+
+class _FromFirstValid:
+    """Aplica fn a partir do primeiro valor válido da série (shifted_sma, signal_ema)."""
+    
+    def __init__(self, fn):
+        self.fn = fn
+        self.started = False
+    
+    def __call__(self, x):
+        out = np.full(len(x), np.nan)
+        start = 0
+        if not self.started:
+            start = kernels.first_valid(x)
+            if start == len(x):
+                return out
+            self.started = True
+        out[start:] = self.fn(x[start:])
+        return out
+
+class _ChunkedStochastic:
+    """Grava %K, %D e seus valores anteriores."""
+    
+    def __init__(self, n, zero_range, k, d, smooth_k):
+        self.enabled = n >= max(k, d, smooth_k)
+        self.zero_range = zero_range
+        self.lowest = _RollingExtreme(k, False)
+        self.highest = _RollingExtreme(k, True)
+        self.smooth_k = _FromFirstValid(_RollingMean(smooth_k))
+        self.smooth_d = _FromFirstValid(_RollingMean(d))
+        self.prev_k, self.prev_d = _Shift(), _Shift()
+    
+    def __call__(self, high, low, close, out):
+        if self.enabled:
+            lowest_low = self.lowest(low)
+            value_range = self.highest(high) - lowest_low
+            if self.zero_range:
+                value_range += kernels.EPSILON
+            stoch = 100 * (close - lowest_low)
+            stoch /= value_range
+            out[:, 0] = self.smooth_k(stoch)
+            out[:, 1] = self.smooth_d(out[:, 0])
+        else:
+            out[:, :2] = np.nan
+        out[:, 2] = self.prev_k(out[:, 0])
+        out[:, 3] = self.prev_d(out[:, 1])
+
+class _ChunkedRsi:
+    """Grava o RSI e o valor anterior."""
+    
+    def __init__(self, n, zero_range, length):
+        self.enabled = n >= length
+        self.prev_close = _Shift()
+        self.positive_avg, self.negative_avg = _rma(length), _rma(length)
+        self.prev = _Shift()
+    
+    def __call__(self, high, low, close, out):
+        negative = close - self.prev_close(close)
+        if self.enabled:
+            positive = negative.copy()
+            positive[positive < 0] = 0
+            negative[negative > 0] = 0
+            positive_avg = self.positive_avg(positive)
+            negative_avg = self.negative_avg(negative)
+            out[:, 0] = 100.0 * positive_avg / (positive_avg + np.abs(negative_avg))
+        else:
+            out[:, 0] = np.nan
+        out[:, 1] = self.prev(out[:, 0])
+
+class _ChunkedMacd:
+    """Grava MACD, sinal, histograma e o MACD anterior."""
+    
+    def __init__(self, n, zero_range, fast, slow, signal):
+        if slow < fast:
+            fast, slow = slow, fast
+        self.enabled = n >= max(fast, slow, signal)
+        self.fast, self.slow = _Ema(fast), _Ema(slow)
+        self.signal = _FromFirstValid(_Ema(signal))
+        self.prev = _Shift()
+    
+    def __call__(self, high, low, close, out):
+        if self.enabled:
+            line = self.fast(close) - self.slow(close)
+            signal_line = self.signal(line)
+            out[:, 0], out[:, 1], out[:, 2] = line, signal_line, line - signal_line
+        else:
+            out[:, :3] = np.nan
+        out[:, 3] = self.prev(out[:, 0])
+
+class _ChunkedBollinger:
+    """Grava as bandas, a largura relativa e o %B."""
+    
+    def __init__(self, n, zero_range, length, std):
+        self.enabled = n >= length
+        self.std = float(std)
+        self.var = _RollingVar(length, ddof=0)
+        self.mean = _RollingMean(length)
+    
+    def __call__(self, high, low, close, out):
+        if self.enabled:
+            deviations = self.std * np.sqrt(self.var(close))
+            middle = self.mean(close)
+            out[:, 0], out[:, 1], out[:, 2] = middle + deviations, middle, middle - deviations
+        else:
+            out[:, :3] = np.nan
+        _bands_derived(close, out)
+
+class _ChunkedAtr:
+    """Grava o ATR, o ATR percentual e sua média móvel."""
+    
+    def __init__(self, n, zero_range, length):
+        self.enabled = n >= length
+        self.zero_range = zero_range
+        self.prev_close = _Shift()
+        self.first = True
+        self.rma = _rma(length)
+        self.ma = _RollingMean(length)
+    
+    def __call__(self, high, low, close, out):
+        prev_close = self.prev_close(close)
+        if self.enabled:
+            bar_range = high - low
+            if self.zero_range:
+                bar_range += kernels.EPSILON
+            ranges = np.abs(np.vstack([bar_range, high - prev_close, prev_close - low]))
+            # Máximo ignorando NaN, como kernels.true_range
+            all_nan = np.isnan(ranges).all(axis=0)
+            tr = np.where(np.isnan(ranges), -np.inf, ranges).max(axis=0)
+            tr[all_nan] = np.nan
+            if self.first:
+                tr[:1] = np.nan
+            out[:, 0] = self.rma(tr)
+        else:
+            out[:, 0] = np.nan
+        self.first = self.first and len(close) == 0
+        np.divide(out[:, 0], close, out=out[:, 1])
+        out[:, 1] *= 100
+        out[:, 2] = self.ma(out[:, 0])
+
+_CHUNKED = {
+    'stochastic': _ChunkedStochastic,
+    'rsi': _ChunkedRsi,
+    'macd': _ChunkedMacd,
+    'bollinger': _ChunkedBollinger,
+    'atr': _ChunkedAtr
+}
+
+def _scan(open_chunks: ChunkSource, stochastic_k: Optional[int]):
+    """
+    Primeira passada: quantidade de barras e ocorrência de amplitudes zero.
+    
+    Returns:
+        Tupla (barras, alguma barra com high == low, alguma janela do
+        estocástico com máxima == mínima)
+    """
+    n = 0
+    zero_bar = zero_window = False
+    if stochastic_k is not None:
+        lowest, highest = _RollingExtreme(stochastic_k, False), _RollingExtreme(stochastic_k, True)
+    for chunk in open_chunks():
+        high = chunk['High'].to_numpy(dtype=np.float64)
+        low = chunk['Low'].to_numpy(dtype=np.float64)
+        n += len(chunk)
+        zero_bar = zero_bar or bool(((high - low) == 0).any())
+        if stochastic_k is not None:
+            zero_window = zero_window or bool(((highest(high) - lowest(low)) == 0).any())
+    return n, zero_bar, zero_window
+
+def compute_chunked(open_chunks: ChunkSource, output_path: str,
+                    indicators: Optional[Iterable[str]] = None,
+                    params: Optional[Dict[str, Dict]] = None) -> int:
+    """
+    Calcula os indicadores bloco a bloco e grava o resultado em Parquet.
+    
+    O arquivo final tem as colunas de cada bloco seguidas das colunas dos
+    indicadores, como compute_indicators, e é gravado de forma atômica.
+    
+    Args:
+        open_chunks: Fonte de blocos (parquet_chunks, archive_chunks ou uma
+            função que produza DataFrames OHLCV consecutivos a cada chamada)
+        output_path: Arquivo Parquet de saída
+        indicators: Indicadores a calcular (padrão: todos de INDICATOR_COLUMNS)
+        params: Parâmetros por indicador, sobrescrevem DEFAULT_PARAMS
+    
+    Returns:
+        Quantidade de barras gravadas
+    """
+    indicators = list(INDICATOR_COLUMNS if indicators is None else indicators)
+    unknown = [name for name in indicators if name not in INDICATOR_COLUMNS]
+    if unknown:
+        raise ValueError(f"Indicadores desconhecidos: {unknown}")
+    kwargs = {name: dict(DEFAULT_PARAMS[name], **(params or {}).get(name, {})) for name in indicators}
+    
+    n, zero_bar, zero_window = _scan(
+        open_chunks, kwargs['stochastic']['k'] if 'stochastic' in kwargs else None
+    )
+    zero_ranges = {'stochastic': zero_window, 'atr': zero_bar}
+    streams = [_CHUNKED[name](n, zero_ranges.get(name, False), **kwargs[name]) for name in indicators]
+    columns = [col for name in indicators for col in INDICATOR_COLUMNS[name]]
+    
+    tmp_path = f'{output_path}.tmp'
+    writer = None
+    written = 0
+    try:
+        for chunk in open_chunks():
+            if chunk.empty:
+                continue
+            validate_columns(chunk)
+            high, low, close = (chunk[col].to_numpy(dtype=np.float64) for col in ('High', 'Low', 'Close'))
+            block = np.empty((len(chunk), len(columns)), order='F')
+            offset = 0
+            for name, stream in zip(indicators, streams):
+                width = len(INDICATOR_COLUMNS[name])
+                stream(high, low, close, block[:, offset:offset + width])
+                offset += width
+            
+            chunk = chunk.drop(columns=[col for col in columns if col in chunk.columns])
+            result = pd.concat([chunk, pd.DataFrame(block, index=chunk.index, columns=columns)], axis=1)
+            table = pa.Table.from_pandas(result, preserve_index=True)
+            if writer is None:
+                os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+                writer = pq.ParquetWriter(tmp_path, table.schema)
+            writer.write_table(table)
+            written += len(chunk)
+    except Exception:
+        if writer is not None:
+            writer.close()
+            writer = None
+            os.remove(tmp_path)
+        raise
+    finally:
+        if writer is not None:
+            writer.close()
+    
+    if written:
+        os.replace(tmp_path, output_path)
+    return written
@@ -0,0 +1,242 @@
+"""
+Motor de cálculo conjunto de indicadores em um único bloco de saída.
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional, Tuple
+from . import kernels
+from .base import validate_columns
+from ..indicator_cache import params_key, get_indicator_cache
+
+# Colunas geradas por indicador, na mesma ordem das funções calculate_*
+INDICATOR_COLUMNS = {
+    'stochastic': ['STOCH_K', 'STOCH_D', 'STOCH_K_PREV', 'STOCH_D_PREV'],
+    'rsi': ['RSI', 'RSI_PREV'],
+    'macd': ['MACD', 'MACD_SIGNAL', 'MACD_HIST', 'MACD_PREV'],
+    'bollinger': ['BB_UPPER', 'BB_MIDDLE', 'BB_LOWER', 'BB_WIDTH', 'BB_PCT'],
+    'atr': ['ATR', 'ATR_PCT', 'ATR_MA']
+}
+
+DEFAULT_PARAMS = {
+    'stochastic': {'k': 14, 'd': 3, 'smooth_k': 3},
+    'rsi': {'length': 7},
+    'macd': {'fast': 12, 'slow': 26, 'signal': 9},
+    'bollinger': {'length': 20, 'std': 2},
+    'atr': {'length': 14}
+}
+
+BACKENDS = ['native', 'pandas_ta']
+_default_backend = 'native'
+
+def set_default_backend(backend: str):
+    """
+    Define o backend padrão de cálculo dos indicadores.
+    
+    Args:
+        backend: 'native' (kernels próprios) ou 'pandas_ta'
+    """
+    global _default_backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend inválido: {backend}")
+    _default_backend = backend
+
+def get_default_backend() -> str:
+    """Retorna o backend padrão de cálculo dos indicadores."""
+    return _default_backend
+
+def _shift(values: np.ndarray, out: np.ndarray):
+    """Grava em out a série deslocada de uma barra (equivalente a shift(1))."""
+    out[0] = np.nan
+    out[1:] = values[:-1]
+
+def _ta_stochastic(high, low, close, out, k, d, smooth_k):
+    """Grava %K, %D e seus valores anteriores."""
+    import pandas_ta as ta
+    stoch = ta.stoch(high=high, low=low, close=close, k=k, d=d, smooth_k=smooth_k)
+    out[:, 0] = stoch.iloc[:, 0].reindex(close.index).to_numpy()
+    out[:, 1] = stoch.iloc[:, 1].reindex(close.index).to_numpy()
+    _shift(out[:, 0], out[:, 2])
+    _shift(out[:, 1], out[:, 3])
+
+def _ta_rsi(high, low, close, out, length):
+    """Grava o RSI e o valor anterior."""
+    import pandas_ta as ta
+    out[:, 0] = ta.rsi(close=close, length=length).to_numpy()
+    _shift(out[:, 0], out[:, 1])
+
+def _ta_macd(high, low, close, out, fast, slow, signal):
+    """Grava MACD, sinal, histograma e o MACD anterior."""
+    import pandas_ta as ta
+    # Colunas do pandas_ta: MACD, histograma, sinal
+    macd = ta.macd(close=close, fast=fast, slow=slow, signal=signal)
+    out[:, 0] = macd.iloc[:, 0].to_numpy()
+    out[:, 1] = macd.iloc[:, 2].to_numpy()
+    out[:, 2] = macd.iloc[:, 1].to_numpy()
+    _shift(out[:, 0], out[:, 3])
+
+def _ta_bollinger(high, low, close, out, length, std):
+    """Grava as bandas, a largura relativa e o %B."""
+    import pandas_ta as ta
+    # Colunas do pandas_ta: inferior, média, superior
+    bbands = ta.bbands(close=close, length=length, std=std)
+    upper, middle, lower = out[:, 0], out[:, 1], out[:, 2]
+    upper[:] = bbands.iloc[:, 2].to_numpy()
+    middle[:] = bbands.iloc[:, 1].to_numpy()
+    lower[:] = bbands.iloc[:, 0].to_numpy()
+    _bands_derived(close.to_numpy(), out)
+
+def _ta_atr(high, low, close, out, length):
+    """Grava o ATR, o ATR percentual e sua média móvel."""
+    import pandas_ta as ta
+    atr = ta.atr(high=high, low=low, close=close, length=length)
+    out[:, 0] = atr.to_numpy()
+    np.divide(out[:, 0], close.to_numpy(), out=out[:, 1])
+    out[:, 1] *= 100
+    out[:, 2] = atr.rolling(window=length).mean().to_numpy()
+
+def _bands_derived(close, out):
+    """Grava a largura relativa e o %B a partir das bandas já gravadas."""
+    upper, middle, lower = out[:, 0], out[:, 1], out[:, 2]
+    np.subtract(upper, lower, out=out[:, 3])
+    np.subtract(close, lower, out=out[:, 4])
+    out[:, 4] /= out[:, 3]
+    out[:, 3] /= middle
+
+def _native_stochastic(high, low, close, out, k, d, smooth_k):
+    """Grava %K, %D e seus valores anteriores."""
+    out[:, 0], out[:, 1] = kernels.stochastic(high, low, close, k, d, smooth_k)
+    _shift(out[:, 0], out[:, 2])
+    _shift(out[:, 1], out[:, 3])
+
+def _native_rsi(high, low, close, out, length):
+    """Grava o RSI e o valor anterior."""
+    out[:, 0] = kernels.rsi(close, length)
+    _shift(out[:, 0], out[:, 1])
+
+def _native_macd(high, low, close, out, fast, slow, signal):
+    """Grava MACD, sinal, histograma e o MACD anterior."""
+    out[:, 0], out[:, 1], out[:, 2] = kernels.macd(close, fast, slow, signal)
+    _shift(out[:, 0], out[:, 3])
+
+def _native_bollinger(high, low, close, out, length, std):
+    """Grava as bandas, a largura relativa e o %B."""
+    out[:, 0], out[:, 1], out[:, 2] = kernels.bollinger_bands(close, length, std)
+    _bands_derived(close, out)
+
+def _native_atr(high, low, close, out, length):
+    """Grava o ATR, o ATR percentual e sua média móvel."""
+    out[:, 0] = kernels.atr(high, low, close, length)
+    np.divide(out[:, 0], close, out=out[:, 1])
+    out[:, 1] *= 100
+    out[:, 2] = kernels.rolling_mean(out[:, 0], length)
+
+_WRITERS = {
+    'native': {
+        'stochastic': _native_stochastic,
+        'rsi': _native_rsi,
+        'macd': _native_macd,
+        'bollinger': _native_bollinger,
+        'atr': _native_atr
+    },
+    'pandas_ta': {
+        'stochastic': _ta_stochastic,
+        'rsi': _ta_rsi,
+        'macd': _ta_macd,
+        'bollinger': _ta_bollinger,
+        'atr': _ta_atr
+    }
+}
+
+def compute_block(high: pd.Series, low: pd.Series, close: pd.Series,
+                  indicators: Optional[Iterable[str]] = None,
+                  params: Optional[Dict[str, Dict]] = None,
+                  backend: Optional[str] = None) -> Tuple[np.ndarray, List[str]]:
+    """
+    Calcula os indicadores pedidos em um único bloco pré-alocado.
+    
+    Args:
+        high: Série de máximas
+        low: Série de mínimas
+        close: Série de fechamentos
+        indicators: Indicadores a calcular (padrão: todos de INDICATOR_COLUMNS)
+        params: Parâmetros por indicador, sobrescrevem DEFAULT_PARAMS
+        backend: 'native' ou 'pandas_ta' (padrão: get_default_backend())
+    
+    O bloco passa pelo cache padrão de utils.indicator_cache, endereçado pelo
+    conteúdo das barras (índice, high, low e close), pelos indicadores e pelos
+    parâmetros; um acerto
+    devolve o próprio bloco armazenado, sem cópia. Por isso o bloco é
+    somente leitura.
+    
+    Returns:
+        Tupla (bloco n_barras x n_colunas, nomes das colunas)
+    """
+    backend = backend or _default_backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend inválido: {backend}")
+    indicators = list(INDICATOR_COLUMNS if indicators is None else indicators)
+    unknown = [name for name in indicators if name not in INDICATOR_COLUMNS]
+    if unknown:
+        raise ValueError(f"Indicadores desconhecidos: {unknown}")
+    
+    plan = [(name, dict(DEFAULT_PARAMS[name], **(params or {}).get(name, {}))) for name in indicators]
+    columns = [col for name in indicators for col in INDICATOR_COLUMNS[name]]
+    
+    # Mesmas barras, indicadores e parâmetros reaproveitam o bloco anterior
+    cache = get_indicator_cache()
+    if cache is not None:
+        key = (cache.digest(getattr(close, 'index', None), high, low, close), 'block',
+               tuple((name, params_key(kwargs)) for name, kwargs in plan), backend)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached, columns
+    
+    writers = _WRITERS[backend]
+    if backend == 'native':
+        # Kernels operam sobre arrays float64
+        high, low, close = (s.to_numpy(dtype=np.float64) for s in (high, low, close))
+    
+    # Ordem Fortran: cada coluna é contígua, como as séries de entrada
+    block = np.empty((len(close), len(columns)), order='F')
+    
+    offset = 0
+    for name, kwargs in plan:
+        width = len(INDICATOR_COLUMNS[name])
+        writers[name](high, low, close, block[:, offset:offset + width], **kwargs)
+        offset += width
+    
+    block.setflags(write=False)
+    if cache is not None:
+        cache.put(key, block, block.nbytes)
+    return block, columns
+
+def compute_indicators(df: pd.DataFrame, indicators: Optional[Iterable[str]] = None,
+                       params: Optional[Dict[str, Dict]] = None,
+                       backend: Optional[str] = None) -> pd.DataFrame:
+    """
+    Calcula os indicadores técnicos em uma única passada sobre o DataFrame.
+    
+    Produz as mesmas colunas das funções calculate_* encadeadas, lendo as
+    colunas OHLC uma única vez e sem copiar o DataFrame a cada indicador.
+    
+    Args:
+        df: DataFrame com colunas Open, High, Low, Close e Volume
+        indicators: Indicadores a calcular (padrão: todos)
+        params: Parâmetros por indicador, ex: {'rsi': {'length': 14}}
+        backend: 'native' ou 'pandas_ta' (padrão: get_default_backend())
+    
+    Returns:
+        Novo DataFrame com as colunas originais e as dos indicadores
+    """
+    validate_columns(df)
+    try:
+        block, columns = compute_block(df['High'], df['Low'], df['Close'], indicators,
+                                       params, backend)
+        # Colunas de um cálculo anterior são substituídas, não duplicadas
+        df = df.drop(columns=[col for col in columns if col in df.columns])
+        # Sem cópia: as colunas dos indicadores apontam para o bloco (somente leitura)
+        return pd.concat([df, pd.DataFrame(block, index=df.index, columns=columns, copy=False)],
+                         axis=1, copy=False)
+    
+    except Exception as e:
+        raise Exception(f"Erro ao calcular indicadores: {str(e)}")
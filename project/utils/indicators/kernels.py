@@ -0,0 +1,548 @@
+"""
+Kernels numéricos dos indicadores, sem dependência do pandas_ta.
+
+As rotinas reproduzem passo a passo os algoritmos do pandas 2.2 usados pelo
+pandas_ta 0.3.14b0 (ewm, rolling mean/var/min/max e a soma par a par do
+numpy), de modo que os resultados são idênticos bit a bit. Com numba
+instalado os laços são compilados; sem ele, as próprias primitivas do pandas
+são chamadas.
+"""
+import sys
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+EPSILON = sys.float_info.epsilon
+
+def _jit(fn):
+    """Compila a função com numba quando disponível."""
+    if NUMBA_AVAILABLE:
+        return njit(cache=True, nogil=True)(fn)
+    return fn
+
+# Estado da média móvel (roll_mean do pandas): nobs, soma, valores negativos,
+# compensação de adição, compensação de remoção, repetições consecutivas e
+# último valor adicionado
+MEAN_STATE_SIZE = 7
+
+@_jit
+def mean_reset(state, first_value):
+    state[0] = 0.0
+    state[1] = 0.0
+    state[2] = 0.0
+    state[3] = 0.0
+    state[4] = 0.0
+    state[5] = 0.0
+    state[6] = first_value
+
+@_jit
+def mean_add(state, val):
+    if val == val:
+        state[0] += 1.0
+        y = val - state[3]
+        t = state[1] + y
+        state[3] = t - state[1] - y
+        state[1] = t
+        if np.signbit(val):
+            state[2] += 1.0
+        if val == state[6]:
+            state[5] += 1.0
+        else:
+            state[5] = 1.0
+        state[6] = val
+
+@_jit
+def mean_remove(state, val):
+    if val == val:
+        state[0] -= 1.0
+        y = -val - state[4]
+        t = state[1] + y
+        state[4] = t - state[1] - y
+        state[1] = t
+        if np.signbit(val):
+            state[2] -= 1.0
+
+@_jit
+def mean_value(state, minp):
+    nobs = state[0]
+    if nobs >= minp and nobs > 0:
+        result = state[1] / nobs
+        if state[5] >= nobs:
+            result = state[6]
+        elif state[2] == 0 and result < 0:
+            result = 0.0
+        elif state[2] == nobs and result > 0:
+            result = 0.0
+        return result
+    return np.nan
+
+# Estado da variância móvel (roll_var do pandas): nobs, média, soma dos
+# quadrados dos desvios, compensação de adição, compensação de remoção,
+# repetições consecutivas e último valor adicionado
+VAR_STATE_SIZE = 7
+
+@_jit
+def var_reset(state, first_value):
+    state[0] = 0.0
+    state[1] = 0.0
+    state[2] = 0.0
+    state[3] = 0.0
+    state[4] = 0.0
+    state[5] = 0.0
+    state[6] = first_value
+
+@_jit
+def var_add(state, val):
+    if val == val:
+        state[0] += 1.0
+        if val == state[6]:
+            state[5] += 1.0
+        else:
+            state[5] = 1.0
+        state[6] = val
+        prev_mean = state[1] - state[3]
+        y = val - state[3]
+        t = y - state[1]
+        state[3] = t + state[1] - y
+        if state[0] != 0:
+            state[1] = state[1] + t / state[0]
+        else:
+            state[1] = 0.0
+        state[2] = state[2] + (val - prev_mean) * (val - state[1])
+
+@_jit
+def var_remove(state, val):
+    if val == val:
+        state[0] -= 1.0
+        if state[0] != 0:
+            prev_mean = state[1] - state[4]
+            y = val - state[4]
+            t = y - state[1]
+            state[4] = t + state[1] - y
+            state[1] = state[1] - t / state[0]
+            state[2] = state[2] - (val - prev_mean) * (val - state[1])
+        else:
+            state[1] = 0.0
+            state[2] = 0.0
+
+@_jit
+def var_value(state, minp, ddof):
+    nobs = state[0]
+    if nobs >= minp and nobs > ddof:
+        if nobs == 1 or state[5] >= nobs:
+            return 0.0
+        result = state[2] / (nobs - ddof)
+        if result < 0:
+            result = 0.0
+        return result
+    return np.nan
+
+# Estado da média exponencial (ewm do pandas): média ponderada, peso
+# acumulado e nobs
+EWM_STATE_SIZE = 3
+
+@_jit
+def ewm_reset(state):
+    state[0] = np.nan
+    state[1] = 1.0
+    state[2] = 0.0
+
+@_jit
+def ewm_step(state, cur, com, adjust, minp):
+    """Incorpora um valor e retorna a média exponencial corrente."""
+    alpha = 1.0 / (1.0 + com)
+    old_wt_factor = 1.0 - alpha
+    new_wt = 1.0 if adjust else alpha
+    is_observation = cur == cur
+    if is_observation:
+        state[2] += 1.0
+    weighted = state[0]
+    if weighted == weighted:
+        if is_observation:
+            state[1] *= old_wt_factor
+            # Evita erro numérico em séries constantes
+            if weighted != cur:
+                weighted = state[1] * weighted + new_wt * cur
+                weighted /= state[1] + new_wt
+            if adjust:
+                state[1] += new_wt
+            else:
+                state[1] = 1.0
+        else:
+            state[1] *= old_wt_factor
+    elif is_observation:
+        weighted = cur
+    state[0] = weighted
+    return weighted if state[2] >= minp else np.nan
+
+@_jit
+def _ewm_chunk(x, state, com, adjust, minp):
+    out = np.empty(len(x))
+    for i in range(len(x)):
+        out[i] = ewm_step(state, x[i], com, adjust, minp)
+    return out
+
+@_jit
+def _ewm_mean(x, com, adjust, minp):
+    state = np.empty(EWM_STATE_SIZE)
+    ewm_reset(state)
+    return _ewm_chunk(x, state, com, adjust, minp)
+
+# Os laços móveis aceitam retomar um cálculo interrompido: x traz as últimas
+# `skip` barras já processadas seguidas das novas, `count` é a posição global
+# de x[skip] e `state` é o estado deixado pelo bloco anterior. Com
+# skip = min(window, count) o resultado é idêntico ao da série inteira.
+
+@_jit
+def _rolling_mean_chunk(x, skip, count, window, minp, state):
+    out = np.empty(len(x) - skip)
+    for i in range(skip, len(x)):
+        g = count + i - skip
+        if g == 0 or window <= 1:
+            # O pandas reinicia o estado quando as janelas não se sobrepõem
+            start = max(i - g, i + 1 - window)
+            mean_reset(state, x[start])
+            for j in range(start, i + 1):
+                mean_add(state, x[j])
+        else:
+            if g >= window:
+                mean_remove(state, x[i - window])
+            mean_add(state, x[i])
+        out[i - skip] = mean_value(state, minp)
+    return out
+
+@_jit
+def _rolling_mean(x, window, minp):
+    state = np.empty(MEAN_STATE_SIZE)
+    return _rolling_mean_chunk(x, 0, 0, window, minp, state)
+
+@_jit
+def _rolling_var_chunk(x, skip, count, window, minp, ddof, state):
+    out = np.empty(len(x) - skip)
+    for i in range(skip, len(x)):
+        g = count + i - skip
+        if g == 0 or window <= 1:
+            start = max(i - g, i + 1 - window)
+            var_reset(state, x[start])
+            for j in range(start, i + 1):
+                var_add(state, x[j])
+        else:
+            if g >= window:
+                var_remove(state, x[i - window])
+            var_add(state, x[i])
+        out[i - skip] = var_value(state, minp, ddof)
+    return out
+
+@_jit
+def _rolling_var(x, window, minp, ddof):
+    state = np.empty(VAR_STATE_SIZE)
+    return _rolling_var_chunk(x, 0, 0, window, minp, ddof, state)
+
+@_jit
+def _rolling_extreme(x, window, minp, is_max):
+    # Fila monotônica de índices: a frente é sempre o extremo da janela
+    n = len(x)
+    out = np.empty(n)
+    queue = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    nobs = 0
+    for i in range(n):
+        val = x[i]
+        if val == val:
+            nobs += 1
+            while tail > head and ((x[queue[tail - 1]] <= val) if is_max else (x[queue[tail - 1]] >= val)):
+                tail -= 1
+            queue[tail] = i
+            tail += 1
+        if i >= window:
+            old = x[i - window]
+            if old == old:
+                nobs -= 1
+            while tail > head and queue[head] <= i - window:
+                head += 1
+        out[i] = x[queue[head]] if nobs >= minp and nobs > 0 and tail > head else np.nan
+    return out
+
+@_jit
+def _block_sum(a, lo, n):
+    # Bloco final da soma par a par do numpy (até 128 elementos)
+    if n < 8:
+        res = 0.0
+        for i in range(lo, lo + n):
+            res += a[i]
+        return res
+    r = a[lo:lo + 8].copy()
+    i = 8
+    while i < n - (n % 8):
+        for j in range(8):
+            r[j] += a[lo + i + j]
+        i += 8
+    res = ((r[0] + r[1]) + (r[2] + r[3])) + ((r[4] + r[5]) + (r[6] + r[7]))
+    while i < n:
+        res += a[lo + i]
+        i += 1
+    return res
+
+@_jit
+def _pairwise_sum(a):
+    # Soma par a par do numpy (add.reduce em float64 contíguo), sem recursão
+    # para que o cache do numba funcione: cada tarefa é (início, tamanho, fase)
+    tasks = np.empty((256, 3), dtype=np.int64)
+    values = np.empty(128)
+    n_tasks = 1
+    n_values = 0
+    tasks[0, 0] = 0
+    tasks[0, 1] = len(a)
+    tasks[0, 2] = 0
+    while n_tasks > 0:
+        n_tasks -= 1
+        lo, n, phase = tasks[n_tasks, 0], tasks[n_tasks, 1], tasks[n_tasks, 2]
+        if n <= 128:
+            values[n_values] = _block_sum(a, lo, n)
+            n_values += 1
+        elif phase == 0:
+            n2 = n // 2
+            n2 -= n2 % 8
+            tasks[n_tasks, 2] = 1
+            tasks[n_tasks + 1, 0] = lo + n2
+            tasks[n_tasks + 1, 1] = n - n2
+            tasks[n_tasks + 1, 2] = 0
+            tasks[n_tasks + 2, 0] = lo
+            tasks[n_tasks + 2, 1] = n2
+            tasks[n_tasks + 2, 2] = 0
+            n_tasks += 3
+        else:
+            n_values -= 1
+            values[n_values - 1] = values[n_values - 1] + values[n_values]
+    return values[0]
+
+@_jit
+def _nanmean(x):
+    filled = np.where(np.isnan(x), 0.0, x)
+    count = len(x) - np.isnan(x).sum()
+    if count == 0:
+        return np.nan
+    return _pairwise_sum(filled) / count
+
+def ewm_mean(x: np.ndarray, com: float, adjust: bool = True, minp: int = 0) -> np.ndarray:
+    """Equivalente a Series.ewm(com=com, adjust=adjust, min_periods=minp).mean()."""
+    minp = max(int(minp), 1)
+    if NUMBA_AVAILABLE:
+        return _ewm_mean(x, float(com), adjust, minp)
+    return pd.Series(x).ewm(com=com, adjust=adjust, min_periods=minp).mean().to_numpy()
+
+def rolling_mean(x: np.ndarray, window: int, minp: int = None) -> np.ndarray:
+    """Equivalente a Series.rolling(window, min_periods=minp).mean()."""
+    minp = window if minp is None else minp
+    if NUMBA_AVAILABLE:
+        return _rolling_mean(x, window, minp)
+    return pd.Series(x).rolling(window, min_periods=minp).mean().to_numpy()
+
+def rolling_var(x: np.ndarray, window: int, minp: int = None, ddof: int = 1) -> np.ndarray:
+    """Equivalente a Series.rolling(window, min_periods=minp).var(ddof)."""
+    minp = window if minp is None else minp
+    if NUMBA_AVAILABLE:
+        return _rolling_var(x, window, minp, ddof)
+    return pd.Series(x).rolling(window, min_periods=minp).var(ddof).to_numpy()
+
+def rolling_min(x: np.ndarray, window: int, minp: int = None) -> np.ndarray:
+    """Equivalente a Series.rolling(window, min_periods=minp).min()."""
+    minp = window if minp is None else minp
+    if NUMBA_AVAILABLE:
+        return _rolling_extreme(x, window, minp, False)
+    return pd.Series(x).rolling(window, min_periods=minp).min().to_numpy()
+
+def rolling_max(x: np.ndarray, window: int, minp: int = None) -> np.ndarray:
+    """Equivalente a Series.rolling(window, min_periods=minp).max()."""
+    minp = window if minp is None else minp
+    if NUMBA_AVAILABLE:
+        return _rolling_extreme(x, window, minp, True)
+    return pd.Series(x).rolling(window, min_periods=minp).max().to_numpy()
+
+def ewm_mean_resume(x: np.ndarray, state: np.ndarray, com: float, adjust: bool = True,
+                    minp: int = 0) -> np.ndarray:
+    """Continua ewm_mean a partir do estado (EWM_STATE_SIZE) deixado pelo bloco anterior."""
+    return _ewm_chunk(x, state, float(com), adjust, max(int(minp), 1))
+
+def rolling_mean_resume(x: np.ndarray, skip: int, count: int, window: int, minp: int,
+                        state: np.ndarray) -> np.ndarray:
+    """Continua rolling_mean; x começa pelas últimas min(window, count) barras já vistas."""
+    return _rolling_mean_chunk(x, skip, count, window, minp, state)
+
+def rolling_var_resume(x: np.ndarray, skip: int, count: int, window: int, minp: int,
+                       ddof: int, state: np.ndarray) -> np.ndarray:
+    """Continua rolling_var; x começa pelas últimas min(window, count) barras já vistas."""
+    return _rolling_var_chunk(x, skip, count, window, minp, ddof, state)
+
+def rolling_extreme_resume(x: np.ndarray, skip: int, window: int, is_max: bool) -> np.ndarray:
+    """
+    Continua rolling_min/rolling_max; x começa pelas últimas
+    min(window - 1, barras vistas) barras já vistas.
+    """
+    if NUMBA_AVAILABLE:
+        out = _rolling_extreme(x, window, window, is_max)
+    else:
+        rolling = pd.Series(x).rolling(window, min_periods=window)
+        out = (rolling.max() if is_max else rolling.min()).to_numpy()
+    return out[skip:]
+
+def nanmean(x: np.ndarray) -> float:
+    """Equivalente a Series.mean() (ignora NaN)."""
+    if NUMBA_AVAILABLE:
+        return _nanmean(x)
+    return pd.Series(x).mean()
+
+def first_valid(x: np.ndarray) -> int:
+    """Posição do primeiro valor não-NaN, ou len(x) se não houver."""
+    valid = np.flatnonzero(~np.isnan(x))
+    return int(valid[0]) if len(valid) else len(x)
+
+def non_zero_range(high: np.ndarray, low: np.ndarray) -> np.ndarray:
+    """Diferença high - low, deslocada por épsilon se algum valor for zero."""
+    diff = high - low
+    if (diff == 0).any():
+        diff += EPSILON
+    return diff
+
+def rma(x: np.ndarray, length: int) -> np.ndarray:
+    """Média móvel de Wilder (ewm com alpha = 1/length)."""
+    alpha = 1.0 / length
+    return ewm_mean(x, 1.0 / alpha - 1.0, adjust=True, minp=length)
+
+def ema(x: np.ndarray, length: int) -> np.ndarray:
+    """Média exponencial semeada pela média simples das primeiras barras."""
+    if len(x) < length:
+        return np.full(len(x), np.nan)
+    seeded = x.astype(np.float64, copy=True)
+    sma_nth = nanmean(seeded[:length])
+    seeded[:length - 1] = np.nan
+    seeded[length - 1] = sma_nth
+    return ewm_mean(seeded, (length - 1) / 2.0, adjust=False)
+
+def sma(x: np.ndarray, length: int) -> np.ndarray:
+    """Média móvel simples."""
+    return rolling_mean(x, length)
+
+def price_changes(close: np.ndarray):
+    """
+    Variações de fechamento separadas em altas e baixas, como no RSI.
+    
+    Returns:
+        Tupla (altas, baixas); a primeira barra é NaN
+    """
+    negative = np.empty(len(close))
+    negative[0] = np.nan
+    np.subtract(close[1:], close[:-1], out=negative[1:])
+    positive = negative.copy()
+    positive[positive < 0] = 0
+    negative[negative > 0] = 0
+    return positive, negative
+
+def rsi_from_changes(positive: np.ndarray, negative: np.ndarray, length: int) -> np.ndarray:
+    """RSI a partir das altas e baixas de price_changes."""
+    positive_avg = rma(positive, length)
+    negative_avg = rma(negative, length)
+    return 100.0 * positive_avg / (positive_avg + np.abs(negative_avg))
+
+def rsi(close: np.ndarray, length: int = 14) -> np.ndarray:
+    """Índice de força relativa."""
+    if len(close) < length:
+        return np.full(len(close), np.nan)
+    return rsi_from_changes(*price_changes(close), length)
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9):
+    """
+    MACD, linha de sinal e histograma.
+    
+    Returns:
+        Tupla (macd, sinal, histograma)
+    """
+    if slow < fast:
+        fast, slow = slow, fast
+    n = len(close)
+    if n < max(fast, slow, signal):
+        nan = np.full(n, np.nan)
+        return nan, nan.copy(), nan.copy()
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = signal_ema(line, signal)
+    return line, signal_line, line - signal_line
+
+def signal_ema(line: np.ndarray, signal: int) -> np.ndarray:
+    """Linha de sinal: média exponencial do MACD a partir do primeiro valor válido."""
+    signal_line = np.full(len(line), np.nan)
+    start = first_valid(line)
+    if start < len(line):
+        signal_line[start:] = ema(line[start:], signal)
+    return signal_line
+
+def shifted_sma(x: np.ndarray, length: int) -> np.ndarray:
+    """Média simples calculada a partir do primeiro valor válido da série."""
+    out = np.full(len(x), np.nan)
+    start = first_valid(x)
+    if start < len(x):
+        out[start:] = rolling_mean(x[start:], length)
+    return out
+
+def stochastic(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+               k: int = 14, d: int = 3, smooth_k: int = 3):
+    """
+    Oscilador estocástico lento.
+    
+    Returns:
+        Tupla (%K, %D)
+    """
+    n = len(close)
+    if n < max(k, d, smooth_k):
+        nan = np.full(n, np.nan)
+        return nan, nan.copy()
+    stoch_k = shifted_sma(raw_stochastic(high, low, close, k), smooth_k)
+    stoch_d = shifted_sma(stoch_k, d)
+    return stoch_k, stoch_d
+
+def raw_stochastic(high: np.ndarray, low: np.ndarray, close: np.ndarray, k: int) -> np.ndarray:
+    """Estocástico rápido (posição do fechamento na faixa das últimas k barras)."""
+    lowest_low = rolling_min(low, k)
+    highest_high = rolling_max(high, k)
+    stoch = 100 * (close - lowest_low)
+    stoch /= non_zero_range(highest_high, lowest_low)
+    return stoch
+
+def bollinger_bands(close: np.ndarray, length: int = 20, std: float = 2.0, ddof: int = 0):
+    """
+    Bandas de Bollinger.
+    
+    Returns:
+        Tupla (superior, média, inferior)
+    """
+    n = len(close)
+    if n < length:
+        nan = np.full(n, np.nan)
+        return nan, nan.copy(), nan.copy()
+    deviations = float(std) * np.sqrt(rolling_var(close, length, ddof=ddof))
+    middle = rolling_mean(close, length)
+    return middle + deviations, middle, middle - deviations
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Amplitude verdadeira; a primeira barra é NaN."""
+    prev_close = np.empty(len(close))
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    ranges = np.abs(np.vstack([non_zero_range(high, low), high - prev_close, prev_close - low]))
+    # Máximo ignorando NaN, como DataFrame.max(axis=1)
+    all_nan = np.isnan(ranges).all(axis=0)
+    tr = np.where(np.isnan(ranges), -np.inf, ranges).max(axis=0)
+    tr[all_nan] = np.nan
+    tr[:1] = np.nan
+    return tr
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int = 14) -> np.ndarray:
+    """Average True Range (média de Wilder da amplitude verdadeira)."""
+    if len(close) < length:
+        return np.full(len(close), np.nan)
+    return rma(true_range(high, low, close), length)
@@ -0,0 +1,100 @@
+"""
+Cálculo de indicadores sobre painéis de vários símbolos (barras x símbolos).
+
+Os painéis são DataFrames alinhados por data, com uma coluna por símbolo.
+Cada símbolo é calculado pelos mesmos kernels nativos do motor de
+indicadores, apenas sobre as suas barras válidas: barras ausentes (NaN em
+máxima, mínima ou fechamento) são removidas antes do cálculo e voltam como
+NaN na saída, de modo que cada coluna é idêntica ao cálculo do símbolo
+isolado sem as lacunas. Os kernels liberam o GIL, então os símbolos são
+distribuídos entre threads.
+"""
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+from .engine import INDICATOR_COLUMNS, DEFAULT_PARAMS, _WRITERS
+
+PANEL_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+def align_panel(frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Alinha DataFrames por símbolo (ex: saída de fetch_many) em painéis.
+    
+    Args:
+        frames: DataFrame OHLCV por símbolo
+    
+    Returns:
+        Painel barras x símbolos por campo OHLCV, sobre a união das datas
+    """
+    return {
+        field: pd.DataFrame({symbol: df[field] for symbol, df in frames.items() if field in df.columns})
+        for field in PANEL_FIELDS
+    }
+
+def _symbol_block(high, low, close, out, indicators, kwargs):
+    """Calcula os indicadores de um símbolo e grava em out (campos x barras)."""
+    valid = ~(np.isnan(high) | np.isnan(low) | np.isnan(close))
+    if not valid.any():
+        return
+    if not valid.all():
+        high, low, close = high[valid], low[valid], close[valid]
+    
+    block = np.empty((len(close), out.shape[0]), order='F')
+    offset = 0
+    for name in indicators:
+        width = len(INDICATOR_COLUMNS[name])
+        _WRITERS['native'][name](high, low, close, block[:, offset:offset + width], **kwargs[name])
+        offset += width
+    out[:, valid] = block.T
+
+def compute_panel(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame,
+                  indicators: Optional[Iterable[str]] = None,
+                  params: Optional[Dict[str, Dict]] = None,
+                  max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Calcula os indicadores de todos os símbolos de um painel.
+    
+    Args:
+        high: Painel de máximas (barras x símbolos)
+        low: Painel de mínimas, alinhado a high
+        close: Painel de fechamentos, alinhado a high
+        indicators: Indicadores a calcular (padrão: todos de INDICATOR_COLUMNS)
+        params: Parâmetros por indicador, sobrescrevem DEFAULT_PARAMS
+        max_workers: Threads de cálculo (padrão: número de CPUs)
+    
+    Returns:
+        Painel barras x símbolos por coluna de indicador (ex: 'RSI', 'MACD')
+    """
+    indicators = list(INDICATOR_COLUMNS if indicators is None else indicators)
+    unknown = [name for name in indicators if name not in INDICATOR_COLUMNS]
+    if unknown:
+        raise ValueError(f"Indicadores desconhecidos: {unknown}")
+    if not (high.shape == low.shape == close.shape):
+        raise ValueError("Painéis de máxima, mínima e fechamento devem ter o mesmo formato")
+    
+    kwargs = {name: dict(DEFAULT_PARAMS[name], **(params or {}).get(name, {})) for name in indicators}
+    columns = [col for name in indicators for col in INDICATOR_COLUMNS[name]]
+    
+    # Ordem Fortran: a série de cada símbolo é contígua, como nos kernels
+    h, l, c = (panel.to_numpy(dtype=np.float64).copy(order='F') for panel in (high, low, close))
+    n_bars, n_symbols = c.shape
+    # Saída campos x símbolos x barras: cada (campo, símbolo) é contíguo
+    out = np.full((len(columns), n_symbols, n_bars), np.nan)
+    
+    def run(j):
+        _symbol_block(h[:, j], l[:, j], c[:, j], out[:, j, :], indicators, kwargs)
+    
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or n_symbols <= 1:
+        for j in range(n_symbols):
+            run(j)
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, n_symbols)) as pool:
+            list(pool.map(run, range(n_symbols)))
+    
+    return {
+        col: pd.DataFrame(out[k].T, index=close.index, columns=close.columns)
+        for k, col in enumerate(columns)
+    }
@@ -0,0 +1,301 @@
+"""
+Registro declarativo de indicadores com avaliação sob demanda.
+
+Cada indicador é um nó que declara suas entradas (colunas OHLCV ou outros
+nós, com parâmetros) e as colunas que produz. O consumidor pede apenas as
+colunas de que precisa; somente o subgrafo de dependências dessas colunas é
+calculado, e cada nó (ex: a média exponencial de 26 barras ou a amplitude
+verdadeira) é calculado uma única vez por chamada, mesmo quando compartilhado
+por vários indicadores. Os resultados passam pelo cache padrão de
+utils.indicator_cache.
+
+As colunas dos cinco indicadores do motor são idênticas bit a bit às de
+compute_indicators (backend nativo).
+"""
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Iterable, List, Optional
+from . import kernels
+from .base import validate_columns
+from .engine import DEFAULT_PARAMS
+from ..indicator_cache import params_key, get_indicator_cache
+
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+class Indicator:
+    """
+    Nó do grafo de indicadores.
+    
+    Args:
+        name: Nome do nó
+        inputs: Entradas do nó: nomes de colunas OHLCV ou pares (nó, parâmetros);
+            pode ser uma função dos parâmetros do nó
+        outputs: Colunas produzidas; vazio para nós intermediários
+        compute: Função que recebe as entradas (os nós contribuem com todas
+            as suas saídas, em ordem) e os parâmetros, e retorna a tupla de saídas
+        params: Parâmetros padrão
+    """
+    
+    def __init__(self, name: str, inputs, outputs: List[str], compute: Callable,
+                 params: Optional[Dict] = None):
+        self.name = name
+        self.inputs = inputs
+        self.outputs = list(outputs)
+        self.compute = compute
+        self.params = dict(params or {})
+    
+    def resolve_inputs(self, params: Dict) -> list:
+        """Entradas do nó para os parâmetros dados."""
+        return self.inputs(params) if callable(self.inputs) else list(self.inputs)
+
+REGISTRY: Dict[str, Indicator] = {}
+COLUMN_SOURCES: Dict[str, str] = {}
+
+def register(indicator: Indicator) -> Indicator:
+    """
+    Adiciona um nó ao registro.
+    
+    Args:
+        indicator: Nó a registrar; suas colunas não podem pertencer a outro nó
+    """
+    taken = [col for col in indicator.outputs if COLUMN_SOURCES.get(col, indicator.name) != indicator.name]
+    if taken:
+        raise ValueError(f"Colunas já registradas por outro indicador: {taken}")
+    REGISTRY[indicator.name] = indicator
+    for col in indicator.outputs:
+        COLUMN_SOURCES[col] = indicator.name
+    return indicator
+
+def _nan(n: int) -> np.ndarray:
+    return np.full(n, np.nan)
+
+def _shifted(values: np.ndarray) -> np.ndarray:
+    """Série deslocada de uma barra (equivalente a shift(1))."""
+    out = np.empty(len(values))
+    out[:1] = np.nan
+    out[1:] = values[:-1]
+    return out
+
+def _ema(close, length):
+    return (kernels.ema(close, length),)
+
+def _price_changes(close):
+    return kernels.price_changes(close) if len(close) else (_nan(0), _nan(0))
+
+def _rsi(positive, negative, length):
+    if len(positive) < length:
+        rsi = _nan(len(positive))
+    else:
+        rsi = kernels.rsi_from_changes(positive, negative, length)
+    return rsi, _shifted(rsi)
+
+def _raw_stochastic(high, low, close, k):
+    return (kernels.raw_stochastic(high, low, close, k),)
+
+def _stochastic(raw, k, d, smooth_k):
+    if len(raw) < max(k, d, smooth_k):
+        stoch_k, stoch_d = _nan(len(raw)), _nan(len(raw))
+    else:
+        stoch_k = kernels.shifted_sma(raw, smooth_k)
+        stoch_d = kernels.shifted_sma(stoch_k, d)
+    return stoch_k, stoch_d, _shifted(stoch_k), _shifted(stoch_d)
+
+def _macd_inputs(params):
+    fast, slow = sorted((params['fast'], params['slow']))
+    return [('ema', {'length': fast}), ('ema', {'length': slow})]
+
+def _macd(ema_fast, ema_slow, fast, slow, signal):
+    n = len(ema_fast)
+    if n < max(fast, slow, signal):
+        line, signal_line = _nan(n), _nan(n)
+    else:
+        line = ema_fast - ema_slow
+        signal_line = kernels.signal_ema(line, signal)
+    return line, signal_line, line - signal_line, _shifted(line)
+
+def _bollinger(close, length, std):
+    upper, middle, lower = kernels.bollinger_bands(close, length, std)
+    width = upper - lower
+    pct = (close - lower) / width
+    return upper, middle, lower, width / middle, pct
+
+def _true_range(high, low, close):
+    return (kernels.true_range(high, low, close) if len(close) else _nan(0),)
+
+def _atr(tr, close, length):
+    if len(close) < length:
+        atr = _nan(len(close))
+    else:
+        atr = kernels.rma(tr, length)
+    return atr, atr / close * 100, kernels.rolling_mean(atr, length)
+
+def _sma_20(close):
+    return (kernels.sma(close, 20),)
+
+def _identity(values):
+    return (values,)
+
+def _obv(close, volume):
+    # Mesma regra do pandas_ta: a primeira barra conta como alta
+    sign = np.empty(len(close))
+    sign[:1] = 1.0
+    sign[1:] = np.sign(close[1:] - close[:-1])
+    signed_volume = sign * volume
+    obv = np.nancumsum(signed_volume)
+    obv[np.isnan(signed_volume)] = np.nan
+    return (obv,)
+
+def _mfi(high, low, close, volume, length):
+    typical_price = (high + low + close) / 3
+    money_flow = typical_price * volume
+    diff = np.empty(len(close))
+    diff[:1] = np.nan
+    diff[1:] = typical_price[1:] - typical_price[:-1]
+    positive = pd.Series(np.where(diff > 0, money_flow, 0.0)).rolling(length).sum().to_numpy()
+    negative = pd.Series(np.where(diff < 0, money_flow, 0.0)).rolling(length).sum().to_numpy()
+    return (100 * positive / (positive + negative),)
+
+# Intermediários compartilhados
+register(Indicator('ema', ['Close'], [], _ema, {'length': 20}))
+register(Indicator('price_changes', ['Close'], [], _price_changes))
+register(Indicator('raw_stochastic', ['High', 'Low', 'Close'], [], _raw_stochastic, {'k': 14}))
+register(Indicator('true_range', ['High', 'Low', 'Close'], [], _true_range))
+
+# Indicadores do motor (mesmas colunas e parâmetros padrão de compute_indicators)
+register(Indicator('stochastic', lambda p: [('raw_stochastic', {'k': p['k']})],
+                   ['STOCH_K', 'STOCH_D', 'STOCH_K_PREV', 'STOCH_D_PREV'],
+                   _stochastic, DEFAULT_PARAMS['stochastic']))
+register(Indicator('rsi', [('price_changes', {})], ['RSI', 'RSI_PREV'], _rsi,
+                   DEFAULT_PARAMS['rsi']))
+register(Indicator('macd', _macd_inputs, ['MACD', 'MACD_SIGNAL', 'MACD_HIST', 'MACD_PREV'],
+                   _macd, DEFAULT_PARAMS['macd']))
+register(Indicator('bollinger', ['Close'], ['BB_UPPER', 'BB_MIDDLE', 'BB_LOWER', 'BB_WIDTH', 'BB_PCT'],
+                   _bollinger, DEFAULT_PARAMS['bollinger']))
+register(Indicator('atr', [('true_range', {}), 'Close'], ['ATR', 'ATR_PCT', 'ATR_MA'], _atr,
+                   DEFAULT_PARAMS['atr']))
+
+# Colunas adicionais do módulo utils/indicators.py
+register(Indicator('sma_20', ['Close'], ['SMA_20'], _sma_20))
+register(Indicator('ema_20', [('ema', {'length': 20})], ['EMA_20'], _identity))
+register(Indicator('obv', ['Close', 'Volume'], ['OBV'], _obv))
+register(Indicator('mfi', ['High', 'Low', 'Close', 'Volume'], ['MFI'], _mfi, {'length': 14}))
+
+def required_nodes(columns: Iterable[str], params: Optional[Dict[str, Dict]] = None) -> List[tuple]:
+    """
+    Subgrafo necessário para as colunas pedidas, em ordem de cálculo.
+    
+    Args:
+        columns: Colunas desejadas
+        params: Parâmetros por indicador, ex: {'rsi': {'length': 14}}
+    
+    Returns:
+        Lista de pares (nó, parâmetros), dependências antes dos dependentes
+    """
+    unknown = [col for col in columns if col not in COLUMN_SOURCES]
+    if unknown:
+        raise ValueError(f"Colunas desconhecidas: {unknown}")
+    
+    order, seen = [], set()
+    
+    def visit(name, overrides):
+        node = REGISTRY[name]
+        node_params = dict(node.params, **overrides)
+        key = (name, params_key(node_params))
+        if key in seen:
+            return
+        seen.add(key)
+        for ref in node.resolve_inputs(node_params):
+            if not isinstance(ref, str):
+                visit(*ref)
+        order.append((name, node_params))
+    
+    for name in dict.fromkeys(COLUMN_SOURCES[col] for col in columns):
+        visit(name, (params or {}).get(name, {}))
+    return order
+
+def compute_columns(df: pd.DataFrame, columns: Iterable[str],
+                    params: Optional[Dict[str, Dict]] = None) -> pd.DataFrame:
+    """
+    Calcula apenas as colunas pedidas e suas dependências.
+    
+    Args:
+        df: DataFrame com colunas Open, High, Low, Close e Volume
+        columns: Colunas de indicadores desejadas, ex: ['RSI', 'MACD']
+        params: Parâmetros por indicador, ex: {'rsi': {'length': 14}}
+    
+    Returns:
+        Novo DataFrame com as colunas originais e as pedidas
+    """
+    validate_columns(df)
+    columns = list(dict.fromkeys(columns))
+    try:
+        plan = required_nodes(columns, params)
+        fields = {}
+        
+        def field(name):
+            if name not in fields:
+                fields[name] = df[name].to_numpy(dtype=np.float64)
+            return fields[name]
+        
+        cache = get_indicator_cache()
+        digests = {}
+        values = {}
+        for name, node_params in plan:
+            node = REGISTRY[name]
+            refs = node.resolve_inputs(node_params)
+            args = []
+            for ref in refs:
+                if isinstance(ref, str):
+                    args.append(field(ref))
+                else:
+                    ref_name, overrides = ref
+                    ref_params = dict(REGISTRY[ref_name].params, **overrides)
+                    args.extend(values[(ref_name, params_key(ref_params))])
+            
+            key = (name, params_key(node_params))
+            cached = None
+            if cache is not None:
+                # Endereçado pelas colunas OHLCV de que o nó depende, direta ou indiretamente
+                used = tuple(_fields_used(name, node_params))
+                if used not in digests:
+                    digests[used] = cache.digest(df.index, *(df[col] for col in used))
+                cache_key = (digests[used], 'registry') + key
+                cached = cache.get(cache_key)
+            if cached is None:
+                cached = tuple(node.compute(*args, **node_params))
+                if cache is not None:
+                    for array in cached:
+                        array.setflags(write=False)
+                    cache.put(cache_key, cached, sum(array.nbytes for array in cached))
+            values[key] = cached
+        
+        result = {}
+        for name, node_params in plan:
+            node = REGISTRY[name]
+            for col, array in zip(node.outputs, values[(name, params_key(node_params))]):
+                if col in columns:
+                    result[col] = array
+        
+        df = df.drop(columns=[col for col in columns if col in df.columns])
+        # Sem cópia: cada coluna aponta para o array calculado ou em cache (somente leitura)
+        series = [pd.Series(result[col], index=df.index, name=col, copy=False) for col in columns]
+        return pd.concat([df] + series, axis=1, copy=False)
+    
+    except Exception as e:
+        raise Exception(f"Erro ao calcular indicadores: {str(e)}")
+
+def _fields_used(name: str, params: Dict) -> List[str]:
+    """Colunas OHLCV lidas pelo nó e suas dependências, na ordem de FIELDS."""
+    used = set()
+    
+    def visit(node_name, node_params):
+        node = REGISTRY[node_name]
+        for ref in node.resolve_inputs(node_params):
+            if isinstance(ref, str):
+                used.add(ref)
+            else:
+                ref_name, overrides = ref
+                visit(ref_name, dict(REGISTRY[ref_name].params, **overrides))
+    
+    visit(name, params)
+    return [col for col in FIELDS if col in used]
@@ -0,0 +1,344 @@
+"""
+Indicadores incrementais: custo O(1) por barra, para alimentação ao vivo.
+
+Cada objeto recebe uma barra por vez em update() e expõe os valores atuais em
+snapshot(). Os passos de atualização são os mesmos dos kernels em lote
+(kernels.py), de modo que o valor após a barra t é idêntico bit a bit ao da
+linha t do cálculo em lote. A única exceção é a regra do pandas_ta que soma
+épsilon a todas as amplitudes quando alguma é zero (Stochastic e ATR): o
+fluxo só passa a somá-lo a partir da primeira amplitude zero, e a diferença
+anterior é da ordem do épsilon.
+"""
+import math
+import numpy as np
+from collections import deque
+from typing import Dict, Optional
+from . import kernels
+from .engine import DEFAULT_PARAMS, INDICATOR_COLUMNS
+
+NAN = float('nan')
+
+def _field(bar, name: str) -> float:
+    """Lê um campo da barra em formato do projeto (High) ou do MT5 (high)."""
+    try:
+        return float(bar[name])
+    except (KeyError, ValueError, IndexError):
+        return float(bar[name.lower()])
+
+def _divide(a: float, b: float) -> float:
+    """Divisão com a semântica do numpy (inf ou NaN em vez de ZeroDivisionError)."""
+    if b == 0:
+        if a == 0 or a != a:
+            return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+class RollingMean:
+    """Média móvel simples incremental (mesmo algoritmo de rolling().mean())."""
+    
+    def __init__(self, window: int, minp: Optional[int] = None):
+        self.window = window
+        self.minp = window if minp is None else minp
+        self._state = np.empty(kernels.MEAN_STATE_SIZE)
+        self._values = deque(maxlen=window)
+        self.value = NAN
+    
+    def update(self, x: float) -> float:
+        if not self._values or self.window <= 1:
+            kernels.mean_reset(self._state, x)
+        elif len(self._values) == self.window:
+            kernels.mean_remove(self._state, self._values[0])
+        kernels.mean_add(self._state, x)
+        self._values.append(x)
+        self.value = kernels.mean_value(self._state, self.minp)
+        return self.value
+
+class RollingVar:
+    """Variância móvel incremental por Welford (mesmo algoritmo de rolling().var())."""
+    
+    def __init__(self, window: int, minp: Optional[int] = None, ddof: int = 1):
+        self.window = window
+        self.minp = window if minp is None else minp
+        self.ddof = ddof
+        self._state = np.empty(kernels.VAR_STATE_SIZE)
+        self._values = deque(maxlen=window)
+        self.value = NAN
+    
+    def update(self, x: float) -> float:
+        if not self._values or self.window <= 1:
+            kernels.var_reset(self._state, x)
+        elif len(self._values) == self.window:
+            kernels.var_remove(self._state, self._values[0])
+        kernels.var_add(self._state, x)
+        self._values.append(x)
+        self.value = kernels.var_value(self._state, self.minp, self.ddof)
+        return self.value
+
+class RollingExtreme:
+    """Mínimo ou máximo móvel por fila monotônica."""
+    
+    def __init__(self, window: int, is_max: bool):
+        self.window = window
+        self.is_max = is_max
+        self._queue = deque()
+        self._nan_flags = deque(maxlen=window)
+        self._nobs = 0
+        self._count = 0
+        self.value = NAN
+    
+    def update(self, x: float) -> float:
+        i = self._count
+        self._count += 1
+        if len(self._nan_flags) == self.window and not self._nan_flags[0]:
+            self._nobs -= 1
+        self._nan_flags.append(x != x)
+        
+        if x == x:
+            self._nobs += 1
+            while self._queue and ((self._queue[-1][1] <= x) if self.is_max else (self._queue[-1][1] >= x)):
+                self._queue.pop()
+            self._queue.append((i, x))
+        while self._queue and self._queue[0][0] <= i - self.window:
+            self._queue.popleft()
+        
+        self.value = self._queue[0][1] if self._nobs >= self.window and self._queue else NAN
+        return self.value
+
+class EWM:
+    """Média exponencial incremental (mesmo algoritmo de ewm().mean())."""
+    
+    def __init__(self, com: float, adjust: bool = True, minp: int = 0):
+        self.com = float(com)
+        self.adjust = adjust
+        self.minp = max(int(minp), 1)
+        self._state = np.empty(kernels.EWM_STATE_SIZE)
+        kernels.ewm_reset(self._state)
+        self.value = NAN
+    
+    def update(self, x: float) -> float:
+        self.value = kernels.ewm_step(self._state, x, self.com, self.adjust, self.minp)
+        return self.value
+
+class StreamingEMA:
+    """EMA semeada pela média simples das primeiras `length` barras."""
+    
+    def __init__(self, length: int):
+        self.length = length
+        self._seed = []
+        self._ewm = EWM((length - 1) / 2.0, adjust=False)
+        self.value = NAN
+    
+    def update(self, x: float) -> float:
+        if self._seed is not None:
+            self._seed.append(x)
+            if len(self._seed) < self.length:
+                return self.value
+            x = kernels.nanmean(np.array(self._seed))
+            self._seed = None
+        self.value = self._ewm.update(x)
+        return self.value
+    
+    def snapshot(self) -> Dict[str, float]:
+        return {'EMA': self.value}
+
+class StreamingRSI:
+    """RSI com médias de Wilder."""
+    
+    def __init__(self, length: int = 7):
+        alpha = 1.0 / length
+        self._positive = EWM(1.0 / alpha - 1.0, adjust=True, minp=length)
+        self._negative = EWM(1.0 / alpha - 1.0, adjust=True, minp=length)
+        self._prev_close = NAN
+        self.value = NAN
+        self.prev = NAN
+    
+    def update(self, bar) -> float:
+        close = _field(bar, 'Close')
+        diff = close - self._prev_close
+        self._prev_close = close
+        positive_avg = self._positive.update(0.0 if diff < 0 else diff)
+        negative_avg = self._negative.update(0.0 if diff > 0 else diff)
+        self.prev = self.value
+        self.value = _divide(100.0 * positive_avg, positive_avg + abs(negative_avg))
+        return self.value
+    
+    def snapshot(self) -> Dict[str, float]:
+        return {'RSI': self.value, 'RSI_PREV': self.prev}
+
+class StreamingMACD:
+    """MACD com linha de sinal iniciada no primeiro valor válido."""
+    
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        if slow < fast:
+            fast, slow = slow, fast
+        self._fast = StreamingEMA(fast)
+        self._slow = StreamingEMA(slow)
+        self._signal = StreamingEMA(signal)
+        self._started = False
+        self.macd = self.signal = self.hist = self.prev = NAN
+    
+    def update(self, bar) -> float:
+        close = _field(bar, 'Close')
+        line = self._fast.update(close) - self._slow.update(close)
+        self._started = self._started or line == line
+        signal = self._signal.update(line) if self._started else NAN
+        self.prev = self.macd
+        self.macd, self.signal, self.hist = line, signal, line - signal
+        return line
+    
+    def snapshot(self) -> Dict[str, float]:
+        return {'MACD': self.macd, 'MACD_SIGNAL': self.signal,
+                'MACD_HIST': self.hist, 'MACD_PREV': self.prev}
+
+class StreamingStochastic:
+    """Oscilador estocástico lento com mínimo/máximo por fila monotônica."""
+    
+    def __init__(self, k: int = 14, d: int = 3, smooth_k: int = 3):
+        self._lowest = RollingExtreme(k, is_max=False)
+        self._highest = RollingExtreme(k, is_max=True)
+        self._smooth_k = RollingMean(smooth_k)
+        self._smooth_d = RollingMean(d)
+        self._k_started = self._d_started = False
+        self._zero_range = False
+        self.k = self.d = self.k_prev = self.d_prev = NAN
+    
+    def update(self, bar) -> float:
+        lowest = self._lowest.update(_field(bar, 'Low'))
+        highest = self._highest.update(_field(bar, 'High'))
+        value_range = highest - lowest
+        self._zero_range = self._zero_range or value_range == 0
+        if self._zero_range:
+            value_range += kernels.EPSILON
+        stoch = _divide(100 * (_field(bar, 'Close') - lowest), value_range)
+        
+        # Cada média começa no primeiro valor válido da série anterior
+        self._k_started = self._k_started or stoch == stoch
+        stoch_k = self._smooth_k.update(stoch) if self._k_started else NAN
+        self._d_started = self._d_started or stoch_k == stoch_k
+        stoch_d = self._smooth_d.update(stoch_k) if self._d_started else NAN
+        
+        self.k_prev, self.d_prev = self.k, self.d
+        self.k, self.d = stoch_k, stoch_d
+        return stoch_k
+    
+    def snapshot(self) -> Dict[str, float]:
+        return {'STOCH_K': self.k, 'STOCH_D': self.d,
+                'STOCH_K_PREV': self.k_prev, 'STOCH_D_PREV': self.d_prev}
+
+class StreamingBollinger:
+    """Bandas de Bollinger com variância móvel de Welford."""
+    
+    def __init__(self, length: int = 20, std: float = 2.0):
+        self.std = float(std)
+        self._mean = RollingMean(length)
+        self._var = RollingVar(length, ddof=0)
+        self.upper = self.middle = self.lower = self.width = self.pct = NAN
+    
+    def update(self, bar) -> float:
+        close = _field(bar, 'Close')
+        deviation = self.std * math.sqrt(self._var.update(close))
+        middle = self._mean.update(close)
+        self.upper, self.middle, self.lower = middle + deviation, middle, middle - deviation
+        band = self.upper - self.lower
+        self.width = _divide(band, middle)
+        self.pct = _divide(close - self.lower, band)
+        return middle
+    
+    def snapshot(self) -> Dict[str, float]:
+        return {'BB_UPPER': self.upper, 'BB_MIDDLE': self.middle, 'BB_LOWER': self.lower,
+                'BB_WIDTH': self.width, 'BB_PCT': self.pct}
+
+class StreamingATR:
+    """ATR (média de Wilder da amplitude verdadeira) e sua média móvel."""
+    
+    def __init__(self, length: int = 14):
+        alpha = 1.0 / length
+        self._rma = EWM(1.0 / alpha - 1.0, adjust=True, minp=length)
+        self._ma = RollingMean(length)
+        self._prev_close = None
+        self._zero_range = False
+        self.atr = self.pct = self.ma = NAN
+    
+    def update(self, bar) -> float:
+        high, low, close = _field(bar, 'High'), _field(bar, 'Low'), _field(bar, 'Close')
+        bar_range = high - low
+        self._zero_range = self._zero_range or bar_range == 0
+        if self._zero_range:
+            bar_range += kernels.EPSILON
+        
+        if self._prev_close is None:
+            tr = NAN  # A primeira barra não tem fechamento anterior
+        else:
+            ranges = [abs(v) for v in (bar_range, high - self._prev_close, self._prev_close - low)
+                      if v == v]
+            tr = max(ranges) if ranges else NAN
+        self._prev_close = close
+        
+        self.atr = self._rma.update(tr)
+        self.pct = _divide(self.atr, close) * 100
+        self.ma = self._ma.update(self.atr)
+        return self.atr
+    
+    def snapshot(self) -> Dict[str, float]:
+        return {'ATR': self.atr, 'ATR_PCT': self.pct, 'ATR_MA': self.ma}
+
+_STREAMS = {
+    'stochastic': StreamingStochastic,
+    'rsi': StreamingRSI,
+    'macd': StreamingMACD,
+    'bollinger': StreamingBollinger,
+    'atr': StreamingATR
+}
+
+class StreamingIndicators:
+    """
+    Conjunto de indicadores incrementais com as mesmas colunas de compute_indicators.
+    """
+    
+    def __init__(self, indicators=None, params: Optional[Dict[str, Dict]] = None):
+        """
+        Inicializa os indicadores sem histórico.
+        
+        Args:
+            indicators: Indicadores a manter (padrão: todos de INDICATOR_COLUMNS)
+            params: Parâmetros por indicador, sobrescrevem DEFAULT_PARAMS
+        """
+        indicators = list(INDICATOR_COLUMNS if indicators is None else indicators)
+        unknown = [name for name in indicators if name not in _STREAMS]
+        if unknown:
+            raise ValueError(f"Indicadores desconhecidos: {unknown}")
+        self._streams = {
+            name: _STREAMS[name](**dict(DEFAULT_PARAMS[name], **(params or {}).get(name, {})))
+            for name in indicators
+        }
+        self.bars = 0
+    
+    def update(self, bar) -> Dict[str, float]:
+        """
+        Incorpora uma barra fechada.
+        
+        Args:
+            bar: Mapeamento com High, Low e Close (ou registro MT5 com high, low, close)
+        
+        Returns:
+            Valores atuais de todas as colunas
+        """
+        for stream in self._streams.values():
+            stream.update(bar)
+        self.bars += 1
+        return self.snapshot()
+    
+    def warm_up(self, bars) -> Dict[str, float]:
+        """Incorpora uma sequência de barras (ex: array de registros MT5 ou df.to_records())."""
+        for bar in bars:
+            for stream in self._streams.values():
+                stream.update(bar)
+            self.bars += 1
+        return self.snapshot()
+    
+    def snapshot(self) -> Dict[str, float]:
+        """Retorna os valores atuais, na ordem de INDICATOR_COLUMNS."""
+        values = {}
+        for stream in self._streams.values():
+            values.update(stream.snapshot())
+        return values
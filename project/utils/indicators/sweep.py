@@ -0,0 +1,118 @@
+"""
+Cálculo de indicadores para vários conjuntos de parâmetros em uma passada.
+
+Cada função devolve blocos n_barras x n_parâmetros (uma coluna por conjunto
+de parâmetros, na ordem pedida) e reaproveita os passos comuns entre as
+colunas: as variações de preço do RSI, as médias exponenciais e as linhas do
+MACD e o estocástico rápido de cada janela. Cada coluna é idêntica bit a bit
+à chamada correspondente de kernels.rsi, kernels.macd ou kernels.stochastic.
+"""
+import numpy as np
+from typing import Iterable, Tuple
+from . import kernels
+
+def _as_float(x) -> np.ndarray:
+    """Converte a série de entrada para um array float64."""
+    return np.asarray(x, dtype=np.float64)
+
+def _nan_block(n_bars: int, n_params: int) -> np.ndarray:
+    # Ordem Fortran: cada coluna é contígua, como no motor de indicadores
+    return np.full((n_bars, n_params), np.nan, order='F')
+
+def rsi_sweep(close, lengths: Iterable[int]) -> np.ndarray:
+    """
+    RSI para vários períodos de uma só vez.
+    
+    Args:
+        close: Série de fechamentos
+        lengths: Períodos do RSI, ex: range(5, 31)
+    
+    Returns:
+        Bloco n_barras x len(lengths)
+    """
+    close = _as_float(close)
+    lengths = [int(length) for length in lengths]
+    block = _nan_block(len(close), len(lengths))
+    changes = None
+    for j, length in enumerate(lengths):
+        if len(close) < length:
+            continue
+        if changes is None:
+            changes = kernels.price_changes(close)
+        block[:, j] = kernels.rsi_from_changes(*changes, length)
+    return block
+
+def macd_sweep(close, params: Iterable[Tuple[int, int, int]]):
+    """
+    MACD para vários trios (fast, slow, signal) de uma só vez.
+    
+    Cada média exponencial é calculada uma única vez por período e cada
+    linha do MACD uma única vez por par (fast, slow).
+    
+    Args:
+        close: Série de fechamentos
+        params: Trios (fast, slow, signal)
+    
+    Returns:
+        Tupla (macd, sinal, histograma), cada um n_barras x len(params)
+    """
+    close = _as_float(close)
+    params = [tuple(int(value) for value in triple) for triple in params]
+    n = len(close)
+    line_block = _nan_block(n, len(params))
+    signal_block = _nan_block(n, len(params))
+    hist_block = _nan_block(n, len(params))
+    
+    emas = {}
+    lines = {}
+    for j, (fast, slow, signal) in enumerate(params):
+        if slow < fast:
+            fast, slow = slow, fast
+        if n < max(fast, slow, signal):
+            continue
+        if (fast, slow) not in lines:
+            for length in (fast, slow):
+                if length not in emas:
+                    emas[length] = kernels.ema(close, length)
+            lines[(fast, slow)] = emas[fast] - emas[slow]
+        line = lines[(fast, slow)]
+        line_block[:, j] = line
+        signal_block[:, j] = kernels.signal_ema(line, signal)
+        np.subtract(line, signal_block[:, j], out=hist_block[:, j])
+    return line_block, signal_block, hist_block
+
+def stochastic_sweep(high, low, close, params: Iterable[Tuple[int, int, int]]):
+    """
+    Estocástico lento para vários trios (k, d, smooth_k) de uma só vez.
+    
+    O estocástico rápido é calculado uma única vez por k e o %K suavizado
+    uma única vez por par (k, smooth_k).
+    
+    Args:
+        high: Série de máximas
+        low: Série de mínimas
+        close: Série de fechamentos
+        params: Trios (k, d, smooth_k)
+    
+    Returns:
+        Tupla (%K, %D), cada um n_barras x len(params)
+    """
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    params = [tuple(int(value) for value in triple) for triple in params]
+    n = len(close)
+    k_block = _nan_block(n, len(params))
+    d_block = _nan_block(n, len(params))
+    
+    raw = {}
+    smoothed = {}
+    for j, (k, d, smooth_k) in enumerate(params):
+        if n < max(k, d, smooth_k):
+            continue
+        if (k, smooth_k) not in smoothed:
+            if k not in raw:
+                raw[k] = kernels.raw_stochastic(high, low, close, k)
+            smoothed[(k, smooth_k)] = kernels.shifted_sma(raw[k], smooth_k)
+        stoch_k = smoothed[(k, smooth_k)]
+        k_block[:, j] = stoch_k
+        d_block[:, j] = kernels.shifted_sma(stoch_k, d)
+    return k_block, d_block
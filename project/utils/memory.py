@@ -0,0 +1,75 @@
+"""
+Módulo de representação compacta de DataFrames de barras e indicadores.
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict
+from .signals import SIGNAL_DTYPE
+
+# Colunas das fontes que não são usadas pelos indicadores nem pela estratégia
+UNUSED_COLUMNS = ['Dividends', 'Stock Splits', 'Capital Gains', 'spread', 'real_volume']
+
+def compact_frame(df: pd.DataFrame, price_dtype=np.float32) -> pd.DataFrame:
+    """
+    Converte o DataFrame para tipos compactos.
+    
+    Preços e indicadores passam a float32, o volume ao menor inteiro que o
+    comporta, a coluna signal_color a categórica e as colunas não usadas
+    são descartadas.
+    
+    Args:
+        df: DataFrame de barras, com ou sem indicadores
+        price_dtype: Tipo das colunas de ponto flutuante
+    
+    Returns:
+        Novo DataFrame compacto
+    """
+    df = df.drop(columns=[col for col in UNUSED_COLUMNS if col in df.columns])
+    
+    dtypes = {}
+    for col, dtype in df.dtypes.items():
+        if col == 'Volume':
+            continue
+        if col == 'signal_color':
+            dtypes[col] = SIGNAL_DTYPE
+        elif pd.api.types.is_float_dtype(dtype) and dtype != price_dtype:
+            dtypes[col] = price_dtype
+    
+    if 'Volume' in df.columns:
+        volume = df['Volume'].fillna(0)
+        dtypes['Volume'] = np.uint32 if len(volume) == 0 or (
+            volume.min() >= 0 and volume.max() <= np.iinfo(np.uint32).max) else np.int64
+        df['Volume'] = volume
+    
+    return df.astype(dtypes, copy=False)
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """Retorna o tamanho do DataFrame em memória, incluindo índice e objetos."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+def memory_report(frames: Dict[str, pd.DataFrame], price_dtype=np.float32) -> pd.DataFrame:
+    """
+    Compara o uso de memória de cada DataFrame antes e depois da compactação.
+    
+    Args:
+        frames: DataFrame por símbolo
+        price_dtype: Tipo das colunas de ponto flutuante compactadas
+    
+    Returns:
+        DataFrame com barras, bytes e bytes por barra antes e depois, uma
+        linha por símbolo e uma linha de total
+    """
+    rows = {}
+    for symbol, df in frames.items():
+        before = frame_bytes(df)
+        after = frame_bytes(compact_frame(df, price_dtype))
+        rows[symbol] = {'bars': len(df), 'bytes_before': before, 'bytes_after': after}
+    
+    report = pd.DataFrame.from_dict(
+        rows, orient='index', columns=['bars', 'bytes_before', 'bytes_after'])
+    report.loc['total'] = report.sum()
+    bars = report['bars'].where(report['bars'] > 0)
+    report['bytes_per_bar_before'] = report['bytes_before'] / bars
+    report['bytes_per_bar_after'] = report['bytes_after'] / bars
+    report['reduction'] = 1 - report['bytes_after'] / report['bytes_before']
+    return report
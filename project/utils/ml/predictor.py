@@ -2,11 +2,11 @@
 Módulo principal de predição usando XGBoost.
 """
 from sklearn.model_selection import TimeSeriesSplit
-import pandas as pd
 import numpy as np
 from .models.xgboost_model import XGBoostModel
 from .feature_processor import FeatureProcessor
 from .signal_generator import SignalGenerator
+from ..signals import BLACK, signals_from_codes
 
 class MLPredictor:
     def __init__(self):
@@ -76,29 +76,19 @@ class MLPredictor:
                 self.feature_processor.process_features(df)
             )
             
-            signals = pd.Series(index=df.index, data='black')
-            
-            for i in range(len(df)):
-                if i >= len(probabilities):
-                    continue
-                
-                indicators = {
-                    'rsi': df['RSI'].iloc[i],
-                    'rsi_prev': df['RSI_PREV'].iloc[i],
-                    'macd': df['MACD'].iloc[i],
-                    'macd_signal': df['MACD_SIGNAL'].iloc[i],
-                    'macd_prev': df['MACD_PREV'].iloc[i],
-                    'stoch_k': df['STOCH_K'].iloc[i],
-                    'stoch_d': df['STOCH_D'].iloc[i],
-                    'stoch_k_prev': df['STOCH_K_PREV'].iloc[i]
-                }
-                
-                signals.iloc[i] = self.signal_generator.generate_signal(
-                    indicators,
-                    probabilities[i]
-                )
+            # Barras sem probabilidade permanecem 'black'
+            codes = np.full(len(df), BLACK, dtype=np.int8)
+            n = min(len(df), len(probabilities))
+            indicators = {
+                key: df[col].to_numpy()[:n]
+                for key, col in zip(SignalGenerator.INDICATOR_KEYS, SignalGenerator.REQUIRED_COLUMNS)
+            }
+            codes[:n] = self.signal_generator.generate_signals(
+                indicators,
+                np.asarray(probabilities)[:n]
+            )
             
-            return signals
+            return signals_from_codes(codes, df.index)
             
         except Exception as e:
             raise Exception(f"Erro ao gerar sinais: {str(e)}")
\ No newline at end of file
@@ -1,25 +1,43 @@
 """
 Módulo para geração de sinais de trading.
 """
+import numpy as np
 import pandas as pd
+from ..signals import GREEN, RED, BLACK
+from ..rules import Rule, count_rules
 
 class SignalGenerator:
+    # Colunas de indicadores lidas por MLPredictor.get_trading_signals
+    REQUIRED_COLUMNS = ['RSI', 'RSI_PREV', 'MACD', 'MACD_SIGNAL', 'MACD_PREV',
+                        'STOCH_K', 'STOCH_D', 'STOCH_K_PREV']
+    # Chaves de generate_signal correspondentes a REQUIRED_COLUMNS
+    INDICATOR_KEYS = ['rsi', 'rsi_prev', 'macd', 'macd_signal', 'macd_prev',
+                      'stoch_k', 'stoch_d', 'stoch_k_prev']
+    # Condições pontuadas por calculate_score: RSI, MACD e estocástico
+    SCORE_RULES = [
+        Rule('RSI > 40 & RSI > RSI_PREV'),
+        Rule('MACD > MACD_SIGNAL | MACD > MACD_PREV'),
+        Rule('STOCH_K > STOCH_D | STOCH_K > STOCH_K_PREV')
+    ]
+    
     def __init__(self, ml_threshold=0.55, score_threshold=2):
         self.ml_threshold = ml_threshold
         self.score_threshold = score_threshold
-        
+    
     def check_rsi(self, current, previous):
         """Verifica condição do RSI."""
-        return current > 40 and current > previous
-        
+        return bool(self.SCORE_RULES[0].evaluate({'RSI': current, 'RSI_PREV': previous}))
+    
     def check_macd(self, current, signal, previous):
         """Verifica condição do MACD."""
-        return current > signal or current > previous
-        
+        return bool(self.SCORE_RULES[1].evaluate(
+            {'MACD': current, 'MACD_SIGNAL': signal, 'MACD_PREV': previous}))
+    
     def check_stochastic(self, k_current, d_current, k_previous):
         """Verifica condição do Stochastic."""
-        return k_current > d_current or k_current > k_previous
-        
+        return bool(self.SCORE_RULES[2].evaluate(
+            {'STOCH_K': k_current, 'STOCH_D': d_current, 'STOCH_K_PREV': k_previous}))
+    
     def calculate_score(self, indicators):
         """Calcula pontuação dos indicadores técnicos."""
         score = 0
@@ -30,7 +48,7 @@ class SignalGenerator:
         if self.check_stochastic(indicators['stoch_k'], indicators['stoch_d'], indicators['stoch_k_prev']):
             score += 1
         return score
-        
+    
     def generate_signal(self, indicators, ml_probability):
         """Gera sinal de trading baseado nos indicadores e ML."""
         score = self.calculate_score(indicators)
@@ -39,4 +57,31 @@ class SignalGenerator:
             return 'green'
         elif ml_probability < (1 - self.ml_threshold) and score <= 1:
             return 'red'
-        return 'black'
\ No newline at end of file
+        return 'black'
+    
+    def calculate_scores(self, indicators):
+        """Versão vetorizada de calculate_score sobre arrays de indicadores."""
+        data = {col: indicators[key] for col, key in zip(self.REQUIRED_COLUMNS, self.INDICATOR_KEYS)}
+        return count_rules(self.SCORE_RULES, data)
+    
+    def generate_signals(self, indicators, ml_probabilities):
+        """
+        Versão vetorizada de generate_signal para várias barras de uma vez.
+        
+        Args:
+            indicators: Mapeamento com as chaves de generate_signal para arrays
+            ml_probabilities: Probabilidades do modelo, uma por barra
+        
+        Returns:
+            Array int8 de códigos de sinal (GREEN, RED ou BLACK)
+        """
+        score = self.calculate_scores(indicators)
+        probabilities = np.asarray(ml_probabilities)
+        
+        green = (probabilities > self.ml_threshold) & (score >= self.score_threshold)
+        red = ~green & (probabilities < (1 - self.ml_threshold)) & (score <= 1)
+        
+        signals = np.full(len(score), BLACK, dtype=np.int8)
+        signals[red] = RED
+        signals[green] = GREEN
+        return signals
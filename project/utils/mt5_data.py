@@ -1,14 +1,45 @@
 import MetaTrader5 as mt5
+import numpy as np
 import pandas as pd
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
+from .bar_archive import BarArchive, DEFAULT_ARCHIVE_DIR, rates_to_frame
+from .indicators.streaming import StreamingIndicators
+from .memory import compact_frame
+from .resample import IncrementalResampler, TIMEFRAME_SECONDS
+
+# Intervalos intradiários derivados do intervalo base; '1d' é sempre baixado
+# direto (5 anos são ~1.8k barras D1, contra centenas de milhares de M1)
+DERIVED_INTERVALS = ['5m', '15m', '1h']
+# Barras do intervalo base servidas pelo terminal ("Max bars in chart", padrão
+# 100k); janelas maiores que isso baixam o intervalo pedido diretamente
+MAX_BASE_BARS = 100_000
+# Barras fechadas usadas no aquecimento padrão de indicator_snapshot
+WARM_UP_BARS = 5_000
 
 class MT5DataManager:
     """Gerenciador de dados usando MetaTrader5."""
     
-    def __init__(self):
-        """Inicializa o gerenciador com configurações padrão."""
+    def __init__(self, archive_dir: str = DEFAULT_ARCHIVE_DIR, base_interval: Optional[str] = '1m',
+                 compact: bool = False):
+        """
+        Inicializa o gerenciador com configurações padrão.
+        
+        Args:
+            archive_dir: Diretório do arquivo local de barras
+            base_interval: Intervalo baixado do terminal do qual os intradiários
+                maiores (DERIVED_INTERVALS) são derivados, quando a janela cabe
+                em MAX_BASE_BARS barras; None baixa cada intervalo separadamente
+            compact: Se True, retorna as barras em tipos compactos (float32)
+        """
         self._default_symbol = 'BBDC4'  # Símbolo padrão sem .SA
+        self.archive = BarArchive(archive_dir)
+        self.base_interval = base_interval
+        self.compact = compact
+        self._resamplers: Dict[str, IncrementalResampler] = {}
+        self._indicator_streams: Dict[Tuple[str, str], StreamingIndicators] = {}
+        self._stream_times: Dict[Tuple[str, str], int] = {}
+        self._head_checked: Dict[Tuple[str, str], datetime] = {}
         self._valid_periods = {
             "1mo": mt5.TIMEFRAME_D1,
             "3mo": mt5.TIMEFRAME_D1,
@@ -64,11 +95,14 @@ class MT5DataManager:
         """
         Busca dados históricos usando MetaTrader5.
         
+        Apenas as barras que faltam no arquivo local (antes da primeira ou
+        depois da última arquivada) são baixadas; o período é lido do arquivo.
+        
         Args:
             symbol: Símbolo do ativo (formato MT5, ex: BBDC4)
             period: Período de dados ('1mo', '3mo', '6mo', '1y', '2y', '5y')
             interval: Intervalo dos dados ('1d', '1h', '15m', '5m', '1m')
-            
+        
         Returns:
             DataFrame com os dados históricos
         """
@@ -80,42 +114,209 @@ class MT5DataManager:
                 raise ValueError(f"Intervalo inválido: {interval}")
             
             # Calcular datas
-            rates_count = self._get_rates_count(period)
+            date_to = datetime.now()
+            date_from = date_to - timedelta(days=self._get_rates_count(period))
             
             # Buscar dados do MT5
-            rates = mt5.copy_rates_from_pos(symbol, 
-                                          self._valid_intervals[interval],
-                                          0, rates_count)
+            if self._is_derived(interval, date_from, date_to):
+                self.ingest_range(symbol, self.base_interval, date_from, date_to)
+                rates = self.read_resampled(symbol, interval, date_from)
+            else:
+                self.ingest_range(symbol, interval, date_from, date_to)
+                rates = self.read_range(symbol, interval, date_from)
             
-            if rates is None or len(rates) == 0:
+            if len(rates) == 0:
                 raise ValueError(f"Não há dados disponíveis para {symbol}")
             
             # Converter para DataFrame
-            df = pd.DataFrame(rates)
-            df['time'] = pd.to_datetime(df['time'], unit='s')
-            df.set_index('time', inplace=True)
-            
-            # Renomear colunas para manter compatibilidade
-            df.rename(columns={
-                'open': 'Open',
-                'high': 'High',
-                'low': 'Low',
-                'close': 'Close',
-                'tick_volume': 'Volume'
-            }, inplace=True)
-            
-            return df
+            df = rates_to_frame(rates)
+            return compact_frame(df) if self.compact else df
         
         except Exception as e:
             raise Exception(f"Erro ao buscar dados para {symbol}: {str(e)}")
     
+    def ingest_range(self, symbol: str, interval: str, date_from: datetime, date_to: datetime,
+                     chunk: timedelta = timedelta(days=30)) -> int:
+        """
+        Baixa barras em blocos com copy_rates_range e grava no arquivo local.
+        
+        Só o que falta no arquivo é baixado: o trecho anterior à primeira
+        barra arquivada (quando o período pedido começa antes dela) e o
+        posterior à última. Chamadas repetidas só trazem barras novas. Os
+        arrays retornados pelo MT5 são gravados diretamente, sem conversão
+        para DataFrame.
+        
+        Args:
+            symbol: Símbolo do ativo
+            interval: Intervalo dos dados
+            date_from: Início do período
+            date_to: Fim do período
+            chunk: Tamanho de cada bloco solicitado ao terminal
+        
+        Returns:
+            Quantidade de barras gravadas
+        """
+        timeframe = self._valid_intervals[interval]
+        first = self.archive.first_time(symbol, interval)
+        if first is None:
+            written = 0
+            for rates in self._download_chunks(symbol, timeframe, date_from, date_to, chunk):
+                written += self.archive.append(symbol, interval, rates)
+            return written
+        
+        written = 0
+        head_end = pd.Timestamp(first, unit='s').to_pydatetime()
+        head_checked = self._head_checked.get((symbol, interval))
+        if date_from < head_end and (head_checked is None or date_from < head_checked):
+            # Histórico anterior ao arquivo: baixado inteiro e inserido de uma vez no início
+            head = list(self._download_chunks(symbol, timeframe, date_from, head_end, chunk))
+            if head:
+                written += self.archive.prepend(symbol, interval, np.concatenate(head))
+            # O terminal pode não ter barras tão antigas; não pedir o mesmo trecho de novo
+            self._head_checked[(symbol, interval)] = date_from
+            if written and interval == self.base_interval:
+                # O reamostrador só acompanha o fim do fluxo base; refaz com o novo início
+                self._resamplers.pop(symbol, None)
+        
+        # Recomeça na última barra, que pode ter sido gravada ainda em formação
+        last = pd.Timestamp(self.archive.last_time(symbol, interval), unit='s').to_pydatetime()
+        for rates in self._download_chunks(symbol, timeframe, max(date_from, last), date_to, chunk):
+            written += self.archive.append(symbol, interval, rates)
+        return written
+    
+    def _download_chunks(self, symbol: str, timeframe: int, date_from: datetime, date_to: datetime,
+                         chunk: timedelta):
+        """Gera os registros não vazios de copy_rates_range, bloco a bloco."""
+        chunk_start = date_from
+        while chunk_start < date_to:
+            chunk_end = min(chunk_start + chunk, date_to)
+            rates = mt5.copy_rates_range(symbol, timeframe, chunk_start, chunk_end)
+            if rates is not None and len(rates) > 0:
+                yield rates
+            chunk_start = chunk_end
+    
+    def read_range(self, symbol: str, interval: str, date_from: Optional[datetime] = None,
+                   date_to: Optional[datetime] = None) -> np.ndarray:
+        """
+        Retorna visão sem cópia das barras arquivadas no período [date_from, date_to).
+        
+        Args:
+            symbol: Símbolo do ativo
+            interval: Intervalo dos dados
+            date_from: Início do período (opcional)
+            date_to: Fim do período (opcional)
+        """
+        # Horários do MT5 são segundos desde a época, sem fuso
+        start = int(pd.Timestamp(date_from).timestamp()) if date_from is not None else None
+        end = int(pd.Timestamp(date_to).timestamp()) if date_to is not None else None
+        return self.archive.window(symbol, interval, start, end)
+    
+    def _is_derived(self, interval: str, date_from: Optional[datetime] = None,
+                    date_to: Optional[datetime] = None) -> bool:
+        """
+        Indica se o intervalo é reamostrado a partir do intervalo base.
+        
+        Só intervalos de DERIVED_INTERVALS maiores que o base são derivados; com
+        date_from e date_to, também é preciso que a janela caiba em
+        MAX_BASE_BARS barras do intervalo base.
+        """
+        if (self.base_interval is None or interval not in DERIVED_INTERVALS
+                or TIMEFRAME_SECONDS[interval] <= TIMEFRAME_SECONDS[self.base_interval]):
+            return False
+        if date_from is None or date_to is None:
+            return True
+        span = (date_to - date_from).total_seconds()
+        return span / TIMEFRAME_SECONDS[self.base_interval] <= MAX_BASE_BARS
+    
+    def read_resampled(self, symbol: str, interval: str, date_from: Optional[datetime] = None,
+                       date_to: Optional[datetime] = None) -> np.ndarray:
+        """
+        Retorna as barras do intervalo derivadas do fluxo base arquivado.
+        
+        O reamostrador do símbolo recebe apenas os minutos posteriores ao
+        último já processado, de modo que só a barra aberta de cada
+        intervalo é recalculada.
+        
+        Args:
+            symbol: Símbolo do ativo
+            interval: Intervalo de destino
+            date_from: Início do período (opcional)
+            date_to: Fim do período (opcional)
+        """
+        resampler = self._resamplers.get(symbol)
+        if resampler is None:
+            intervals = [iv for iv in self._valid_intervals if self._is_derived(iv)]
+            resampler = self._resamplers[symbol] = IncrementalResampler(intervals)
+        resampler.update(self.archive.window(symbol, self.base_interval, resampler.last_time))
+        
+        bars = resampler.bars(interval)
+        times = bars['time']
+        lo = 0 if date_from is None else int(np.searchsorted(
+            times, int(pd.Timestamp(date_from).timestamp()) // TIMEFRAME_SECONDS[interval] * TIMEFRAME_SECONDS[interval]))
+        hi = len(bars) if date_to is None else int(np.searchsorted(
+            times, int(pd.Timestamp(date_to).timestamp())))
+        return bars[lo:hi]
+    
+    def indicator_snapshot(self, symbol: str, interval: str, date_from: Optional[datetime] = None,
+                           params: Optional[Dict[str, Dict]] = None,
+                           warm_up_bars: int = WARM_UP_BARS) -> Dict[str, float]:
+        """
+        Retorna os indicadores atuais do símbolo, atualizados de forma incremental.
+        
+        Na primeira chamada os indicadores são aquecidos com as barras
+        arquivadas desde date_from ou, sem date_from, com as últimas
+        warm_up_bars barras fechadas; nas seguintes, só as barras fechadas
+        desde a última chamada são incorporadas, sem recalcular o histórico. A
+        última barra do arquivo é tratada como em formação e fica de fora.
+        
+        O aquecimento passa cada barra pelos indicadores em Python (dezenas de
+        µs por barra): as 5.000 barras padrão levam uma fração de segundo, um
+        arquivo de 1m de vários anos levaria minutos. Janelas móveis ficam
+        exatas assim que cobertas; médias exponenciais (RSI, MACD) diferem do
+        cálculo sobre todo o histórico por um fator (1 - alpha)^barras,
+        desprezível com milhares de barras.
+        
+        Args:
+            symbol: Símbolo do ativo
+            interval: Intervalo dos dados
+            date_from: Início do aquecimento (opcional, só na primeira chamada)
+            params: Parâmetros por indicador (só na primeira chamada)
+            warm_up_bars: Barras do aquecimento sem date_from (só na primeira chamada)
+        
+        Returns:
+            Valores atuais das colunas de INDICATOR_COLUMNS
+        """
+        key = (symbol, interval)
+        stream = self._indicator_streams.get(key)
+        first_call = stream is None
+        if first_call:
+            stream = self._indicator_streams[key] = StreamingIndicators(params=params)
+        else:
+            date_from = None
+        
+        if self._is_derived(interval):
+            bars = self.read_resampled(symbol, interval, date_from)
+        else:
+            bars = self.read_range(symbol, interval, date_from)
+        
+        closed = bars[:-1]
+        if first_call and date_from is None:
+            closed = closed[max(len(closed) - warm_up_bars, 0):]
+        last_time = self._stream_times.get(key)
+        if last_time is not None:
+            closed = closed[int(np.searchsorted(closed['time'], last_time, side='right')):]
+        if len(closed) > 0:
+            stream.warm_up(closed)
+            self._stream_times[key] = int(closed['time'][-1])
+        return stream.snapshot()
+    
     def get_symbol_info(self, symbol: str) -> Dict:
         """
         Retorna informações detalhadas sobre um símbolo específico.
         
         Args:
             symbol: Símbolo do ativo
-            
+        
         Returns:
             Dicionário com informações do ativo
         """
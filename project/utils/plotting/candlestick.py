@@ -1,10 +1,14 @@
+import numpy as np
 import plotly.graph_objects as go
+from ..signals import GREEN, RED, BLACK, SIGNAL_CATEGORIES, signal_codes
 
 def add_candlestick_chart(fig, df, row=1, col=1):
     """Add candlestick chart with entry/exit markers to the figure."""
+    codes = signal_codes(df['signal_color'])
+    
     # Adicionar gráfico de candlestick por cor
-    for color in ['green', 'red', 'black']:
-        mask = df['signal_color'] == color
+    for code, color in zip((GREEN, RED, BLACK), SIGNAL_CATEGORIES):
+        mask = codes == code
         if mask.any():
             fig.add_trace(
                 go.Candlestick(
@@ -22,18 +26,19 @@ def add_candlestick_chart(fig, df, row=1, col=1):
             )
     
     # Identificar pontos de entrada (candle verde após não-verde)
-    entries = []
-    for i in range(1, len(df)):
-        if df['signal_color'].iloc[i] == 'green' and df['signal_color'].iloc[i-1] != 'green':
-            entries.append(i)
+    is_green = codes == GREEN
+    is_entry = np.zeros(len(df), dtype=bool)
+    is_entry[1:] = is_green[1:] & ~is_green[:-1]
+    entries = np.flatnonzero(is_entry).tolist()
     
     # Identificar pontos de saída (após entrada quando candle fica preto ou vermelho)
+    is_exit_signal = (codes == BLACK) | (codes == RED)
     exits = []
     in_position = False
     for i in range(1, len(df)):
-        if i in entries:
+        if is_entry[i]:
             in_position = True
-        elif in_position and df['signal_color'].iloc[i] in ['black', 'red']:
+        elif in_position and is_exit_signal[i]:
             exits.append(i)
             in_position = False
     
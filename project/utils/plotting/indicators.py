@@ -1,5 +1,8 @@
 import plotly.graph_objects as go
 
+# Colunas de indicadores desenhadas pelos painéis abaixo
+PLOT_COLUMNS = ['STOCH_K', 'STOCH_D', 'RSI', 'MACD', 'MACD_SIGNAL']
+
 def add_stochastic(fig, df, row=2, col=1):
     """Add Stochastic indicator to the figure."""
     fig.add_trace(go.Scatter(x=df.index, y=df['STOCH_K'], name='Stoch %K', 
@@ -0,0 +1,257 @@
+"""
+Backtest de uma carteira de ativos com capital compartilhado.
+
+Os ativos recebem preços e sinais alinhados (barras x símbolos, ex: saídas
+de align_panel e de SignalRules.codes) e são simulados juntos, com um passo
+vetorizado por barra: primeiro as saídas (stop de 2% ou sinal red), depois
+as entradas em sinal green, que dividem o caixa disponível conforme o
+dimensionamento escolhido. Custos e stop são os de Strategy; com um único
+ativo e dimensionamento 'equal' o resultado é o mesmo de Strategy.
+
+Uso somente como biblioteca: o app continua com Strategy, de um símbolo.
+"""
+import numpy as np
+import pandas as pd
+from .backtest import (BUY, SELL_SIGNAL, SELL_STOP, EXIT_REASONS, TRADE_VALUES,
+                       STOP_LOSS, SELL_COST, BUY_COST, POSITION_FRACTION)
+from .signals import GREEN, RED, signal_codes
+
+SIZING_METHODS = ['equal', 'risk']
+
+class Portfolio:
+    """
+    Carteira de ativos sobre um único caixa.
+    
+    Args:
+        close: Fechamentos, DataFrame barras x símbolos (NaN onde não há barra)
+        signals: Sinais alinhados a close: DataFrame de cores ou códigos, ou
+            bloco barras x símbolos de códigos int8
+        initial_capital: Capital inicial da carteira
+        sizing: 'equal' divide fraction do caixa entre as entradas da barra;
+            'risk' compra o suficiente para perder risk do patrimônio no stop,
+            limitado à divisão de 'equal'
+        fraction: Fração do caixa usada nas entradas de cada barra
+        risk: Fração do patrimônio arriscada por trade no dimensionamento 'risk'
+    """
+    
+    def __init__(self, close, signals, initial_capital=10000.0, sizing='equal',
+                 fraction=POSITION_FRACTION, risk=0.01):
+        if sizing not in SIZING_METHODS:
+            raise ValueError(f"Dimensionamento desconhecido: {sizing} (use {SIZING_METHODS})")
+        self.close = close
+        self.symbols = list(close.columns)
+        self.signals = self._signal_block(signals)
+        if self.signals.shape != close.shape:
+            raise ValueError("Sinais devem estar alinhados aos fechamentos (barras x símbolos)")
+        self.initial_capital = float(initial_capital)
+        self.sizing = sizing
+        self.fraction = fraction
+        self.risk = risk
+        
+        self.holdings = pd.DataFrame(0, index=close.index, columns=self.symbols)
+        self.equity = pd.Series(self.initial_capital, index=close.index)
+        self.trades = None
+        self._open_shares = np.zeros(len(self.symbols), dtype=np.int64)
+        self._open_entry = np.zeros(len(self.symbols))
+        self._last_price = np.zeros(len(self.symbols))
+    
+    def _signal_block(self, signals):
+        """Códigos int8 de sinal, barras x símbolos."""
+        if not isinstance(signals, pd.DataFrame):
+            return np.asarray(signals, dtype=np.int8)
+        codes = np.empty(signals.shape, dtype=np.int8)
+        for j in range(signals.shape[1]):
+            column = signals.iloc[:, j]
+            is_codes = pd.api.types.is_integer_dtype(column)
+            codes[:, j] = column.to_numpy() if is_codes else signal_codes(column)
+        return codes
+    
+    def _entry_sizes(self, cash, equity, prices):
+        """Ações compradas em cada candidato à entrada, antes da checagem de caixa."""
+        budget = cash * self.fraction / len(prices)
+        sizes = np.floor(budget / prices)
+        if self.sizing == 'risk':
+            # Perda no stop: ações * preço * (1 - STOP_LOSS)
+            risk_sizes = np.floor(equity * self.risk / (prices * (1 - STOP_LOSS)))
+            sizes = np.minimum(sizes, risk_sizes)
+        return sizes.astype(np.int64)
+    
+    def run_backtest(self):
+        """
+        Executa o backtest da carteira.
+        
+        Returns:
+            DataFrame de trades com as colunas de Strategy.run_backtest e o símbolo
+        """
+        prices = self.close.to_numpy(dtype=np.float64)
+        n_bars, n_assets = prices.shape
+        cash = self.initial_capital
+        shares = np.zeros(n_assets, dtype=np.int64)
+        entry = np.zeros(n_assets)
+        # Último preço válido de cada ativo, para marcar posições em barras ausentes
+        last = np.zeros(n_assets)
+        if n_bars:
+            last = np.where(np.isfinite(prices[0]), prices[0], last)
+        
+        holdings = np.zeros((n_bars, n_assets), dtype=np.int64)
+        equity = np.full(n_bars, cash)
+        log = []
+        
+        for i in range(1, n_bars):
+            price = prices[i]
+            signal = self.signals[i]
+            valid = np.isfinite(price)
+            last = np.where(valid, price, last)
+            
+            # Saídas: stop loss (2%) ou sinal red
+            held = (shares > 0) & valid
+            is_stop = held & (price <= entry * STOP_LOSS)
+            exits = np.flatnonzero(is_stop | (held & (signal == RED)))
+            if len(exits):
+                revenue = shares[exits] * price[exits] * SELL_COST
+                cost = shares[exits] * entry[exits] * BUY_COST
+                profit = revenue - cost
+                capital = cash + np.cumsum(revenue)
+                cash = float(capital[-1])
+                kind = np.where(is_stop[exits], SELL_STOP, SELL_SIGNAL)
+                log.append((np.full(len(exits), i), exits, kind, shares[exits], price[exits],
+                            np.full(len(exits), np.nan), capital, revenue, profit, (profit / cost) * 100))
+                shares[exits] = 0
+                entry[exits] = 0.0
+            
+            # Entradas: sinal green em ativos sem posição (e que não saíram nesta barra)
+            candidates = (shares == 0) & valid & (price > 0) & (signal == GREEN)
+            candidates[exits] = False
+            entries = np.flatnonzero(candidates)
+            if len(entries):
+                sizes = self._entry_sizes(cash, cash + float((shares * last).sum()), price[entries])
+                cost = sizes * price[entries] * BUY_COST
+                accepted = (sizes > 0) & (np.cumsum(cost) <= cash)
+                if accepted.any():
+                    entries, sizes, cost = entries[accepted], sizes[accepted], cost[accepted]
+                    capital = cash - np.cumsum(cost)
+                    cash = float(capital[-1])
+                    shares[entries] = sizes
+                    entry[entries] = price[entries]
+                    nan = np.full(len(entries), np.nan)
+                    log.append((np.full(len(entries), i), entries, np.full(len(entries), BUY), sizes,
+                                price[entries], cost, capital, nan, nan, nan))
+            
+            holdings[i] = shares
+            equity[i] = cash + (shares * last).sum()
+        
+        self.holdings = pd.DataFrame(holdings, index=self.close.index, columns=self.symbols)
+        self.equity = pd.Series(equity, index=self.close.index)
+        self._open_shares, self._open_entry, self._last_price = shares, entry, last
+        
+        # Registro em colunas: bar, asset, kind, shares e TRADE_VALUES
+        fields = ['bar', 'asset', 'kind', 'shares'] + TRADE_VALUES
+        self.trades = {}
+        for k, field in enumerate(fields):
+            if log:
+                self.trades[field] = np.concatenate([step[k] for step in log])
+            else:
+                self.trades[field] = np.empty(0, dtype=np.int64 if k < 4 else np.float64)
+        return self._trades_frame()
+    
+    def _trades_frame(self):
+        """Registro de trades no formato de Strategy.run_backtest, com o símbolo."""
+        trades = self.trades
+        if len(trades['bar']) == 0:
+            return pd.DataFrame()
+        
+        kind = trades['kind']
+        trades_df = pd.DataFrame({
+            'date': self.close.index[trades['bar']],
+            'symbol': np.asarray(self.symbols, dtype=object)[trades['asset']],
+            'type': np.where(kind == BUY, 'buy', 'sell').astype(object),
+            'price': trades['price'],
+            'shares': trades['shares'],
+            'cost': trades['cost'],
+            'capital': trades['capital'],
+            'revenue': trades['revenue'],
+            'profit': trades['profit'],
+            'profit_pct': trades['profit_pct'],
+            'exit_reason': EXIT_REASONS[kind]
+        })
+        trades_df['date'] = pd.to_datetime(trades_df['date'])
+        return trades_df
+    
+    def get_metrics(self, trades_df):
+        """Calcula métricas do backtest (mesmas de Strategy.get_metrics, sobre o patrimônio da carteira)."""
+        if trades_df.empty:
+            return {
+                'total_trades': 0,
+                'profitable_trades': 0,
+                'win_rate': 0.0,
+                'total_return': 0.0,
+                'annual_return': 0.0,
+                'max_drawdown': 0.0
+            }
+        
+        sells = trades_df['type'] == 'sell'
+        total_trades = int(sells.sum())
+        profitable_trades = int((sells & (trades_df['profit'] > 0)).sum())
+        
+        final_capital = float(self.equity.iloc[-1])
+        total_return = ((final_capital - self.initial_capital) / self.initial_capital) * 100
+        
+        days = (self.close.index[-1] - self.close.index[0]).days
+        years = days / 365.25
+        annual_return = ((1 + total_return/100) ** (1/years) - 1) * 100 if years > 0 else total_return
+        
+        rolling_max = self.equity.expanding().max()
+        drawdowns = (self.equity - rolling_max) / rolling_max * 100
+        max_drawdown = abs(drawdowns.min())
+        
+        win_rate = (profitable_trades / total_trades * 100) if total_trades > 0 else 0
+        
+        return {
+            'total_trades': total_trades,
+            'profitable_trades': profitable_trades,
+            'win_rate': win_rate,
+            'total_return': total_return,
+            'annual_return': annual_return,
+            'max_drawdown': max_drawdown
+        }
+    
+    def get_attribution(self):
+        """
+        Resultado de cada ativo na carteira.
+        
+        O lucro realizado soma as vendas; o não realizado marca as posições
+        abertas pelo último preço, como o patrimônio. A soma das contribuições
+        é o retorno total da carteira.
+        
+        Returns:
+            DataFrame por símbolo com trades, acertos, lucro realizado, não
+            realizado, total e contribuição (% do capital inicial)
+        """
+        trades = self.trades
+        if trades is None:
+            raise ValueError("Execute run_backtest antes de get_attribution")
+        
+        n_assets = len(self.symbols)
+        sells = trades['kind'] != BUY
+        asset = trades['asset'][sells]
+        profit = trades['profit'][sells]
+        total_trades = np.bincount(asset, minlength=n_assets)
+        profitable_trades = np.bincount(asset[profit > 0], minlength=n_assets)
+        realized = np.bincount(asset, weights=profit, minlength=n_assets)
+        
+        shares = self._open_shares
+        unrealized = shares * self._last_price - shares * self._open_entry * BUY_COST
+        total = realized + unrealized
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            win_rate = np.where(total_trades > 0, profitable_trades / total_trades * 100, 0.0)
+        
+        return pd.DataFrame({
+            'total_trades': total_trades,
+            'profitable_trades': profitable_trades,
+            'win_rate': win_rate,
+            'realized_profit': realized,
+            'unrealized_profit': unrealized,
+            'total_profit': total,
+            'contribution': total / self.initial_capital * 100
+        }, index=pd.Index(self.symbols, name='symbol'))
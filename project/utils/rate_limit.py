@@ -0,0 +1,70 @@
+"""
+Módulo de controle de taxa de requisições (token bucket).
+"""
+import asyncio
+import threading
+import time
+from typing import Dict
+
+class TokenBucket:
+    """
+    Token bucket seguro entre threads, utilizável de código síncrono e assíncrono.
+    
+    Cada chamada reserva um token; quando o balde está vazio o saldo fica
+    negativo e o chamador espera o tempo necessário para repô-lo, o que
+    mantém a ordem de chegada entre os chamadores.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        """
+        Inicializa o balde cheio.
+        
+        Args:
+            rate: Tokens repostos por segundo
+            capacity: Quantidade máxima de tokens acumulados (rajada)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Reserva um token e retorna quantos segundos esperar antes de usá-lo."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+    
+    def acquire(self):
+        """Bloqueia a thread atual até o token reservado estar disponível."""
+        wait_time = self.reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+    
+    async def acquire_async(self):
+        """Aguarda o token sem bloquear o loop de eventos."""
+        wait_time = self.reserve()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+def shared_bucket(key: str, rate: float, capacity: float) -> TokenBucket:
+    """
+    Retorna o balde compartilhado no processo para a chave informada.
+    
+    Args:
+        key: Identificador da cota (ex: chave da API)
+        rate: Tokens por segundo, usado apenas na criação
+        capacity: Capacidade, usada apenas na criação
+    """
+    with _buckets_lock:
+        if key not in _buckets:
+            _buckets[key] = TokenBucket(rate, capacity)
+        return _buckets[key]
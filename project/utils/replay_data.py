@@ -0,0 +1,275 @@
+"""
+Módulo de dados offline: reprodução de arquivos locais ou geração sintética.
+"""
+import os
+import zlib
+import numpy as np
+import pandas as pd
+from datetime import date
+from typing import Dict, Optional
+from .memory import compact_frame
+
+def generate_bars(n_bars: int, start: str = '2000-01-03', freq: str = 'B',
+                  s0: float = 30.0, mu: float = 0.08, sigma: float = 0.3,
+                  periods_per_year: Optional[float] = None, seed: int = 42,
+                  dtype=np.float64) -> pd.DataFrame:
+    """
+    Gera barras OHLCV sintéticas por movimento browniano geométrico.
+    
+    O volume segue uma lognormal correlacionada com o tamanho do movimento,
+    como em dados reais.
+    
+    O índice precisa caber no limite de datas do pandas (até 2262): com a
+    frequência diária padrão são cerca de 65 mil barras; séries maiores
+    (milhões de barras) exigem frequência intradiária, ex: freq='min'.
+    
+    Args:
+        n_bars: Quantidade de barras
+        start: Data da primeira barra
+        freq: Frequência do índice (ex: 'B' para dias úteis, 'min' para minutos)
+        s0: Preço inicial
+        mu: Retorno anual esperado
+        sigma: Volatilidade anual
+        periods_per_year: Barras por ano (padrão: 252 dias de 6h de pregão)
+        seed: Semente do gerador aleatório
+        dtype: Tipo dos preços (float32 reduz memória pela metade)
+    
+    Returns:
+        DataFrame com colunas Open, High, Low, Close e Volume
+    
+    Raises:
+        ValueError: Se as datas das barras ultrapassam o limite do pandas
+    """
+    # Índice antes dos dados: falha rápido, sem alocar as colunas
+    try:
+        index = pd.date_range(start=start, periods=n_bars, freq=freq)
+    except (OverflowError, pd.errors.OutOfBoundsDatetime, pd.errors.OutOfBoundsTimedelta):
+        raise ValueError(
+            f"{n_bars} barras com freq='{freq}' a partir de {start} ultrapassam o limite "
+            f"de datas do pandas ({pd.Timestamp.max.date()}); use uma frequência "
+            f"intradiária (ex: freq='min') para séries longas"
+        )
+    
+    if periods_per_year is None:
+        offset = pd.tseries.frequencies.to_offset(freq)
+        if offset.name in ('B', 'D', 'C'):
+            periods_per_year = 252
+        else:
+            periods_per_year = 252 * 6 * 3600 / pd.Timedelta(offset).total_seconds()
+    
+    rng = np.random.default_rng(seed)
+    dt = 1.0 / periods_per_year
+    scale = sigma * np.sqrt(dt)
+    # Operações in-place mantêm o pico de memória em poucas colunas
+    noise = np.empty(n_bars)
+    
+    # Volume maior em barras de maior movimento
+    shocks = rng.standard_normal(n_bars)
+    volume = rng.lognormal(mean=13.0, sigma=0.4, size=n_bars)
+    np.abs(shocks, out=noise)
+    noise += 0.5
+    volume *= noise
+    
+    # Fechamento: exponencial da soma dos retornos logarítmicos
+    close = shocks
+    close *= scale
+    close += (mu - 0.5 * sigma ** 2) * dt
+    np.cumsum(close, out=close)
+    np.exp(close, out=close)
+    close *= s0
+    
+    # Abertura próxima ao fechamento anterior, com pequeno gap
+    open_ = np.empty(n_bars)
+    open_[0] = s0
+    open_[1:] = close[:-1]
+    rng.standard_normal(out=noise)
+    noise *= 0.1 * scale
+    open_ *= np.exp(noise, out=noise)
+    
+    # Máxima e mínima envolvem abertura e fechamento
+    high = np.maximum(open_, close)
+    rng.standard_normal(out=noise)
+    np.abs(noise, out=noise)
+    noise *= 0.5 * scale
+    high *= np.exp(noise, out=noise)
+    
+    low = np.minimum(open_, close)
+    rng.standard_normal(out=noise)
+    np.abs(noise, out=noise)
+    noise *= -0.5 * scale
+    low *= np.exp(noise, out=noise)
+    del noise
+    
+    return pd.DataFrame({
+        'Open': open_.astype(dtype, copy=False),
+        'High': high.astype(dtype, copy=False),
+        'Low': low.astype(dtype, copy=False),
+        'Close': close.astype(dtype, copy=False),
+        'Volume': volume.astype(np.int64)
+    }, index=index)
+
+# Regra de reamostragem do pandas por intervalo (rótulo no início da barra, como no yfinance)
+INTERVAL_RULES = {
+    '1m': 'min',
+    '5m': '5min',
+    '15m': '15min',
+    '30m': '30min',
+    '1h': 'h',
+    '1d': 'D',
+    '1wk': 'W-MON',
+    '1mo': 'MS'
+}
+
+_OHLCV_AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+def _resample_bars(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    Agrega as barras no intervalo pedido.
+    
+    Raises:
+        ValueError: Se o intervalo é desconhecido ou menor que o das barras
+    """
+    if interval not in INTERVAL_RULES:
+        raise ValueError(f"Intervalo inválido: {interval}")
+    if len(df) < 2:
+        return df
+    
+    rule = INTERVAL_RULES[interval]
+    # Semanas e meses não têm duração fixa; os demais são comparados ao passo das barras
+    if rule not in ('W-MON', 'MS'):
+        target = pd.Timedelta(pd.tseries.frequencies.to_offset(rule))
+        step = (df.index[1:] - df.index[:-1]).min()
+        if step > target:
+            raise ValueError(f"Intervalo {interval} menor que o das barras carregadas")
+        if step == target:
+            return df
+    
+    agg = {col: how for col, how in _OHLCV_AGG.items() if col in df.columns}
+    resampled = df.resample(rule, label='left', closed='left').agg(agg)
+    # Períodos sem barras (fins de semana, feriados) não geram linhas
+    return resampled.dropna(subset=['Close'])
+
+class ReplayDataManager:
+    """Gerenciador de dados offline com a mesma interface de StockDataManager."""
+    
+    def __init__(self, data_dir: Optional[str] = None, n_bars: int = 10000,
+                 start: str = '2000-01-03', freq: str = 'B', seed: int = 42,
+                 compact: bool = False):
+        """
+        Inicializa o gerenciador.
+        
+        Arquivos <símbolo>.parquet ou <símbolo>.csv em data_dir são usados
+        quando existirem; os demais símbolos recebem séries sintéticas
+        determinísticas.
+        
+        Args:
+            data_dir: Diretório com os arquivos de barras (opcional)
+            n_bars: Quantidade de barras das séries sintéticas
+            start: Data da primeira barra sintética
+            freq: Frequência das barras sintéticas
+            seed: Semente base do gerador sintético
+            compact: Se True, mantém as séries em tipos compactos (float32)
+        """
+        self._default_symbol = 'PETR4.SA'
+        self.data_dir = data_dir
+        self.n_bars = n_bars
+        self.start = start
+        self.freq = freq
+        self.seed = seed
+        self.compact = compact
+        self._frames: Dict[str, pd.DataFrame] = {}
+    
+    @property
+    def default_symbol(self) -> str:
+        """Retorna o símbolo padrão."""
+        return self._default_symbol
+    
+    def _load(self, symbol: str) -> pd.DataFrame:
+        """Carrega (uma única vez) a série completa do símbolo."""
+        if symbol in self._frames:
+            return self._frames[symbol]
+        
+        df = None
+        if self.data_dir:
+            parquet_path = os.path.join(self.data_dir, f'{symbol}.parquet')
+            csv_path = os.path.join(self.data_dir, f'{symbol}.csv')
+            if os.path.exists(parquet_path):
+                df = pd.read_parquet(parquet_path)
+            elif os.path.exists(csv_path):
+                df = pd.read_csv(csv_path, index_col=0, parse_dates=True)
+        
+        if df is None:
+            # Semente derivada do símbolo: séries distintas e reprodutíveis
+            seed = self.seed + zlib.crc32(symbol.encode())
+            df = generate_bars(self.n_bars, start=self.start, freq=self.freq, seed=seed)
+        
+        df = df.sort_index()
+        if self.compact:
+            df = compact_frame(df)
+        self._frames[symbol] = df
+        return df
+    
+    def fetch_stock_data(self, symbol: str, start_date: date, end_date: date,
+                         use_alpha_vantage: bool = False, interval: str = '1d') -> pd.DataFrame:
+        """
+        Retorna as barras do período [start_date, end_date).
+        
+        Args:
+            symbol: Símbolo do ativo
+            start_date: Data inicial
+            end_date: Data final
+            use_alpha_vantage: Ignorado, mantido por compatibilidade
+            interval: Intervalo das barras; intervalos maiores que o dos dados
+                carregados (ex: '1wk' sobre barras diárias) são reamostrados
+        
+        Returns:
+            Cópia das barras do período, que o chamador pode alterar
+        """
+        try:
+            df = self._load(symbol)
+            start = pd.Timestamp(start_date)
+            end = pd.Timestamp(end_date)
+            if df.index.tz is not None:
+                start = start.tz_localize(df.index.tz)
+                end = end.tz_localize(df.index.tz)
+            
+            # Índice ordenado: fatia por busca binária, sem máscara booleana
+            lo, hi = df.index.searchsorted([start, end])
+            df = _resample_bars(df.iloc[lo:hi], interval)
+            
+            if df.empty:
+                raise ValueError(f"Não há dados disponíveis para {symbol}")
+            return df.copy()
+        
+        except Exception as e:
+            raise Exception(f"Erro ao buscar dados para {symbol}: {str(e)}")
+    
+    def get_symbol_info(self, symbol: str, use_alpha_vantage: bool = False) -> Dict:
+        """
+        Retorna informações do símbolo a partir da última barra disponível até hoje.
+        
+        Args:
+            symbol: Símbolo do ativo
+            use_alpha_vantage: Ignorado, mantido por compatibilidade
+        """
+        try:
+            df = self._load(symbol)
+            now = pd.Timestamp.now(tz=df.index.tz)
+            last = df.iloc[max(df.index.searchsorted(now, side='right') - 1, 0)]
+            return {
+                'name': symbol,
+                'description': symbol,
+                'currency': 'BRL',
+                'market_price': float(last['Close']),
+                'volume': int(last['Volume']),
+                'sector': 'N/A'
+            }
+        except Exception:
+            return {
+                'name': symbol,
+                'description': 'N/A',
+                'currency': 'BRL',
+                'market_price': 0.0,
+                'volume': 0,
+                'sector': 'N/A'
+            }
@@ -0,0 +1,138 @@
+"""
+Módulo de reamostragem incremental de barras de 1 minuto para timeframes maiores.
+"""
+import numpy as np
+from typing import Dict, Iterable
+from .bar_archive import RATES_DTYPE
+
+# Duração de cada timeframe em segundos
+TIMEFRAME_SECONDS = {
+    '1m': 60,
+    '5m': 300,
+    '15m': 900,
+    '1h': 3600,
+    '1d': 86400
+}
+
+def aggregate_rates(rates: np.ndarray, seconds: int) -> np.ndarray:
+    """
+    Agrega registros ordenados em barras de `seconds` segundos.
+    
+    Args:
+        rates: Array estruturado no layout RATES_DTYPE, ordenado por tempo
+        seconds: Duração da barra de destino
+    
+    Returns:
+        Array estruturado com uma linha por barra de destino
+    """
+    if len(rates) == 0:
+        return np.empty(0, dtype=RATES_DTYPE)
+    
+    bucket = rates['time'] // seconds * seconds
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(rates)] - 1
+    
+    out = np.empty(len(starts), dtype=RATES_DTYPE)
+    out['time'] = bucket[starts]
+    out['open'] = rates['open'][starts]
+    out['high'] = np.maximum.reduceat(rates['high'], starts)
+    out['low'] = np.minimum.reduceat(rates['low'], starts)
+    out['close'] = rates['close'][ends]
+    out['tick_volume'] = np.add.reduceat(rates['tick_volume'], starts)
+    out['spread'] = np.minimum.reduceat(rates['spread'], starts)
+    out['real_volume'] = np.add.reduceat(rates['real_volume'], starts)
+    return out
+
+class _BarBuffer:
+    """Array crescente com capacidade dobrada a cada realocação."""
+    
+    def __init__(self, capacity: int = 1024):
+        self.data = np.empty(capacity, dtype=RATES_DTYPE)
+        self.size = 0
+    
+    def view(self) -> np.ndarray:
+        return self.data[:self.size]
+    
+    def replace_tail(self, start: int, rows: np.ndarray):
+        """Substitui as linhas a partir de `start` por `rows`."""
+        needed = start + len(rows)
+        if needed > len(self.data):
+            grown = np.empty(max(needed, 2 * len(self.data)), dtype=RATES_DTYPE)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[start:needed] = rows
+        self.size = needed
+
+class IncrementalResampler:
+    """
+    Mantém timeframes maiores atualizados a partir de um fluxo de barras de 1 minuto.
+    
+    Apenas os minutos da barra ainda aberta de cada timeframe ficam em memória;
+    a cada atualização somente essa barra é recalculada e as novas são
+    acrescentadas, sem reamostrar o histórico.
+    """
+    
+    def __init__(self, intervals: Iterable[str] = ('5m', '15m', '1h', '1d')):
+        """
+        Inicializa o reamostrador vazio.
+        
+        Args:
+            intervals: Timeframes mantidos (chaves de TIMEFRAME_SECONDS)
+        """
+        self.intervals = list(intervals)
+        self._bars: Dict[str, _BarBuffer] = {iv: _BarBuffer() for iv in self.intervals}
+        # Minutos a partir do início da barra aberta mais antiga entre os timeframes
+        self._minutes = np.empty(0, dtype=RATES_DTYPE)
+    
+    @property
+    def last_time(self):
+        """Horário (segundos) do último minuto recebido, ou None."""
+        return int(self._minutes['time'][-1]) if len(self._minutes) else None
+    
+    def update(self, minutes: np.ndarray):
+        """
+        Incorpora novas barras de 1 minuto.
+        
+        Um minuto com o mesmo horário do último recebido o substitui (barra
+        em formação); minutos anteriores a ele são ignorados.
+        
+        Args:
+            minutes: Array estruturado no layout RATES_DTYPE, ordenado por tempo
+        """
+        if len(minutes) == 0:
+            return
+        if minutes.dtype != RATES_DTYPE:
+            minutes = minutes.astype(RATES_DTYPE)
+        
+        last = self.last_time
+        if last is not None:
+            minutes = minutes[minutes['time'] >= last]
+            if len(minutes) == 0:
+                return
+            keep = self._minutes[:-1] if minutes['time'][0] == last else self._minutes
+            minutes = np.concatenate([keep, minutes])
+        
+        oldest_open = minutes['time'][-1]
+        for interval in self.intervals:
+            seconds = TIMEFRAME_SECONDS[interval]
+            buffer = self._bars[interval]
+            
+            # Recalcula só a barra aberta (se houver) e acrescenta as novas
+            segment = minutes
+            start = buffer.size
+            if start > 0:
+                open_time = buffer.data[start - 1]['time']
+                segment = minutes[int(np.searchsorted(minutes['time'], open_time, side='left')):]
+                if segment['time'][0] // seconds * seconds == open_time:
+                    start -= 1
+            buffer.replace_tail(start, aggregate_rates(segment, seconds))
+            
+            oldest_open = min(oldest_open, minutes['time'][-1] // seconds * seconds)
+        
+        # Descarta minutos de barras já fechadas em todos os timeframes
+        cut = int(np.searchsorted(minutes['time'], oldest_open, side='left'))
+        self._minutes = minutes[cut:].copy()
+    
+    def bars(self, interval: str) -> np.ndarray:
+        """Retorna a visão das barras agregadas do timeframe."""
+        return self._bars[interval].view()
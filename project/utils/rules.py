@@ -0,0 +1,387 @@
+"""
+Regras de sinal definidas por expressões.
+
+Uma regra é uma expressão sobre colunas de indicadores, compilada uma única
+vez em funções NumPy que avaliam colunas inteiras (ou painéis barras x
+símbolos) de uma só vez, sem código Python por barra. Exemplos:
+
+    RSI > 50 & RSI > RSI_PREV
+    count(STOCH_K > 50, RSI > 50, MACD > MACD_SIGNAL) >= 2    (2 de 3 condições)
+
+Gramática, da menor para a maior precedência (como no pandas.eval, os
+operadores lógicos têm precedência menor que as comparações):
+
+    |  or          disjunção
+    &  and         conjunção
+    ~  not         negação
+    > >= < <= == !=  comparações (encadeáveis: 30 < RSI < 70)
+    + -            soma e subtração
+    * /            multiplicação e divisão
+    -              negativo
+    números, colunas, parênteses, count(cond, ...) e abs(x)
+
+count(...) devolve o número de condições atendidas em cada barra. Comparações
+com NaN contam como não atendidas, como em get_signal_color.
+"""
+import re
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Optional
+from .signal_types import GREEN, RED, BLACK, signals_from_codes
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+      | (?P<name>[A-Za-z_]\w*)
+      | (?P<op>>=|<=|==|!=|[<>&|~()+\-*/,])
+    )""", re.VERBOSE)
+
+_KEYWORDS = {'and': '&', 'or': '|', 'not': '~'}
+_COMPARISONS = {
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '!=': np.not_equal
+}
+_ARITHMETIC = {
+    '+': np.add,
+    '-': np.subtract,
+    '*': np.multiply,
+    '/': np.true_divide
+}
+
+def _tokenize(expression: str) -> List[tuple]:
+    """Divide a expressão em tokens (tipo, valor)."""
+    tokens = []
+    pos = 0
+    expression = expression.rstrip()
+    while pos < len(expression):
+        match = _TOKEN.match(expression, pos)
+        if match is None:
+            raise ValueError(f"Caractere inválido na posição {pos}: {expression[pos:pos + 10]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'name' and value.lower() in _KEYWORDS:
+            kind, value = 'op', _KEYWORDS[value.lower()]
+        tokens.append((kind, value))
+        pos = match.end()
+    tokens.append(('end', None))
+    return tokens
+
+class _Parser:
+    """
+    Analisador descendente recursivo.
+    
+    Produz nós em tuplas (hasheáveis, usados como chave de subexpressões
+    comuns): ('col', nome), ('num', valor), ('cmp', op, a, b), ('arith', op,
+    a, b), ('neg', a), ('and', a, b), ('or', a, b), ('not', a),
+    ('count', conds) e ('abs', a).
+    """
+    
+    def __init__(self, expression: str):
+        self.tokens = _tokenize(expression)
+        self.pos = 0
+    
+    def peek(self):
+        return self.tokens[self.pos]
+    
+    def take(self, value=None):
+        kind, token = self.tokens[self.pos]
+        if value is not None and token != value:
+            found = 'fim da expressão' if kind == 'end' else repr(token)
+            raise ValueError(f"Esperado {value!r}, encontrado {found}")
+        self.pos += 1
+        return kind, token
+    
+    def parse(self):
+        node = self.logical()
+        if self.peek()[0] != 'end':
+            raise ValueError(f"Token inesperado: {self.peek()[1]!r}")
+        return node
+    
+    def logical(self, level=0):
+        # Nível 0: '|'; nível 1: '&'
+        op = '|&'[level]
+        operand = self.negation if level else (lambda: self.logical(1))
+        node = operand()
+        while self.peek() == ('op', op):
+            self.take()
+            right = operand()
+            node = ('or' if op == '|' else 'and', _boolean(node), _boolean(right))
+        return node
+    
+    def negation(self):
+        if self.peek() == ('op', '~'):
+            self.take()
+            return ('not', _boolean(self.negation()))
+        return self.comparison()
+    
+    def comparison(self):
+        left = self.sum()
+        node = None
+        while self.peek()[0] == 'op' and self.peek()[1] in _COMPARISONS:
+            op = self.take()[1]
+            right = self.sum()
+            term = ('cmp', op, _numeric(left), _numeric(right))
+            node = term if node is None else ('and', node, term)
+            left = right
+        return left if node is None else node
+    
+    def sum(self):
+        node = self.product()
+        while self.peek()[0] == 'op' and self.peek()[1] in '+-':
+            op = self.take()[1]
+            node = ('arith', op, _numeric(node), _numeric(self.product()))
+        return node
+    
+    def product(self):
+        node = self.unary()
+        while self.peek()[0] == 'op' and self.peek()[1] in '*/':
+            op = self.take()[1]
+            node = ('arith', op, _numeric(node), _numeric(self.unary()))
+        return node
+    
+    def unary(self):
+        if self.peek() == ('op', '-'):
+            self.take()
+            return ('neg', _numeric(self.unary()))
+        return self.atom()
+    
+    def atom(self):
+        kind, token = self.take()
+        if kind == 'number':
+            return ('num', float(token))
+        if kind == 'name':
+            if self.peek() != ('op', '('):
+                return ('col', token)
+            self.take('(')
+            args = [self.logical()]
+            while self.peek() == ('op', ','):
+                self.take()
+                args.append(self.logical())
+            self.take(')')
+            if token == 'count':
+                return ('count', tuple(_boolean(arg) for arg in args))
+            if token == 'abs' and len(args) == 1:
+                return ('abs', _numeric(args[0]))
+            raise ValueError(f"Função desconhecida: {token}({len(args)} argumentos)")
+        if token == '(':
+            node = self.logical()
+            self.take(')')
+            return node
+        found = 'fim da expressão' if kind == 'end' else repr(token)
+        raise ValueError(f"Operando esperado, encontrado {found}")
+
+_BOOLEAN_NODES = ('cmp', 'and', 'or', 'not')
+
+def _boolean(node):
+    if node[0] not in _BOOLEAN_NODES:
+        raise ValueError("Esperada uma condição (comparação ou combinação lógica)")
+    return node
+
+def _numeric(node):
+    if node[0] in _BOOLEAN_NODES:
+        raise ValueError("Esperado um valor numérico, encontrada uma condição")
+    return node
+
+def _compile(node) -> Callable[[Dict], np.ndarray]:
+    """
+    Compila um nó em uma função do ambiente de avaliação.
+    
+    O ambiente guarda as colunas e os resultados já calculados, de modo que
+    uma subexpressão repetida (na mesma regra ou em regras avaliadas juntas)
+    é calculada uma única vez.
+    """
+    kind = node[0]
+    if kind == 'col':
+        name = node[1]
+        return lambda env: env[name]
+    if kind == 'num':
+        value = node[1]
+        return lambda env: value
+    
+    if kind == 'count':
+        parts = [_compile(cond) for cond in node[1]]
+        
+        def compute(env):
+            total = np.asarray(parts[0](env)).astype(np.int8)
+            for part in parts[1:]:
+                total = total + part(env)
+            return total
+    elif kind in ('cmp', 'arith', 'and', 'or'):
+        if kind == 'cmp':
+            ufunc = _COMPARISONS[node[1]]
+        elif kind == 'arith':
+            ufunc = _ARITHMETIC[node[1]]
+        else:
+            ufunc = np.logical_and if kind == 'and' else np.logical_or
+        left, right = (_compile(child) for child in node[-2:])
+        compute = lambda env: ufunc(left(env), right(env))
+    else:
+        ufunc = {'neg': np.negative, 'not': np.logical_not, 'abs': np.abs}[kind]
+        operand = _compile(node[1])
+        compute = lambda env: ufunc(operand(env))
+    
+    def run(env):
+        if node not in env:
+            env[node] = compute(env)
+        return env[node]
+    return run
+
+def _columns(node, found: dict) -> dict:
+    """Colunas referenciadas pelo nó, na ordem em que aparecem."""
+    if node[0] == 'col':
+        found[node[1]] = None
+    elif node[0] == 'count':
+        for cond in node[1]:
+            _columns(cond, found)
+    else:
+        for child in node[1:]:
+            if isinstance(child, tuple):
+                _columns(child, found)
+    return found
+
+class _Environment(dict):
+    """
+    Ambiente de avaliação: resultados já calculados, por nó, e colunas.
+    
+    As colunas (1D ou barras x símbolos) são lidas de data só quando alguma
+    regra precisa delas; condições cujo resultado já está no ambiente não
+    leem as suas.
+    """
+    
+    def __init__(self, data):
+        super().__init__()
+        self.data = data
+    
+    def __missing__(self, key):
+        if not isinstance(key, str):
+            raise KeyError(key)
+        values = self.data[key]
+        values = values.to_numpy() if hasattr(values, 'to_numpy') else np.asarray(values)
+        self[key] = values
+        return values
+
+class Rule:
+    """
+    Condição compilada a partir de uma expressão.
+    
+    Args:
+        expression: Expressão da condição, ex: 'RSI > 50 & RSI > RSI_PREV'
+    """
+    
+    def __init__(self, expression: str):
+        self.expression = expression
+        try:
+            self.node = _boolean(_Parser(expression).parse())
+        except ValueError as e:
+            raise ValueError(f"Regra inválida {expression!r}: {str(e)}")
+        self.columns = list(_columns(self.node, {}))
+        if not self.columns:
+            raise ValueError(f"Regra sem colunas: {expression!r}")
+        self._run = _compile(self.node)
+    
+    def __repr__(self):
+        return f"Rule({self.expression!r})"
+    
+    def evaluate(self, data, env: Optional[dict] = None) -> np.ndarray:
+        """
+        Avalia a regra sobre todas as barras.
+        
+        Args:
+            data: DataFrame, dicionário de arrays ou painel (ex: saída de
+                compute_panel) com as colunas da regra
+            env: Ambiente compartilhado entre regras avaliadas juntas
+                (criado por SignalRules.codes e count_rules)
+        
+        Returns:
+            Array booleano no formato das colunas
+        """
+        if env is None:
+            env = _Environment(data)
+        return np.asarray(self._run(env))
+
+class SignalRules:
+    """
+    Conjunto de regras que classifica cada barra em green, red ou black.
+    
+    Barras que atendem à regra green recebem GREEN; as demais que atendem à
+    regra red recebem RED; o restante fica BLACK.
+    
+    Args:
+        green: Expressão (ou Rule) de entrada
+        red: Expressão (ou Rule) de saída
+    """
+    
+    def __init__(self, green, red):
+        self.green = green if isinstance(green, Rule) else Rule(green)
+        self.red = red if isinstance(red, Rule) else Rule(red)
+        self.columns = list(dict.fromkeys(self.green.columns + self.red.columns))
+    
+    def codes(self, data, known: Optional[Dict[Rule, np.ndarray]] = None) -> np.ndarray:
+        """
+        Códigos int8 de sinal de cada barra.
+        
+        Args:
+            data: DataFrame, dicionário de arrays ou painel com as colunas das regras
+            known: Resultados já calculados de condições usadas pelas regras
+                (ex: {CONDITION_RULES[0]: array}); não são reavaliados, e as
+                colunas lidas só por elas podem faltar em data
+        
+        Returns:
+            Array int8 de GREEN, RED e BLACK no formato das colunas
+        """
+        env = _Environment(data)
+        for rule, values in (known or {}).items():
+            env[rule.node] = values
+        green = self.green.evaluate(data, env)
+        red = self.red.evaluate(data, env)
+        codes = np.full(green.shape, BLACK, dtype=np.int8)
+        codes[red] = RED
+        codes[green] = GREEN
+        return codes
+    
+    def classify(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Sinal de cada barra do DataFrame.
+        
+        Returns:
+            pd.Series: Categórica de SIGNAL_DTYPE, como compute_signal_colors
+        """
+        try:
+            return signals_from_codes(self.codes(df), df.index)
+        except Exception as e:
+            raise Exception(f"Erro ao determinar cor do sinal: {str(e)}")
+
+def count_rules(rules: List[Rule], data) -> np.ndarray:
+    """
+    Número de regras atendidas em cada barra.
+    
+    As regras são avaliadas no mesmo ambiente, de modo que subexpressões
+    comuns são calculadas uma única vez.
+    
+    Args:
+        rules: Regras a contar
+        data: DataFrame, dicionário de arrays ou painel com as colunas das regras
+    
+    Returns:
+        Array int8 no formato das colunas
+    """
+    env = _Environment(data)
+    total = rules[0].evaluate(data, env).astype(np.int8)
+    for rule in rules[1:]:
+        total += rule.evaluate(data, env)
+    return total
+
+# Regras de get_signal_color: green com as três condições, red com nenhuma
+SIGNAL_CONDITIONS = [
+    'STOCH_K > 50 & STOCH_K > STOCH_K_PREV',
+    'RSI > 50 & RSI > RSI_PREV',
+    'MACD > MACD_SIGNAL & MACD > MACD_PREV'
+]
+# Uma regra por condição, na ordem de SIGNAL_CONDITIONS (estocástico, RSI, MACD)
+CONDITION_RULES = [Rule(condition) for condition in SIGNAL_CONDITIONS]
+_CONDITION_COUNT = f"count({', '.join(SIGNAL_CONDITIONS)})"
+DEFAULT_RULES = SignalRules(green=f"{_CONDITION_COUNT} == 3", red=f"{_CONDITION_COUNT} == 0")
@@ -0,0 +1,28 @@
+"""
+Tipos e códigos dos sinais de trading.
+
+Sinais circulam como categórica de categorias fixas: um código int8 por
+barra, e as strings só aparecem na exibição.
+"""
+import numpy as np
+import pandas as pd
+
+SIGNAL_CATEGORIES = ['green', 'red', 'black']
+SIGNAL_DTYPE = pd.CategoricalDtype(SIGNAL_CATEGORIES)
+GREEN, RED, BLACK = 0, 1, 2
+
+def signal_codes(signals) -> np.ndarray:
+    """
+    Códigos int8 dos sinais (GREEN, RED ou BLACK; -1 se desconhecido).
+    
+    Args:
+        signals: Série categórica de SIGNAL_DTYPE, ou sequência de strings de cor
+    
+    Returns:
+        Array int8 com um código por barra
+    """
+    return pd.Categorical(signals, dtype=SIGNAL_DTYPE).codes
+
+def signals_from_codes(codes, index=None) -> pd.Series:
+    """Série categórica de sinais a partir dos códigos int8."""
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=SIGNAL_DTYPE), index=index)
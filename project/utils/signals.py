@@ -1,6 +1,13 @@
 """
 Módulo para geração de sinais de trading.
 """
+# Tipos e códigos dos sinais, reexportados (utils.signal_types)
+from .signal_types import (SIGNAL_CATEGORIES, SIGNAL_DTYPE, GREEN, RED, BLACK,
+                           signal_codes, signals_from_codes)
+from .rules import DEFAULT_RULES, CONDITION_RULES, count_rules
+
+# Colunas de indicadores lidas por get_signal_color
+SIGNAL_COLUMNS = ['STOCH_K', 'STOCH_K_PREV', 'RSI', 'RSI_PREV', 'MACD', 'MACD_SIGNAL', 'MACD_PREV']
 
 def get_signal_color(row):
     """
@@ -8,7 +15,7 @@ def get_signal_color(row):
     
     Args:
         row: Linha do DataFrame com indicadores
-        
+    
     Returns:
         str: Cor do sinal ('green', 'red', ou 'black')
     """
@@ -32,4 +39,30 @@ def get_signal_color(row):
         else:
             return 'black'
     except Exception as e:
-        raise Exception(f"Erro ao determinar cor do sinal: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Erro ao determinar cor do sinal: {str(e)}")
+
+def count_conditions(stoch_k, stoch_k_prev, rsi, rsi_prev, macd, macd_signal, macd_prev):
+    """
+    Número de condições de get_signal_color atendidas em cada barra.
+    
+    Recebe arrays (ou blocos 2D) na ordem de SIGNAL_COLUMNS e avalia as
+    regras de CONDITION_RULES; comparações com NaN contam como não atendidas,
+    como na versão por linha.
+    
+    Returns:
+        Array int8 com valores de 0 a 3
+    """
+    values = (stoch_k, stoch_k_prev, rsi, rsi_prev, macd, macd_signal, macd_prev)
+    return count_rules(CONDITION_RULES, dict(zip(SIGNAL_COLUMNS, values)))
+
+def compute_signal_colors(df):
+    """
+    Versão vetorizada de df.apply(get_signal_color, axis=1), por DEFAULT_RULES.
+    
+    Args:
+        df: DataFrame com as colunas de SIGNAL_COLUMNS
+    
+    Returns:
+        pd.Series: Sinal de cada barra, categórica de SIGNAL_DTYPE
+    """
+    return DEFAULT_RULES.classify(df)
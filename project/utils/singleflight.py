@@ -0,0 +1,78 @@
+"""
+Módulo de agrupamento de requisições concorrentes idênticas (single-flight).
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+class _Call:
+    """Execução em andamento compartilhada pelos chamadores de uma chave."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Garante uma única execução em andamento por chave.
+    
+    Chamadas concorrentes com a mesma chave aguardam a execução do primeiro
+    chamador e recebem o mesmo resultado (ou a mesma exceção).
+    """
+    
+    def __init__(self):
+        """Inicializa o grupo sem execuções em andamento."""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.hits = 0  # Chamadas atendidas por uma execução já em andamento
+        self.misses = 0  # Execuções efetivas
+    
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Executa fn uma única vez para chamadas concorrentes com a mesma chave.
+        
+        Args:
+            key: Identificador da requisição
+            fn: Função a executar
+        
+        Returns:
+            Tupla (resultado, compartilhado), onde compartilhado indica que o
+            resultado veio da execução de outro chamador
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.hits += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.misses += 1
+                leader = True
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        
+        try:
+            call.result = fn(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        
+        return call.result, False
+    
+    def stats(self) -> Dict[str, int]:
+        """Retorna os contadores de acertos, execuções e chamadas em andamento."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'in_flight': len(self._calls)
+            }
@@ -0,0 +1,82 @@
+"""
+Módulo de cache de informações de símbolos com validade por campo.
+"""
+import threading
+import time
+import pandas as pd
+from typing import Any, Dict, Hashable, Optional
+
+# Validade padrão (segundos) de cada campo
+DEFAULT_TTLS = {
+    'name': 24 * 3600,
+    'description': 24 * 3600,
+    'currency': 24 * 3600,
+    'sector': 24 * 3600,
+    'pe_ratio': 3600,
+    'market_price': 60,
+    'volume': 60
+}
+
+class SymbolInfoCache:
+    """
+    Cache de informações de símbolos em que cada campo expira separadamente.
+    
+    Campos cadastrais (nome, setor) mudam raramente; cotação e volume são
+    derivados das barras já carregadas e expiram em segundos.
+    """
+    
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 300):
+        """
+        Inicializa o cache vazio.
+        
+        Args:
+            ttls: Validade por campo, sobrescreve DEFAULT_TTLS
+            default_ttl: Validade de campos não listados
+        """
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self._entries: Dict[Hashable, Dict[str, tuple]] = {}
+        self._quote_times: Dict[Hashable, pd.Timestamp] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Dict[str, Any]:
+        """Retorna apenas os campos ainda válidos da chave."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key, {})
+            return {
+                field: value
+                for field, (value, stored_at) in entry.items()
+                if now - stored_at < self.ttls.get(field, self.default_ttl)
+            }
+    
+    def set(self, key: Hashable, fields: Dict[str, Any]):
+        """Grava campos da chave, renovando sua validade."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            for field, value in fields.items():
+                entry[field] = (value, now)
+    
+    def set_quote_from_bars(self, key: Hashable, df: pd.DataFrame):
+        """
+        Deriva cotação e volume da última barra carregada.
+        
+        Barras mais antigas que a última já registrada são ignoradas.
+        
+        Args:
+            key: Chave do símbolo
+            df: Barras ordenadas com colunas Close e Volume
+        """
+        if df.empty:
+            return
+        bar_time = df.index[-1]
+        with self._lock:
+            last_time = self._quote_times.get(key)
+            if last_time is not None and bar_time < last_time:
+                return
+            self._quote_times[key] = bar_time
+        self.set(key, {
+            'market_price': df['Close'].iloc[-1],
+            'volume': df['Volume'].iloc[-1]
+        })
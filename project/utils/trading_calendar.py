@@ -0,0 +1,184 @@
+"""
+Módulo de calendário de pregões da B3.
+"""
+import os
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+DEFAULT_HOLIDAYS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'b3_holidays.csv'
+)
+
+def _easter(year: int) -> date:
+    """Calcula o domingo de Páscoa (algoritmo de Meeus/Jones/Butcher)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+def b3_holidays(start_year: int, end_year: int) -> pd.DataFrame:
+    """
+    Gera os feriados da B3 em dias úteis entre dois anos (inclusive).
+    
+    Usado para regenerar o arquivo local de feriados; pregões cancelados
+    excepcionalmente devem ser acrescentados ao arquivo manualmente.
+    
+    Args:
+        start_year: Primeiro ano
+        end_year: Último ano
+    
+    Returns:
+        DataFrame com colunas date e description, ordenado por data
+    """
+    rows = []
+    for year in range(start_year, end_year + 1):
+        easter = _easter(year)
+        holidays = [
+            (date(year, 1, 1), 'Confraternização Universal'),
+            (easter - timedelta(days=48), 'Carnaval'),
+            (easter - timedelta(days=47), 'Carnaval'),
+            (easter - timedelta(days=2), 'Sexta-feira Santa'),
+            (date(year, 4, 21), 'Tiradentes'),
+            (date(year, 5, 1), 'Dia do Trabalho'),
+            (easter + timedelta(days=60), 'Corpus Christi'),
+            (date(year, 9, 7), 'Independência do Brasil'),
+            (date(year, 10, 12), 'Nossa Senhora Aparecida'),
+            (date(year, 11, 2), 'Finados'),
+            (date(year, 11, 15), 'Proclamação da República'),
+            (date(year, 12, 24), 'Véspera de Natal'),
+            (date(year, 12, 25), 'Natal'),
+            (date(year, 12, 31), 'Último dia do ano')
+        ]
+        # Feriados municipais de São Paulo observados pela B3 até 2021
+        if year <= 2021:
+            holidays += [
+                (date(year, 1, 25), 'Aniversário de São Paulo'),
+                (date(year, 7, 9), 'Revolução Constitucionalista'),
+                (date(year, 11, 20), 'Dia da Consciência Negra')
+            ]
+        elif year >= 2024:
+            holidays.append((date(year, 11, 20), 'Dia da Consciência Negra'))
+        
+        rows += [(day, name) for day, name in holidays if day.weekday() < 5]
+    
+    df = pd.DataFrame(rows, columns=['date', 'description'])
+    return df.drop_duplicates('date').sort_values('date').reset_index(drop=True)
+
+class TradingCalendar:
+    """
+    Calendário de pregões: dias úteis menos os feriados informados.
+    
+    Os pregões do intervalo coberto pelo arquivo de feriados ficam
+    pré-calculados em um índice ordenado; fora dele vale apenas a regra de
+    fins de semana.
+    """
+    
+    def __init__(self, holidays: Iterable[date]):
+        """
+        Inicializa o calendário.
+        
+        Args:
+            holidays: Datas sem pregão além dos fins de semana
+        """
+        self.holidays = np.array(sorted(set(holidays)), dtype='datetime64[D]')
+        self._busday = np.busdaycalendar(holidays=self.holidays)
+        
+        if len(self.holidays) > 0:
+            first = pd.Timestamp(self.holidays[0]).replace(month=1, day=1)
+            last = pd.Timestamp(self.holidays[-1]).replace(month=12, day=31)
+            self.sessions = pd.DatetimeIndex(
+                self._session_days(first, last + pd.Timedelta(days=1)))
+        else:
+            self.sessions = pd.DatetimeIndex([])
+    
+    @classmethod
+    def load(cls, path: str = DEFAULT_HOLIDAYS_FILE) -> 'TradingCalendar':
+        """
+        Carrega o calendário a partir de um arquivo CSV com a coluna date.
+        
+        Args:
+            path: Caminho do arquivo de feriados
+        """
+        try:
+            df = pd.read_csv(path, parse_dates=['date'])
+            return cls(df['date'].dt.date)
+        except Exception as e:
+            raise Exception(f"Erro ao carregar calendário de {path}: {str(e)}")
+    
+    def _session_days(self, start: pd.Timestamp, end: pd.Timestamp) -> np.ndarray:
+        """Retorna os pregões de [start, end) como datetime64[D]."""
+        days = np.arange(np.datetime64(start.date(), 'D'), np.datetime64(end.date(), 'D'))
+        return days[np.is_busday(days, busdaycal=self._busday)]
+    
+    def is_session(self, day) -> bool:
+        """Indica se há pregão na data."""
+        return bool(np.is_busday(np.datetime64(pd.Timestamp(day).date(), 'D'),
+                                 busdaycal=self._busday))
+    
+    def sessions_in_range(self, start, end) -> pd.DatetimeIndex:
+        """Retorna os pregões de [start, end)."""
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end)
+        if end > end.normalize():
+            end = end.normalize() + pd.Timedelta(days=1)
+        
+        # Dentro do intervalo pré-calculado basta uma busca binária
+        if len(self.sessions) > 0 and start >= self.sessions[0] and end <= self.sessions[-1]:
+            lo, hi = self.sessions.searchsorted([start, end])
+            return self.sessions[lo:hi]
+        return pd.DatetimeIndex(self._session_days(start, end))
+    
+    def session_bounds(self, start: pd.Timestamp,
+                       end: pd.Timestamp) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Reduz [start, end) ao trecho entre o primeiro e o último pregão.
+        
+        Args:
+            start: Início do período (inclusivo)
+            end: Fim do período (exclusivo)
+        
+        Returns:
+            Tupla (primeiro pregão, dia seguinte ao último pregão), ou None se
+            o período não contém pregões
+        """
+        sessions = self.sessions_in_range(start, end)
+        if len(sessions) == 0:
+            return None
+        first = max(sessions[0], pd.Timestamp(start))
+        return first, min(sessions[-1] + pd.Timedelta(days=1), pd.Timestamp(end))
+    
+    def missing_sessions(self, index: pd.DatetimeIndex, start, end) -> pd.DatetimeIndex:
+        """
+        Retorna os pregões de [start, end) sem nenhuma barra no índice.
+        
+        Args:
+            index: Índice das barras carregadas
+            start: Início do período
+            end: Fim do período
+        """
+        sessions = self.sessions_in_range(start, end)
+        if getattr(index, 'tz', None) is not None:
+            index = index.tz_localize(None)
+        return sessions.difference(index.normalize())
+
+@lru_cache(maxsize=None)
+def b3_calendar(path: str = DEFAULT_HOLIDAYS_FILE) -> Optional[TradingCalendar]:
+    """
+    Retorna o calendário da B3, carregado uma única vez por processo.
+    
+    Sem o arquivo de feriados, retorna None e as buscas seguem sem calendário.
+    """
+    try:
+        return TradingCalendar.load(path)
+    except Exception as e:
+        print(f"Calendário de pregões indisponível: {str(e)}")
+        return None